@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of :py:class:`viz.amount.Amount`.
+
+Measures parsing of distinct and recurring strings, summing and formatting of amounts against the former ``dict``
+based implementation with ``float`` amount, reproduced below.
+
+Usage::
+
+    python benchmarks/amount.py --rounds 100000
+"""
+import argparse
+import time
+
+from viz.amount import Amount
+from vizbase.chains import PRECISIONS
+
+
+class DictAmount(dict):
+    """Former implementation, reduced to the benchmarked methods."""
+
+    def __init__(self, amount_string="0 VIZ"):
+        if isinstance(amount_string, DictAmount):
+            self["amount"] = amount_string["amount"]
+            self["asset"] = amount_string["asset"]
+        else:
+            self["amount"], self["asset"] = amount_string.split(" ")
+        self["amount"] = float(self["amount"])
+
+    def __str__(self):
+        prec = PRECISIONS.get(self["asset"], 6)
+        return "{:.{prec}f} {}".format(self["amount"], self["asset"], prec=prec)
+
+    def __add__(self, other):
+        am = DictAmount(self)
+        am["amount"] += other["amount"]
+        return am
+
+
+def rate(start, rounds):
+    return rounds / (time.perf_counter() - start)
+
+
+def measure(cls, strings):
+    start = time.perf_counter()
+    amounts = [cls(string) for string in strings]
+    parse = rate(start, len(strings))
+
+    # recurring amounts, like fees and award amounts
+    repeated = strings[:100] * (len(strings) // 100)
+    start = time.perf_counter()
+    for string in repeated:
+        cls(string)
+    parse_repeated = rate(start, len(repeated))
+
+    start = time.perf_counter()
+    total = cls("0 VIZ")
+    for amount in amounts:
+        total = total + amount
+    add = rate(start, len(strings))
+
+    # computed amounts, parsed ones may keep their source string
+    doubled = [amount + amount for amount in amounts]
+    start = time.perf_counter()
+    formatted = [str(amount) for amount in doubled]
+    format_ = rate(start, len(formatted))
+    return parse, parse_repeated, add, format_, str(total)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=100000)
+    args = parser.parse_args()
+
+    strings = ["{}.{:03d} VIZ".format(i % 1000, i % 997) for i in range(args.rounds)]
+    print("{:>8} {:>12} {:>12} {:>12} {:>12}  {}".format("", "parse/s", "repeated/s", "add/s", "format/s", "sum"))
+    for name, cls in (("dict", DictAmount), ("slots", Amount)):
+        print("{:>8} {:>12.1f} {:>12.1f} {:>12.1f} {:>12.1f}  {}".format(name, *measure(cls, strings)))
+
+
+if __name__ == "__main__":
+    main()
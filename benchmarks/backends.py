@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of ECDSA backends.
+
+Runs the self-test of every installed backend from :py:mod:`vizbase.backends` and measures signing, verification
+(public key recovery) and memo shared secret derivation.
+
+Usage::
+
+    python benchmarks/backends.py --rounds 100
+"""
+import argparse
+import time
+
+import graphenebase.ecdsa as gphecdsa
+
+from vizbase import backends
+from vizbase.account import PrivateKey
+from vizbase.exceptions import BackendError
+
+WIF = "5JabcrvaLnBTCkCVFX5r4rmeGGfuJuVp4NAKRNLTey6pxhRQmf4"
+PEER = "5Hw9YPABaFxa2LooiANLrhUK5TPryy8f7v9Y1rk923PuYqbYdfC"
+
+
+def rate(start, rounds):
+    return rounds / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=100)
+    args = parser.parse_args()
+
+    priv, peer = PrivateKey(WIF), PrivateKey(PEER).pubkey
+    messages = [b"message %d" % i for i in range(args.rounds)]
+    print("{:>14} {:>12} {:>12} {:>12}".format("backend", "sign/s", "verify/s", "ecdh/s"))
+    for name in backends.available_backends():
+        try:
+            backends.self_test(name)
+        except BackendError as error:
+            print("{:>14} {}".format(name, error))
+            continue
+        with backends.use_backend(name):
+            start = time.perf_counter()
+            signatures = [gphecdsa.sign_message(message, WIF) for message in messages]
+            sign = rate(start, args.rounds)
+            start = time.perf_counter()
+            for message, signature in zip(messages, signatures):
+                gphecdsa.verify_message(message, signature)
+            verify = rate(start, args.rounds)
+            start = time.perf_counter()
+            for _ in range(args.rounds):
+                backends.get_shared_secret(priv, peer)
+            ecdh = rate(start, args.rounds)
+        print("{:>14} {:>12.1f} {:>12.1f} {:>12.1f}".format(name, sign, verify, ecdh))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of operation serialization.
+
+Compares serialization through :py:mod:`vizbase.operations` classes with the compiled encoders from
+:py:mod:`vizbase.serializers` and with an operation template, and checks that all produce identical bytes.
+
+Usage::
+
+    python benchmarks/serializers.py --rounds 100000
+"""
+import argparse
+import time
+
+from vizbase.objects import Operation
+from vizbase.operations import Transfer
+from vizbase.serializers import OperationTemplate, serialize_op
+
+
+def rate(start, rounds):
+    return rounds / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=100000)
+    args = parser.parse_args()
+
+    ops = [
+        {"from": "alice", "to": "bob%d" % i, "amount": "%d.000 VIZ" % (i % 1000 + 1), "memo": "payment %d" % i}
+        for i in range(args.rounds)
+    ]
+
+    start = time.perf_counter()
+    expected = [bytes(Operation(Transfer(**dict(op)))) for op in ops]
+    classes = rate(start, args.rounds)
+
+    start = time.perf_counter()
+    result = [serialize_op(["transfer", op]) for op in ops]
+    compiled = rate(start, args.rounds)
+
+    template = OperationTemplate(["transfer", {"from": "alice"}], variable=["to", "amount", "memo"])
+    start = time.perf_counter()
+    patched = [template.serialize(op) for op in ops]
+    templated = rate(start, args.rounds)
+
+    assert result == expected, "serialization differs"
+    assert patched == expected, "template serialization differs"
+    print("{:>10} {:>12}".format("", "ops/s"))
+    print("{:>10} {:>12.1f}".format("classes", classes))
+    print("{:>10} {:>12.1f}".format("compiled", compiled))
+    print("{:>10} {:>12.1f}".format("template", templated))
+    print("speedup {:.1f}x, template {:.1f}x".format(compiled / classes, templated / classes))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark of transaction signing in worker processes.
+
+Signs the same set of transactions in the calling process and with :py:class:`viz.signing.SigningService` using 1..N
+workers, and prints throughput and speedup. With a CPU-bound backend the speedup grows linearly with the number of
+workers up to the number of physical cores.
+
+Usage::
+
+    python benchmarks/signing.py --transactions 200 --max-workers 8
+"""
+import argparse
+import os
+import time
+
+from viz.signing import SigningService
+from vizbase import operations
+from vizbase.chains import KNOWN_CHAINS
+from vizbase.signedtransactions import Signed_Transaction
+
+WIF = "5JabcrvaLnBTCkCVFX5r4rmeGGfuJuVp4NAKRNLTey6pxhRQmf4"
+CHAIN = KNOWN_CHAINS["VIZ"]
+
+
+def make_transactions(count):
+    txs = []
+    for i in range(count):
+        op = operations.Transfer(**{"from": "alice", "to": "bob", "amount": "1.000 VIZ", "memo": str(i)})
+        txs.append(
+            Signed_Transaction(
+                ref_block_num=1,
+                ref_block_prefix=2,
+                expiration="2030-01-01T00:00:00",
+                operations=[operations.Operation(op)],
+            )
+        )
+    return txs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transactions", type=int, default=200)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    txs = make_transactions(args.transactions)
+    start = time.perf_counter()
+    for tx in txs:
+        tx.sign([WIF], chain=CHAIN)
+    baseline = time.perf_counter() - start
+    print("{:>8} {:>10.1f} tx/s {:>6.2f}x".format("inline", len(txs) / baseline, 1.0))
+
+    workers = 1
+    while workers <= args.max_workers:
+        with SigningService(wifs=[WIF], max_workers=workers) as service:
+            # start worker processes before measuring
+            service.sign_many([(tx, [WIF]) for tx in make_transactions(workers)], chain=CHAIN)
+            start = time.perf_counter()
+            service.sign_many([(tx, [WIF]) for tx in txs], chain=CHAIN)
+            elapsed = time.perf_counter() - start
+        print("{:>8} {:>10.1f} tx/s {:>6.2f}x".format(workers, len(txs) / elapsed, baseline / elapsed))
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
 import time
 import pytest
 from graphenecommon.exceptions import AccountDoesNotExistsException
-from viz.account import Account
+from viz.account import Account, AccountSnapshot
 
 
 @pytest.fixture()
@@ -9,6 +9,29 @@ def account(viz, default_account):
     return Account(default_account)
 
 
+@pytest.fixture()
+def account_data():
+    authority = {
+        'weight_threshold': 1,
+        'account_auths': [],
+        'key_auths': [['VIZ6Q1LNQWadRVeosq2TjR248vKicuHqx7vCzMowVoEt6RNLXD7sP', 1]],
+    }
+    return {
+        'name': 'alice',
+        'balance': '1.500 VIZ',
+        'vesting_shares': '100.000000 SHARES',
+        'delegated_vesting_shares': '10.000000 SHARES',
+        'received_vesting_shares': '2.500000 SHARES',
+        'energy': 9000,
+        'last_vote_time': '2020-05-19T08:10:47',
+        'master_authority': authority,
+        'active_authority': authority,
+        'regular_authority': authority,
+        'memo_key': 'VIZ8hAezpcHkf7ZaGf7STKi5M8iNd3ReMWnVJ7rYmyNvrGkXNB4An',
+        'json_metadata': '{"profile": {"name": "Alice"}}',
+    }
+
+
 @pytest.fixture(scope='session')
 def _make_ops(viz, default_account):
     # Sent to different destinations to avoid transaction dupe check fail
@@ -68,3 +91,18 @@ def test_history_reverse(account: Account):
     time.sleep(2)
     history = list(account.history_reverse(batch_size=1, limit=2))
     assert len(history) == 2
+
+
+def test_snapshot(account_data):
+    snapshot = AccountSnapshot.from_dict(account_data)
+    assert snapshot.balance == 1500
+    assert snapshot.effective_vesting_shares == 92500000
+    assert snapshot.balances == {'VIZ': 1.5, 'SHARES': 100.0}
+    assert snapshot.json_metadata == {'profile': {'name': 'Alice'}}
+    assert snapshot.to_dict() == {**account_data, 'json_metadata': {'profile': {'name': 'Alice'}}}
+
+
+def test_snapshot_invalid_metadata(account_data):
+    account_data['json_metadata'] = '{'
+    snapshot = AccountSnapshot.from_dict(account_data)
+    assert snapshot.json_metadata == {}
@@ -0,0 +1,56 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from viz.account import AccountSnapshot  # noqa: E402
+from viz.accountarray import AccountArray  # noqa: E402
+
+
+@pytest.fixture()
+def blockchain_instance():
+    config = {'CHAIN_100_PERCENT': 10000, 'CHAIN_1_PERCENT': 100, 'CHAIN_ENERGY_REGENERATION_SECONDS': 432000}
+    return SimpleNamespace(rpc=SimpleNamespace(config=config))
+
+
+def make_snapshot(name, energy, last_vote_time, balance=1000, vesting_shares=10 ** 6):
+    authority = {'weight_threshold': 1, 'account_auths': [], 'key_auths': []}
+    return AccountSnapshot.from_dict(
+        {
+            'name': name,
+            'balance': '{:.3f} VIZ'.format(balance / 1000),
+            'vesting_shares': '{:.6f} SHARES'.format(vesting_shares / 10 ** 6),
+            'delegated_vesting_shares': '0.000000 SHARES',
+            'received_vesting_shares': '0.500000 SHARES',
+            'energy': energy,
+            'last_vote_time': last_vote_time,
+            'master_authority': authority,
+            'active_authority': authority,
+            'regular_authority': authority,
+            'memo_key': 'VIZ1111111111111111111111111111111114T1Anm',
+        }
+    )
+
+
+def test_current_energy(blockchain_instance):
+    snapshots = [
+        make_snapshot('alice', 5000, '2020-01-01T00:00:00'),
+        make_snapshot('bob', 9000, '2020-01-01T00:00:00'),
+        make_snapshot('carol', 1000, '2020-01-05T00:00:00'),
+    ]
+    array = AccountArray(snapshots, blockchain_instance=blockchain_instance)
+    energy = array.current_energy(now=datetime(2020, 1, 3))
+    # 2 days regenerate 40% of energy
+    assert energy.tolist() == pytest.approx([90.0, 100.0, 10.0])
+    assert array.index('bob') == 1
+
+
+def test_shares_and_balances(blockchain_instance):
+    snapshots = [make_snapshot('alice', 0, '2020-01-01T00:00:00', balance=1500, vesting_shares=2 * 10 ** 6)]
+    array = AccountArray(snapshots, blockchain_instance=blockchain_instance)
+    assert array.effective_vesting_shares().tolist() == [2500000]
+    balances = array.get_balances()
+    assert balances['VIZ'].tolist() == [1.5]
+    assert balances['SHARES'].tolist() == [2.0]
@@ -1,6 +1,12 @@
+import json
+from collections.abc import Mapping
+
 import pytest
 
-from viz.amount import Amount
+from viz.amount import Amount, amount_to_units, units_to_amount
+from vizbase import objects
+from vizbase.amount import parse_amount
+from vizbase.exceptions import AssetUnknown
 
 
 @pytest.fixture()
@@ -27,3 +33,77 @@ def test_add(amount):
     am = Amount("2 VIZ")
     _sum = amount + am
     assert float(_sum) == 12
+
+
+def test_units():
+    assert amount_to_units("1.150 VIZ") == 1150
+    assert amount_to_units("-0.000001 SHARES") == -1
+    assert amount_to_units("12 VIZ") == 12000
+    assert units_to_amount(1150, "VIZ") == "1.150 VIZ"
+    assert units_to_amount(-1, "SHARES") == "-0.000001 SHARES"
+    with pytest.raises(ValueError, match="decimal places"):
+        amount_to_units("0.0001 VIZ")
+
+
+def test_exact_sum():
+    total = Amount("0 VIZ")
+    for _ in range(10):
+        total += Amount("0.1 VIZ")
+    assert total.units == 1000
+    assert total == 1
+    assert str(total) == "1.000 VIZ"
+    assert str(sum([Amount("0.001 VIZ")] * 1000, Amount("0 VIZ"))) == "1.000 VIZ"
+
+
+def test_arithmetic(amount):
+    assert str(amount - 2.5) == "7.500 VIZ"
+    assert str(amount * 1.5) == "15.000 VIZ"
+    assert str(amount / 4) == "2.500 VIZ"
+    assert str(amount // 3) == "3.000 VIZ"
+    assert str(amount % 3) == "1.000 VIZ"
+    assert int(Amount("-1.5 VIZ")) == -1
+    # float formatted amounts are rounded to asset precision
+    assert str(Amount("1e-05 SHARES")) == "0.000010 SHARES"
+    assert str(Amount("1.0004 VIZ")) == "1.000 VIZ"
+    assert amount > Amount("9.999 VIZ")
+    with pytest.raises(AssertionError):
+        amount + Amount("1 SHARES")
+
+
+def test_dict_view(amount):
+    assert amount["amount"] == 10.0
+    assert amount["asset"] == "VIZ"
+    assert dict(amount) == {"amount": 10.0, "asset": "VIZ"}
+    amount["amount"] = 1.25
+    assert str(amount) == "1.250 VIZ"
+    with pytest.raises(KeyError):
+        amount["precision"]
+
+    assert isinstance(amount, Mapping)
+    assert not isinstance(amount, dict)
+    assert amount.get("asset") == "VIZ"
+    assert dict(amount.items()) == amount.as_dict() == {"amount": 1.25, "asset": "VIZ"}
+    assert json.loads(json.dumps(amount.json())) == {"amount": 1.25, "asset": "VIZ"}
+    assert json.loads(json.dumps({"fee": Amount("0.010 VIZ").as_dict()}))["fee"]["amount"] == 0.01
+
+
+def test_parse_amount():
+    assert parse_amount("1.500 VIZ") == (1500, "VIZ", 3, True)
+    assert parse_amount("-1.5 VIZ") == (-1500, "VIZ", 3, False)
+    assert parse_amount("1e-05 SHARES") == (10, "SHARES", 6, False)
+    assert parse_amount("0.0015 VIZ").units == 2
+
+    parse_amount.cache_clear()
+    for _ in range(3):
+        Amount("2.000 VIZ")
+    assert parse_amount.cache_info().hits == 2
+
+
+def test_serialized_amount():
+    # beyond float precision
+    amount = objects.Amount("9007199254740.993 VIZ")
+    assert amount.units == 9007199254740993
+    assert str(amount) == "9007199254740.993 VIZ"
+    assert bytes(amount)[:8] == (9007199254740993).to_bytes(8, "little")
+    with pytest.raises(AssetUnknown):
+        objects.Amount("1.000 GOLOS")
@@ -0,0 +1,59 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from viz.amount import Amount  # noqa: E402
+from viz.amountarray import AmountArray  # noqa: E402
+
+
+@pytest.fixture()
+def array():
+    return AmountArray.from_strings(
+        ['1.000 VIZ', '0.001 VIZ', '-2.500 VIZ', '10.000000 SHARES', '0.5 VIZ', '3 SHARES'],
+        accounts=['bob', 'alice', 'bob', 'bob', 'carol', 'alice'],
+    )
+
+
+def test_parse(array):
+    assert array.units.tolist() == [1000, 1, -2500, 10000000, 500, 3000000]
+    assert array.to_strings() == [
+        '1.000 VIZ',
+        '0.001 VIZ',
+        '-2.500 VIZ',
+        '10.000000 SHARES',
+        '0.500 VIZ',
+        '3.000000 SHARES',
+    ]
+    with pytest.raises(ValueError, match='decimal places'):
+        AmountArray.from_strings(['0.0001 VIZ'])
+    with pytest.raises(ValueError, match='Unknown assets: GOLOS'):
+        AmountArray.from_strings(['1.000 GOLOS'])
+
+
+def test_aggregate(array):
+    assert array.sum() == {'VIZ': Amount('-0.999 VIZ'), 'SHARES': Amount('13 SHARES')}
+    assert str(array.sum()['VIZ']) == '-0.999 VIZ'
+    assert array.cumsum().units.tolist() == [1000, 1001, -1499, 10000000, -999, 13000000]
+
+    totals = array.groupby_account()
+    assert list(zip(totals.accounts, totals.to_strings())) == [
+        ('alice', '0.001 VIZ'),
+        ('alice', '3.000000 SHARES'),
+        ('bob', '-1.500 VIZ'),
+        ('bob', '10.000000 SHARES'),
+        ('carol', '0.500 VIZ'),
+    ]
+
+
+def test_filter(array):
+    viz = array[array.asset_mask('VIZ')]
+    assert len(viz) == 4
+    assert viz[viz.account_mask('bob')].to_strings() == ['1.000 VIZ', '-2.500 VIZ']
+    assert array[array.units > 1000].accounts.tolist() == ['bob', 'alice']
+
+
+def test_from_ops():
+    ops = [{'from': 'alice', 'to': 'bob', 'amount': '1.000 VIZ'}, {'from': 'alice', 'to': 'bob', 'amount': '2.000 VIZ'}]
+    array = AmountArray.from_ops(ops, account_field='to')
+    assert array.groupby_account().to_strings() == ['3.000 VIZ']
+    assert len(AmountArray.from_strings([])) == 0
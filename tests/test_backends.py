@@ -0,0 +1,68 @@
+import graphenebase.ecdsa as gphecdsa
+import pytest
+from graphenebase.memo import get_shared_secret as get_shared_secret_pure
+
+from vizbase import backends
+from vizbase.account import PrivateKey
+from vizbase.exceptions import BackendError
+
+WIFS = [
+    "5JabcrvaLnBTCkCVFX5r4rmeGGfuJuVp4NAKRNLTey6pxhRQmf4",
+    "5Hw9YPABaFxa2LooiANLrhUK5TPryy8f7v9Y1rk923PuYqbYdfC",
+]
+
+
+@pytest.fixture()
+def _backend_state(monkeypatch):
+    # keep backend choice of other tests intact
+    monkeypatch.setattr(gphecdsa, 'SECP256K1_MODULE', gphecdsa.SECP256K1_MODULE)
+    monkeypatch.setattr(backends, '_selected', None)
+    monkeypatch.setattr(backends, '_checked', {})
+
+
+@pytest.mark.usefixtures('_backend_state')
+def test_ecdsa():
+    assert 'ecdsa' in backends.available_backends()
+    backends.self_test('ecdsa')
+    backends.set_backend('ecdsa')
+    assert backends.get_backend() == 'ecdsa'
+    assert backends.select_backend() == 'ecdsa'
+
+
+@pytest.mark.usefixtures('_backend_state')
+def test_select():
+    name = backends.select_backend()
+    assert backends.get_backend() == name
+    assert backends._checked[name] is None
+    # preferred backends are either missing or broken
+    for other in backends.BACKENDS[: backends.BACKENDS.index(name)]:
+        assert other not in backends.available_backends() or backends._checked[other] is not None
+
+    signature = gphecdsa.sign_message(b'message', WIFS[0])
+    assert gphecdsa.verify_message(b'message', signature) == bytes(PrivateKey(WIFS[0]).pubkey)
+
+
+@pytest.mark.usefixtures('_backend_state')
+def test_broken(monkeypatch):
+    with pytest.raises(BackendError):
+        backends.set_backend('unknown')
+
+    def sign_message(message, wif):
+        return b'\x1f' + b'\x80' * 64
+
+    monkeypatch.setattr(gphecdsa, 'sign_message', sign_message)
+    with pytest.raises(BackendError):
+        backends.set_backend('ecdsa')
+    with pytest.raises(BackendError):
+        backends.select_backend(['ecdsa'])
+    assert backends._selected is None
+
+
+@pytest.mark.usefixtures('_backend_state')
+@pytest.mark.parametrize('name', backends.BACKENDS)
+def test_shared_secret(name):
+    if name not in backends.available_backends():
+        pytest.skip('{} is not installed'.format(name))
+    priv, peer = PrivateKey(WIFS[0]), PrivateKey(WIFS[1])
+    with backends.use_backend(name):
+        assert backends.get_shared_secret(priv, peer.pubkey) == get_shared_secret_pure(priv, peer.pubkey)
@@ -0,0 +1,97 @@
+from types import SimpleNamespace
+
+import pytest
+
+from viz.crawler import AccountCrawler, JsonlSink, SqliteSink
+
+NAMES = ['alice', 'bob', 'carol', 'dave', 'eve', 'frank', 'grace']
+
+
+def lookup_accounts(lower_bound, limit):
+    return [name for name in NAMES if name >= lower_bound][:limit]
+
+
+def get_accounts(names):
+    return [{'name': name, 'balance': '1.000 VIZ'} for name in names]
+
+
+@pytest.fixture()
+def crawler():
+    instance = SimpleNamespace(rpc=SimpleNamespace(lookup_accounts=lookup_accounts, get_accounts=get_accounts))
+    return AccountCrawler(
+        blockchain_instance=instance, page_size=3, batch_size=2, max_workers=2, parallel_connections=False
+    )
+
+
+def test_names(crawler):
+    assert list(crawler.names()) == NAMES
+    assert list(crawler.names('carol')) == NAMES[3:]
+
+
+def test_names_small_pages(crawler):
+    crawler.page_size = 1
+    assert list(crawler.names()) == NAMES
+    assert list(crawler.names('frank')) == ['grace']
+    assert list(crawler.names('grace')) == []
+
+
+def test_thread_rpc(monkeypatch):
+    connections = []
+
+    class FakeNodeRPC:
+        def __init__(self, urls, **kwargs):
+            self.urls, self.kwargs = urls, kwargs
+            self.connection = SimpleNamespace(disconnect=lambda: connections.remove(self))
+            connections.append(self)
+
+        def get_accounts(self, names):
+            return get_accounts(names)
+
+    monkeypatch.setattr('viz.connections.NodeRPC', FakeNodeRPC)
+    main_rpc = SimpleNamespace(
+        url='ws://b',
+        _url_counter={'ws://a': 0, 'ws://b': 0},
+        num_retries=3,
+        _kwargs={'user': 'u', 'password': 'p'},
+        lookup_accounts=lookup_accounts,
+    )
+    crawler = AccountCrawler(blockchain_instance=SimpleNamespace(rpc=main_rpc), max_workers=2)
+    rpc = crawler.thread_rpc()
+    assert rpc.urls == ['ws://b', 'ws://a']
+    assert rpc.kwargs == {'num_retries': 3, 'user': 'u', 'password': 'p'}
+
+    assert crawler.crawl(lambda account: None) == len(NAMES)
+    assert connections == []
+
+
+def test_crawl_callback(crawler):
+    accounts = []
+    assert crawler.crawl(accounts.append) == len(NAMES)
+    assert [account['name'] for account in accounts] == NAMES
+
+
+def test_crawl_resume_jsonl(crawler, tmp_path):
+    path = str(tmp_path / 'accounts.jsonl')
+    with JsonlSink(path) as sink:
+        assert sink.last_name() is None
+        crawler.crawl(sink, start='eve')
+    with JsonlSink(path) as sink:
+        assert sink.last_name() == 'grace'
+        assert crawler.crawl(sink) == 0
+
+
+def test_jsonl_partial_line(tmp_path):
+    path = tmp_path / 'accounts.jsonl'
+    path.write_text('{"name": "alice"}\n{"name": "bo')
+    with JsonlSink(str(path)) as sink:
+        assert sink.last_name() == 'alice'
+        sink.write({'name': 'bob'})
+    assert path.read_text() == '{"name": "alice"}\n{"name": "bob"}\n'
+
+
+def test_crawl_resume_sqlite(crawler, tmp_path):
+    path = str(tmp_path / 'accounts.sqlite')
+    with SqliteSink(path) as sink:
+        crawler.crawl(sink, start='dave')
+        assert sink.last_name() == 'grace'
+        assert crawler.crawl(sink, start='') == len(NAMES)
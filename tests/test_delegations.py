@@ -0,0 +1,112 @@
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from viz.delegations import DelegationGraph  # noqa: E402
+
+NAMES = ['alice', 'bob', 'carol', 'dave']
+
+
+def delegation(id_, delegator, delegatee, shares):
+    return {'id': id_, 'delegator': delegator, 'delegatee': delegatee, 'vesting_shares': '{} SHARES'.format(shares)}
+
+
+def expiring(id_, delegator, shares, expiration):
+    return {'id': id_, 'delegator': delegator, 'vesting_shares': '{} SHARES'.format(shares), 'expiration': expiration}
+
+
+@pytest.fixture()
+def chain():
+    return SimpleNamespace(
+        delegations=[
+            delegation(1, 'alice', 'bob', '10.000000'),
+            delegation(2, 'carol', 'bob', '5.000000'),
+            delegation(3, 'bob', 'dave', '1.000000'),
+            delegation(4, 'alice', 'carol', '1.000000'),
+        ],
+        expiring=[
+            expiring(5, 'alice', '2.000000', '2020-01-01T00:00:00'),
+            expiring(6, 'alice', '1.000000', '2020-01-01T00:00:00'),
+        ],
+        routes=[{'from_account': 'dave', 'to_account': 'alice', 'percent': 5000, 'auto_vest': False}],
+    )
+
+
+@pytest.fixture()
+def graph(chain):
+    """Graph crawling fake node with minimal pages, lower bounds are inclusive like in the node."""
+
+    def get_vesting_delegations(account, lower_bound, limit, type_):
+        key, bound = ('delegator', 'delegatee') if type_ == 'delegated' else ('delegatee', 'delegator')
+        items = sorted((item for item in chain.delegations if item[key] == account), key=lambda item: item[bound])
+        return [item for item in items if item[bound] >= lower_bound][:limit]
+
+    def get_expiring_vesting_delegations(account, from_time, limit):
+        items = [item for item in chain.expiring if item['delegator'] == account and item['expiration'] >= from_time]
+        return sorted(items, key=lambda item: (item['expiration'], item['id']))[:limit]
+
+    def get_withdraw_routes(account, type_):
+        key = 'from_account' if type_ == 'outgoing' else 'to_account'
+        return [route for route in chain.routes if route[key] == account]
+
+    rpc = SimpleNamespace(
+        lookup_accounts=lambda lower_bound, limit: [name for name in NAMES if name >= lower_bound][:limit],
+        get_vesting_delegations=get_vesting_delegations,
+        get_expiring_vesting_delegations=get_expiring_vesting_delegations,
+        get_withdraw_routes=get_withdraw_routes,
+    )
+    return DelegationGraph(blockchain_instance=SimpleNamespace(rpc=rpc), page_size=1, parallel_connections=False)
+
+
+def test_crawl(graph):
+    graph.crawl(['bob'])
+    assert graph.delegations == {('alice', 'bob'): 10000000, ('carol', 'bob'): 5000000, ('bob', 'dave'): 1000000}
+    assert graph.routes == {}
+
+    graph.crawl()
+    assert len(graph.delegations) == 4
+    assert graph.expiring == {'alice': 3000000}
+    assert graph.routes == {('dave', 'alice'): (5000, False)}
+
+
+def test_crawl_drops_stale_edges(graph, chain):
+    graph.crawl()
+    chain.delegations = [item for item in chain.delegations if item['delegator'] != 'alice']
+    chain.expiring = []
+    chain.routes = []
+
+    graph.crawl(['alice'])
+    assert graph.delegations == {('carol', 'bob'): 5000000, ('bob', 'dave'): 1000000}
+    assert graph.expiring == {}
+    assert graph.routes == {}
+    assert graph.inbound_delegation('bob') == 5000000
+
+
+def test_queries(graph):
+    graph.crawl()
+    assert graph.inbound_delegation('bob') == 15000000
+    assert graph.outbound_delegation('bob') == 1000000
+    assert graph.inbound_delegation('unknown') == 0
+    assert graph.delegators('bob') == {'alice': 10000000, 'carol': 5000000}
+    assert graph.top_delegators(2) == [('alice', 11000000), ('carol', 5000000)]
+    assert graph.top_delegators(1, to='bob') == [('alice', 10000000)]
+    assert graph.reachable('alice') == {'bob', 'carol', 'dave'}
+    assert graph.reachable('dave', reverse=True) == {'alice', 'bob', 'carol'}
+    assert graph.reachable('dave', kind='routes') == {'alice'}
+
+
+def test_apply_op(graph):
+    op = {'type': 'delegate_vesting_shares', 'delegator': 'alice', 'delegatee': 'bob'}
+    graph.apply_op(dict(op, vesting_shares='3.000000 SHARES'))
+    assert graph.inbound_delegation('bob') == 3000000
+    graph.apply_op(dict(op, vesting_shares='0.000000 SHARES'))
+    assert graph.inbound_delegation('bob') == 0
+
+    op = {'type': 'set_withdraw_vesting_route', 'from_account': 'a', 'to_account': 'b', 'auto_vest': True}
+    graph.apply_op(dict(op, percent=100))
+    assert graph.reachable('a', kind='routes') == {'b'}
+    graph.apply_op({'type': 'transfer', 'from': 'a', 'to': 'b', 'amount': '1.000 VIZ'})
+    graph.apply_op(dict(op, percent=0))
+    assert graph.reachable('a', kind='routes') == set()
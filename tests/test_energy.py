@@ -0,0 +1,109 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from viz.account import AccountSnapshot
+from viz.energy import EnergyModel
+
+
+def make_snapshot(name, energy, last_vote_time):
+    authority = {'weight_threshold': 1, 'account_auths': [], 'key_auths': []}
+    return AccountSnapshot.from_dict(
+        {
+            'name': name,
+            'balance': '1.000 VIZ',
+            'vesting_shares': '1.000000 SHARES',
+            'delegated_vesting_shares': '0.000000 SHARES',
+            'received_vesting_shares': '0.000000 SHARES',
+            'energy': energy,
+            'last_vote_time': last_vote_time,
+            'master_authority': authority,
+            'active_authority': authority,
+            'regular_authority': authority,
+            'memo_key': 'VIZ1111111111111111111111111111111114T1Anm',
+        }
+    )
+
+
+@pytest.fixture()
+def model():
+    config = {'CHAIN_100_PERCENT': 10000, 'CHAIN_1_PERCENT': 100, 'CHAIN_ENERGY_REGENERATION_SECONDS': 432000}
+    model = EnergyModel(blockchain_instance=SimpleNamespace(rpc=SimpleNamespace(config=config)))
+    model.update(make_snapshot('alice', 5000, '2020-01-01T00:00:00'))
+    return model
+
+
+def test_predict(model):
+    assert model.predict('alice', at=datetime(2020, 1, 1)) == 50
+    assert model.predict('alice', at=datetime(2020, 1, 2)) == 70
+    assert model.predict('alice', at=datetime(2020, 2, 1)) == 100
+    assert model.can_spend('alice', 70, at=datetime(2020, 1, 2))
+    assert not model.can_spend('alice', 71, at=datetime(2020, 1, 2))
+    # 1.15 * 100 is 114.99999999999999 in floating point
+    model.update(make_snapshot('bob', 114, '2020-01-01T00:00:00'))
+    assert not model.can_spend('bob', 1.15, at=datetime(2020, 1, 1))
+
+    with pytest.raises(KeyError):
+        model.predict('carol')
+
+
+def test_apply_op(model):
+    model.apply_op({'type': 'transfer', 'from': 'alice', 'to': 'bob', 'timestamp': '2020-01-02T00:00:00'})
+    model.apply_op({'type': 'award', 'initiator': 'bob', 'energy': 1000, 'timestamp': '2020-01-02T00:00:00'})
+    assert 'bob' not in model
+
+    award = {
+        'type': 'award',
+        'initiator': 'alice',
+        'energy': 1000,
+        'timestamp': '2020-01-02T00:00:00',
+        'block_num': 28800,
+        'trx_id': 'aa' * 20,
+        'op_in_trx': 0,
+    }
+    model.apply_op(award)
+    assert model.predict('alice', at=datetime(2020, 1, 2)) == 60
+    assert not model.is_estimated('alice')
+
+    # replayed operation is not applied twice
+    model.apply_op(dict(award))
+    assert model.predict('alice', at=datetime(2020, 1, 2)) == 60
+    # operation older than the account state is ignored
+    model.apply_op(dict(award, timestamp='2020-01-01T23:59:57', trx_id='bb' * 20))
+    assert model.predict('alice', at=datetime(2020, 1, 2)) == 60
+
+    model.apply_op({'type': 'fixed_award', 'initiator': 'alice', 'max_energy': 500, 'timestamp': '2020-01-02T00:00:03'})
+    assert model.predict('alice', at=datetime(2020, 1, 2, 0, 0, 3)) == 55
+    assert model.is_estimated('alice')
+
+
+def test_apply_ops_same_block(model):
+    ops = [
+        {
+            'type': 'award',
+            'initiator': 'alice',
+            'energy': 1000,
+            'timestamp': '2020-01-01T00:00:03',
+            'block_num': 1,
+            'trx_id': trx_id,
+            'op_in_trx': 0,
+        }
+        for trx_id in ('aa' * 20, 'bb' * 20)
+    ]
+    model.apply_ops(ops)
+    assert model.raw_energy('alice', at=datetime(2020, 1, 1, 0, 0, 3)) == 3000
+    # the block is streamed again
+    model.apply_ops(ops)
+    assert model.raw_energy('alice', at=datetime(2020, 1, 1, 0, 0, 3)) == 3000
+
+
+def test_drift(model):
+    at = datetime(2020, 1, 2)
+    assert model.observe(make_snapshot('alice', 4000, '2020-01-01T00:00:00'), at=at) == 10
+    assert model.observe(make_snapshot('alice', 4000, '2020-01-01T00:00:00'), at=at) == 0
+    assert model.observe(make_snapshot('bob', 4000, '2020-01-01T00:00:00'), at=at) is None
+    assert 'bob' in model
+
+    stats = model.drift_stats()
+    assert stats == {'count': 2, 'mean': 5.0, 'mean_abs': 5.0, 'max_abs': 10.0}
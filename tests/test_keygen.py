@@ -0,0 +1,40 @@
+from types import SimpleNamespace
+
+import pytest
+from graphenestorage import InRamConfigurationStore, SqliteEncryptedKeyStore
+
+from viz.keygen import derive_password_keys
+from viz.wallet import Wallet
+from vizbase.account import PasswordKey
+
+
+@pytest.fixture()
+def wallet(monkeypatch, tmp_path):
+    # pure python backend is always available, worker processes inherit it
+    monkeypatch.setattr('graphenebase.ecdsa.SECP256K1_MODULE', 'ecdsa')
+    client = SimpleNamespace(is_connected=lambda: True, prefix='VIZ')
+    wallet = Wallet(keys=[], blockchain_instance=client)
+    wallet.store = SqliteEncryptedKeyStore(config=InRamConfigurationStore(), data_dir=str(tmp_path))
+    wallet.unlock('password')
+    return wallet
+
+
+def test_derive_password_keys(wallet):
+    items = [('alice', 'secret', 'active'), ('alice', 'secret', 'memo'), ('bob', 'other', 'active')]
+    keys = derive_password_keys(items, max_workers=2, chunk_size=1)
+    assert [(key.account, key.role) for key in keys] == [(account, role) for account, _, role in items]
+    for key, (account, password, role) in zip(keys, items):
+        passkey = PasswordKey(account, password, role=role)
+        assert key.wif == str(passkey.get_private_key())
+        assert key.pubkey == format(passkey.get_public_key(), 'VIZ')
+
+    added = wallet.add_private_keys({key.pubkey: key.wif for key in keys[:2]}, max_workers=2)
+    assert added == [key.pubkey for key in keys[:2]]
+    # keys in the store are skipped
+    assert wallet.add_private_keys({key.pubkey: key.wif for key in keys}, max_workers=1) == [keys[2].pubkey]
+    assert sorted(wallet.store.getPublicKeys()) == sorted(key.pubkey for key in keys)
+
+    wallet.lock()
+    wallet.unlock('password')
+    for key in keys:
+        assert wallet.find_private_key(key.pubkey) == key.wif
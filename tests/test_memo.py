@@ -1,6 +1,13 @@
+from types import SimpleNamespace
+
 import pytest
+from graphenebase.base58 import base58encode
+from graphenebase.memo import get_shared_secret
+from graphenecommon.exceptions import MissingKeyError
 
 from viz.memo import Memo
+from vizbase import memo, objects
+from vizbase.account import PrivateKey
 
 
 @pytest.mark.usefixtures('viz')
@@ -10,3 +17,107 @@ def test_encrypt_decrypt():
     encrypted = memo.encrypt(text)
     decrypted = memo.decrypt(encrypted)
     assert decrypted == text
+
+
+@pytest.fixture()
+def keys(monkeypatch):
+    # pure python backend is always available
+    monkeypatch.setattr('graphenebase.ecdsa.SECP256K1_MODULE', 'ecdsa')
+    return (
+        PrivateKey('5JabcrvaLnBTCkCVFX5r4rmeGGfuJuVp4NAKRNLTey6pxhRQmf4'),
+        PrivateKey('5Hw9YPABaFxa2LooiANLrhUK5TPryy8f7v9Y1rk923PuYqbYdfC'),
+    )
+
+
+def test_shared_secret_cache(keys, monkeypatch):
+    alice, bob = keys
+    derived = []
+    monkeypatch.setattr(
+        memo, 'get_shared_secret', lambda priv, pub: derived.append(pub) or get_shared_secret(priv, pub)
+    )
+    cache = memo.SharedSecretCache()
+
+    encrypted = memo.encode_memo(alice, bob.pubkey, '1', 'first', prefix='VIZ', cache=cache)
+    assert memo.decode_memo(bob, encrypted) == 'first'
+    # same secret serves both directions
+    assert memo.decode_memo(bob, encrypted, cache=cache) == 'first'
+    encrypted = memo.encode_memo(bob, alice.pubkey, '2', 'second', prefix='VIZ', cache=cache, from_pubkey=bob.pubkey)
+    assert memo.decode_memo(alice, encrypted, cache=cache) == 'second'
+    # one derivation with the cache, one for the uncached decode
+    assert len(derived) == 2
+    assert len(cache) == 1
+
+
+def test_shared_secret_cache_wrong_key(keys):
+    alice, bob = keys
+    carol = PrivateKey('5J9DBCRX5D2ZUUuy9qV2ef9p5sfA3ydHsDs2G531bob7wbEigDJ')
+    cache = memo.SharedSecretCache()
+    encrypted = memo.encode_memo(alice, bob.pubkey, '1', 'secret', prefix='VIZ', cache=cache)
+    assert len(cache) == 1
+    # the cached secret of the pair is not used for a key of neither side
+    with pytest.raises(ValueError, match='Incorrect PrivateKey'):
+        memo.decode_memo(carol, encrypted, cache=cache)
+    with pytest.raises(ValueError, match='Incorrect PrivateKey'):
+        memo.decode_memo(carol, encrypted, cache=cache, priv_pubkey=carol.pubkey)
+    assert memo.decode_memo(bob, encrypted, cache=cache) == 'secret'
+
+
+def test_shared_secret_cache_wipe(keys):
+    alice, bob = keys
+    carol = PrivateKey('5J9DBCRX5D2ZUUuy9qV2ef9p5sfA3ydHsDs2G531bob7wbEigDJ')
+    cache = memo.SharedSecretCache(maxsize=1, wipe=True)
+    first = cache.derive(alice, bob.pubkey)
+    assert first.hex() == get_shared_secret(alice, bob.pubkey)
+    second = cache.derive(alice, carol.pubkey)
+    assert first == bytearray(32)
+    assert cache.get(alice.pubkey, bob.pubkey) is None
+    assert cache.get(carol.pubkey, alice.pubkey) is second
+    cache.clear()
+    assert second == bytearray(32)
+    assert len(cache) == 0
+
+
+def test_decrypt_many(keys):
+    alice, bob = keys
+    carol = PrivateKey('5J9DBCRX5D2ZUUuy9qV2ef9p5sfA3ydHsDs2G531bob7wbEigDJ')
+    wallet = {str(bob.pubkey): str(bob)}
+    client = SimpleNamespace(prefix='VIZ', wallet=SimpleNamespace(find_private_key=lambda pub: wallet.get(str(pub))))
+    memos = [
+        memo.encode_memo(alice, bob.pubkey, '1', 'first', prefix='VIZ'),
+        {'from': 'alice', 'to': 'bob', 'memo': 'plain'},
+        memo.encode_memo(alice, carol.pubkey, '2', 'unknown keys', prefix='VIZ'),
+        {'from': 'carol', 'to': 'bob', 'memo': memo.encode_memo(carol, bob.pubkey, '3', 'third', prefix='VIZ')},
+        '#invalid',
+        memo.encode_memo(alice, bob.pubkey, '4', 'fourth', prefix='VIZ'),
+    ]
+
+    results = list(Memo(blockchain_instance=client).decrypt_many(memos, max_workers=2, batch_size=4, chunk_size=1))
+    assert [result.message for result in results] == ['first', 'plain', None, 'third', None, 'fourth']
+    assert isinstance(results[2].error, MissingKeyError)
+    assert results[4].error is not None
+    assert results[3].memo == memos[3]['memo']
+
+
+@pytest.mark.parametrize('text', ['', 'short', 'x' * 16, 'привет', 'long memo ' * 100])
+def test_memo_codec(keys, text):
+    alice, bob = keys
+    encrypted = memo.encode_memo(alice, bob.pubkey, '42', text, prefix='VIZ')
+    raw = memo.unpack_memo(encrypted)
+    # same bytes as the memo object serializer
+    obj = objects.Memo(
+        **{
+            'from': format(alice.pubkey, 'VIZ'),
+            'to': format(bob.pubkey, 'VIZ'),
+            'nonce': raw.nonce,
+            'check': raw.check,
+            'encrypted': raw.encrypted.hex(),
+        }
+    )
+    assert encrypted == '#' + base58encode(bytes(obj).hex())
+    assert memo.pack_memo(raw) == encrypted
+    assert raw.nonce == 42
+    assert memo.decode_memo(bob, encrypted) == text
+    assert [repr(key) for key in memo.involved_keys(encrypted)] == [repr(alice.pubkey), repr(bob.pubkey)]
+
+    with pytest.raises(ValueError, match='length'):
+        memo.unpack_memo('#' + base58encode(bytes(obj).hex() + '00'))
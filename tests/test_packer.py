@@ -0,0 +1,92 @@
+from types import SimpleNamespace
+
+import pytest
+from graphenecommon.exceptions import MissingKeyError
+
+from viz.packer import OpPacker
+from viz.transactionbuilder import TransactionBuilder
+from vizbase import operations
+from vizbase.account import PrivateKey
+from vizbase.chains import KNOWN_CHAINS
+from vizbase.signedtransactions import Signed_Transaction
+
+WIF = "5JabcrvaLnBTCkCVFX5r4rmeGGfuJuVp4NAKRNLTey6pxhRQmf4"
+
+
+def transfer(sender, to):
+    return operations.Transfer(**{'from': sender, 'to': to, 'amount': '1.000 VIZ', 'memo': 'payout'})
+
+
+@pytest.fixture()
+def client(monkeypatch):
+    # pure python backend is always available
+    monkeypatch.setattr('graphenebase.ecdsa.SECP256K1_MODULE', 'ecdsa')
+
+    def append_signer(self, accounts, permission):
+        if accounts == 'nokey':
+            raise MissingKeyError
+        self.appendWif(WIF)
+
+    monkeypatch.setattr(TransactionBuilder, 'appendSigner', append_signer)
+
+    broadcasted = []
+
+    def broadcast_transaction(tx, api):
+        if tx['operations'][0][1]['to'] == 'invalid':
+            raise ValueError('invalid account')
+        broadcasted.append(tx)
+
+    rpc = SimpleNamespace(
+        chain_params=KNOWN_CHAINS['VIZ'],
+        get_dynamic_global_properties=lambda: {
+            'head_block_number': 5,
+            'head_block_id': '0000000500000000aaaaaaaa0000000000000000',
+            'maximum_block_size': 65536,
+        },
+        broadcast_transaction=broadcast_transaction,
+    )
+    return SimpleNamespace(
+        rpc=rpc, expiration=30, proposer=None, nobroadcast=False, blocking=False, broadcasted=broadcasted
+    )
+
+
+def test_pack(client):
+    # transfer with 6 bytes memo is 34 bytes, transaction overhead with one signature is 78 bytes
+    packer = OpPacker(blockchain_instance=client, max_tx_size=78 + 3 * 34, parallel_connections=False)
+    items = [(transfer('alice', 'bob'), 'alice', 'active') for _ in range(7)]
+    items.insert(2, (transfer('carol', 'bob'), 'carol', 'active'))
+    batches = list(packer.pack(items))
+    assert [(batch.account, [index for index, _ in batch.ops]) for batch in batches] == [
+        ('alice', [0, 1, 3]),
+        ('alice', [4, 5, 6]),
+        ('alice', [7]),
+        ('carol', [2]),
+    ]
+
+    packer.max_ops = 2
+    assert [len(batch.ops) for batch in packer.pack(items)] == [2, 2, 2, 1, 1]
+
+
+def test_broadcast(client):
+    packer = OpPacker(blockchain_instance=client, max_ops=2, parallel_connections=False)
+    items = [
+        (transfer('alice', 'bob'), 'alice', 'active'),
+        (transfer('alice', 'carol'), 'alice', 'active'),
+        (transfer('alice', 'invalid'), 'alice', 'active'),
+        (transfer('nokey', 'bob'), 'nokey', 'active'),
+    ]
+    results = sorted(packer.broadcast(items))
+    assert [result.index for result in results] == [0, 1, 2, 3]
+    assert results[0].error is None
+    assert results[0].tx_id == results[1].tx_id
+    assert len(results[0].tx_id) == 40
+    assert isinstance(results[2].error, ValueError)
+    assert isinstance(results[3].error, MissingKeyError)
+    assert results[3].tx_id is None
+
+    assert len(client.broadcasted) == 1
+    assert len(client.broadcasted[0]['operations']) == 2
+    assert len(client.broadcasted[0]['signatures']) == 1
+    tx = Signed_Transaction(**client.broadcasted[0])
+    assert tx.id == results[0].tx_id
+    assert tx.verify([PrivateKey(WIF).pubkey], KNOWN_CHAINS['VIZ'])
@@ -0,0 +1,71 @@
+from types import SimpleNamespace
+
+import pytest
+
+from viz.refblock import RefBlockProvider, block_params
+from viz.transactionbuilder import TransactionBuilder
+
+HEAD_BLOCK_ID = '0001e2406b24e6bd0d1b2a6d8c4f9b3f0a5e7c11'
+
+
+@pytest.fixture()
+def rpc():
+    rpc = SimpleNamespace(config={'CHAIN_BLOCK_INTERVAL': 3}, calls=0)
+
+    def get_dynamic_global_properties():
+        rpc.calls += 1
+        return {'head_block_number': 0x1E240, 'head_block_id': HEAD_BLOCK_ID}
+
+    rpc.get_dynamic_global_properties = get_dynamic_global_properties
+    return rpc
+
+
+@pytest.fixture()
+def clock(monkeypatch):
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr('viz.refblock.time.monotonic', lambda: clock.now)
+    return clock
+
+
+def test_block_params():
+    assert block_params(0x1E240, HEAD_BLOCK_ID) == (0xE240, 0xBDE6246B)
+
+
+def test_cache(rpc, clock):
+    provider = RefBlockProvider(blockchain_instance=SimpleNamespace(rpc=rpc), max_age=10)
+    assert provider.age() is None
+    params = provider.get()
+    assert params == block_params(0x1E240, HEAD_BLOCK_ID)
+
+    clock.now += 27
+    assert provider.get() == params
+    assert rpc.calls == 1
+
+    clock.now += 3
+    provider.get()
+    assert rpc.calls == 2
+
+
+def test_feed_block(rpc, clock):
+    provider = RefBlockProvider(blockchain_instance=SimpleNamespace(rpc=rpc))
+    provider.get()
+    newer_id = '0001e2416b24e6bd0d1b2a6d8c4f9b3f0a5e7c11'
+    provider.feed_block({'block_id': newer_id})
+    assert provider.get() == (0xE241, 0xBDE6246B)
+    # older blocks don't replace the reference
+    provider.feed_block({'block_id': HEAD_BLOCK_ID})
+    assert provider.get() == (0xE241, 0xBDE6246B)
+    assert rpc.calls == 1
+
+
+def test_max_age():
+    with pytest.raises(ValueError, match='max_age'):
+        RefBlockProvider(blockchain_instance=SimpleNamespace(rpc=None), max_age=0x8001)
+
+
+def test_transactionbuilder(rpc, clock):
+    provider = RefBlockProvider(blockchain_instance=SimpleNamespace(rpc=rpc))
+    builder = SimpleNamespace(blockchain=SimpleNamespace(rpc=rpc, ref_block_provider=provider))
+    for _ in range(3):
+        assert TransactionBuilder.get_block_params(builder) == block_params(0x1E240, HEAD_BLOCK_ID)
+    assert rpc.calls == 1
@@ -0,0 +1,107 @@
+from types import SimpleNamespace
+
+import pytest
+
+from viz.exceptions import AccountExistsException
+from viz.registration import AccountRegistrar, NewAccount
+from viz.transactionbuilder import TransactionBuilder
+from vizbase.account import PasswordKey
+from vizbase.chains import KNOWN_CHAINS
+
+WIF = "5JabcrvaLnBTCkCVFX5r4rmeGGfuJuVp4NAKRNLTey6pxhRQmf4"
+PUBKEY = "VIZ6LLegbAgLAy28EHrffBVuANFWcFgmqRMW13wBmTExqFE9SCkg4"
+
+
+@pytest.fixture()
+def client(monkeypatch):
+    # pure python backend is always available
+    monkeypatch.setattr('graphenebase.ecdsa.SECP256K1_MODULE', 'ecdsa')
+    monkeypatch.setattr(TransactionBuilder, 'appendSigner', lambda self, accounts, permission: self.appendWif(WIF))
+
+    calls = []
+    broadcasted = []
+
+    def rpc_call(name, result):
+        def call(*args, **kwargs):
+            calls.append(name)
+            return result(*args) if callable(result) else result
+
+        return call
+
+    def broadcast_transaction(tx, api):
+        names = [op[1]['new_account_name'] for op in tx['operations']]
+        if 'rejected' in names:
+            raise ValueError('rejected')
+        broadcasted.append(names)
+
+    rpc = SimpleNamespace(
+        chain_params=KNOWN_CHAINS['VIZ'],
+        config={'CHAIN_BLOCK_INTERVAL': 3},
+        get_dynamic_global_properties=rpc_call(
+            'get_dynamic_global_properties',
+            {
+                'head_block_number': 5,
+                'head_block_id': '0000000500000000aaaaaaaa0000000000000000',
+                'maximum_block_size': 65536,
+                'total_vesting_fund': '2.000000 VIZ',
+                'total_vesting_shares': '1.000000 SHARES',
+            },
+        ),
+        get_chain_properties=rpc_call(
+            'get_chain_properties', {'account_creation_fee': '1.000 VIZ', 'create_account_delegation_ratio': 10}
+        ),
+        lookup_account_names=rpc_call(
+            'lookup_account_names', lambda names: [{'name': name} if name == 'bob' else None for name in names]
+        ),
+        broadcast_transaction=broadcast_transaction,
+    )
+    stored = {}
+    wallet = SimpleNamespace(add_private_keys=lambda keys, max_workers: stored.update(keys))
+    return SimpleNamespace(
+        rpc=rpc,
+        prefix='VIZ',
+        wallet=wallet,
+        expiration=30,
+        proposer=None,
+        nobroadcast=False,
+        blocking=False,
+        calls=calls,
+        broadcasted=broadcasted,
+        stored=stored,
+    )
+
+
+def test_register(client):
+    registrar = AccountRegistrar(
+        'alice', blockchain_instance=client, batch_size=3, key_workers=1, max_workers=2, parallel_connections=False
+    )
+    pubkeys = {role: PUBKEY for role in ('master', 'active', 'regular', 'memo')}
+    accounts = [
+        ('carol', 'secret'),
+        ('bob', 'secret'),
+        NewAccount('dave', pubkeys=pubkeys, json_meta={'profile': {}}),
+        NewAccount('eve'),
+        ('carol', 'secret'),
+        ('frank', 'secret'),
+        ('rejected', 'secret'),
+    ]
+    results = list(registrar.register(accounts))
+
+    assert [result.name for result in results] == ['carol', 'bob', 'dave', 'eve', 'carol', 'frank', 'rejected']
+    assert [result.error is None for result in results] == [True, False, True, False, False, True, False]
+    assert isinstance(results[1].error, AccountExistsException)
+    assert isinstance(results[3].error, ValueError)
+    assert str(results[6].error) == 'rejected'
+    # a name repeated in a later batch is not registered again
+    assert isinstance(results[4].error, AccountExistsException)
+    assert results[0].tx_id == results[2].tx_id
+    assert client.broadcasted == [['carol', 'dave'], ['frank']]
+
+    # one lookup per batch, chain properties once per block interval
+    assert client.calls.count('lookup_account_names') == 3
+    assert client.calls.count('get_chain_properties') == 1
+    assert registrar.amounts() == ('1.000 VIZ', '20.000000 SHARES')
+
+    expected = {format(PasswordKey('carol', 'secret', role='memo').get_public_key(), 'VIZ')}
+    assert expected <= set(client.stored)
+    assert len(client.stored) == 12
@@ -0,0 +1,101 @@
+from types import SimpleNamespace
+
+import pytest
+from grapheneapi.exceptions import NumRetriesReached
+
+from viz.exceptions import TransactionExpired
+from viz.retry import RetryPolicy
+from viz.transactionbuilder import TransactionBuilder
+from vizapi.exceptions import MissingRequiredAuthority, UnhandledRPCError
+from vizbase import operations
+from vizbase.chains import KNOWN_CHAINS
+
+WIF = "5JabcrvaLnBTCkCVFX5r4rmeGGfuJuVp4NAKRNLTey6pxhRQmf4"
+TX = {'expiration': '2100-01-01T00:00:00'}
+
+
+class Node:
+    """Node failing broadcasts with given errors, ``None`` accepts the transaction."""
+
+    def __init__(self, *errors, included=False):
+        self.errors = list(errors)
+        self.included = included
+        self.broadcasted = []
+        self.lookups = 0
+
+    def broadcast_transaction(self, tx, api):
+        self.broadcasted.append(tx)
+        error = self.errors.pop(0) if self.errors else None
+        if error is not None:
+            raise error
+
+    def get_transaction(self, tx_id):
+        self.lookups += 1
+        if not self.included:
+            raise UnhandledRPCError('Unknown Transaction {}'.format(tx_id))
+        return {'transaction_id': tx_id}
+
+
+@pytest.fixture()
+def policy(monkeypatch):
+    monkeypatch.setattr('viz.retry.time.sleep', lambda seconds: None)
+    return RetryPolicy(attempts=3)
+
+
+def test_retry(policy):
+    node = Node(NumRetriesReached(), TimeoutError())
+    policy.broadcast(node, TX, 'a' * 40)
+    assert len(node.broadcasted) == 3
+    assert node.lookups == 2
+
+    node = Node(NumRetriesReached(), NumRetriesReached(), NumRetriesReached())
+    with pytest.raises(NumRetriesReached):
+        policy.broadcast(node, TX, 'a' * 40)
+    assert len(node.broadcasted) == 3
+
+
+def test_included(policy):
+    node = Node(NumRetriesReached(), included=True)
+    policy.broadcast(node, TX, 'a' * 40)
+    assert len(node.broadcasted) == 1
+
+    node = Node(NumRetriesReached(), UnhandledRPCError('Duplicate transaction check failed'))
+    policy.broadcast(node, TX, 'a' * 40)
+    assert len(node.broadcasted) == 2
+
+
+def test_rejected(policy):
+    node = Node(MissingRequiredAuthority('Missing Active Authority alice'))
+    with pytest.raises(MissingRequiredAuthority):
+        policy.broadcast(node, TX, 'a' * 40)
+    assert len(node.broadcasted) == 1
+
+    node = Node(NumRetriesReached())
+    with pytest.raises(TransactionExpired):
+        policy.broadcast(node, {'expiration': '2000-01-01T00:00:00'}, 'a' * 40)
+
+
+def test_transactionbuilder(monkeypatch, policy):
+    # pure python backend is always available
+    monkeypatch.setattr('graphenebase.ecdsa.SECP256K1_MODULE', 'ecdsa')
+    node = Node(NumRetriesReached())
+    node.chain_params = KNOWN_CHAINS['VIZ']
+    node.get_dynamic_global_properties = lambda: {
+        'head_block_number': 5,
+        'head_block_id': '0000000500000000aaaaaaaa0000000000000000',
+    }
+    client = SimpleNamespace(
+        rpc=node, expiration=30, proposer=None, nobroadcast=False, blocking=False, retry_policy=policy
+    )
+    builder = TransactionBuilder(blockchain_instance=client)
+    builder.appendOps(operations.Transfer(**{'from': 'alice', 'to': 'bob', 'amount': '1.000 VIZ', 'memo': ''}))
+    builder.appendWif(WIF)
+    tx_id = builder.id
+    builder.sign()
+    assert builder.id == tx_id
+    assert TransactionBuilder(tx=builder.json(), blockchain_instance=client).id == tx_id
+
+    builder.broadcast()
+    assert len(node.broadcasted) == 2
+    assert node.broadcasted[0] == node.broadcasted[1]
+    assert len(node.broadcasted[0]['signatures']) == 1
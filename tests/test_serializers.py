@@ -0,0 +1,232 @@
+from binascii import hexlify
+
+import pytest
+
+from vizbase import operationids, operations
+from vizbase.objects import Operation
+from vizbase.account import PrivateKey
+from vizbase.chains import KNOWN_CHAINS
+from vizbase.serializers import (
+    OperationTemplate,
+    TransactionEncoder,
+    serialize_op,
+    serialize_ops,
+    serialize_transaction,
+    transaction_id,
+)
+from vizbase.signedtransactions import Signed_Transaction
+
+KEYS = [
+    'VIZ6Q1LNQWadRVeosq2TjR248vKicuHqx7vCzMowVoEt6RNLXD7sP',
+    'VIZ7eAhqG2xxv9RLcsMHswv2MJt6SFPUp9dA6A6sWeZj1LJGFZe4M',
+    'VIZ7jz2YdLcdp4mvju8xXZZzk72Fs24MnrtZg2ZU7uufURGfr7NPN',
+]
+PERMISSION = {'weight_threshold': 1, 'account_auths': [['bob', 1]], 'key_auths': [[KEYS[1], '1'], [KEYS[0], 1]]}
+CHAIN_PROPERTIES = {
+    'account_creation_fee': '1.000 VIZ',
+    'maximum_block_size': 65536,
+    'create_account_delegation_ratio': 2,
+    'create_account_delegation_time': 3600,
+    'min_delegation': '10.000 VIZ',
+    'min_curation_percent': 1000,
+    'max_curation_percent': 2000,
+    'bandwidth_reserve_percent': 1000,
+    'bandwidth_reserve_below': '10.000 SHARES',
+    'flag_energy_additional_cost': 1000,
+    'vote_accounting_min_rshares': 100000,
+    'committee_request_approve_min_percent': 1000,
+    'inflation_witness_percent': 1000,
+    'inflation_ratio_committee_vs_reward_fund': 5000,
+    'inflation_recalc_period': 3600,
+    'data_operations_cost_additional_bandwidth': 0,
+    'witness_miss_penalty_percent': 1000,
+    'witness_miss_penalty_duration': 3600,
+    'create_invite_min_balance': '1.000 VIZ',
+    'committee_create_request_fee': '1.000 VIZ',
+    'create_paid_subscription_fee': '1.000 VIZ',
+    'account_on_sale_fee': '1.000 VIZ',
+    'subaccount_on_sale_fee': '1.000 VIZ',
+    'witness_declaration_fee': '1.000 VIZ',
+    'withdraw_intervals': 10,
+}
+
+# same vectors as test_serialization.py, plus the rest of vizbase.operations
+OPS = [
+    ('transfer', {'from': 'vvk', 'to': 'vvk2', 'amount': '1.000 VIZ', 'memo': 'foo'}),
+    ('transfer', {'from': 'vvk', 'to': 'vvk2', 'amount': '0.001 VIZ'}),
+    ('transfer', {'from': 'vvk', 'to': 'vvk2', 'amount': '1.000 VIZ', 'memo': 'кириллица\x01\x08\tend'}),
+    ('versioned_chain_properties_update', {'owner': 'vvk', 'props': CHAIN_PROPERTIES}),
+    (
+        'proposal_create',
+        {
+            'author': 'vvk',
+            'title': 'test',
+            'memo': 'test proposal',
+            'proposed_operations': [
+                {'op': [2, {'from': 'viz', 'to': 'vvk2', 'amount': '1.000 VIZ', 'memo': 'proposal_create'}]}
+            ],
+            'expiration_time': '1970-01-01T00:00:00',
+            'review_period_time': '1970-01-01T00:10:00',
+            'extensions': [],
+        },
+    ),
+    (
+        'proposal_create',
+        {
+            'author': 'vvk',
+            'title': 'test',
+            'proposed_operations': [{'op': ['account_metadata', {'account': 'vvk', 'json_metadata': '{}'}]}],
+            'expiration_time': '2020-06-02T13:38:03',
+        },
+    ),
+    (
+        'proposal_update',
+        {
+            'author': 'vvk',
+            'title': 'test',
+            'active_approvals_to_add': ['alice'],
+            'active_approvals_to_remove': ['bob'],
+            'master_approvals_to_add': ['alice'],
+            'master_approvals_to_remove': ['bob'],
+            'regular_approvals_to_add': ['alice'],
+            'regular_approvals_to_remove': ['bob'],
+            'key_approvals_to_add': [KEYS[0]],
+            'key_approvals_to_remove': [KEYS[1]],
+        },
+    ),
+    ('proposal_update', {'author': 'vvk', 'title': 'test'}),
+    ('proposal_delete', {'author': 'vvk', 'title': 'test', 'requester': 'bob'}),
+    (
+        'account_create',
+        {
+            'fee': '1.000 VIZ',
+            'delegation': '10.000000 SHARES',
+            'creator': 'alice',
+            'new_account_name': 'jimmy4',
+            'master': PERMISSION,
+            'active': PERMISSION,
+            'regular': PERMISSION,
+            'memo_key': KEYS[2],
+            'json_metadata': '',
+            'referrer': '',
+            'extensions': [],
+        },
+    ),
+    ('account_update', {'account': 'alice', 'memo_key': KEYS[2], 'json_metadata': {'profile': {'name': 'Alice'}}}),
+    ('account_update', {'account': 'alice', 'active': PERMISSION, 'memo_key': KEYS[2]}),
+    ('account_metadata', {'account': 'alice', 'json_metadata': {'a': 1}}),
+    (
+        'award',
+        {
+            'initiator': 'alice',
+            'receiver': 'bob',
+            'energy': 100,
+            'memo': 'thanks',
+            'beneficiaries': [{'account': 'carol', 'weight': 1000}],
+        },
+    ),
+    (
+        'fixed_award',
+        {
+            'initiator': 'alice',
+            'receiver': 'bob',
+            'reward_amount': '2.500 VIZ',
+            'max_energy': 5000,
+            'custom_sequence': 7,
+            'memo': '',
+            'beneficiaries': [],
+        },
+    ),
+    ('transfer_to_vesting', {'from': 'alice', 'to': 'bob', 'amount': '1.000 VIZ'}),
+    ('withdraw_vesting', {'account': 'alice', 'vesting_shares': '1.000000 SHARES'}),
+    ('delegate_vesting_shares', {'delegator': 'alice', 'delegatee': 'bob', 'vesting_shares': '1.000000 SHARES'}),
+    ('set_withdraw_vesting_route', {'from_account': 'alice', 'to_account': 'bob', 'percent': 100, 'auto_vest': True}),
+    ('witness_update', {'owner': 'alice', 'url': 'https://example.com', 'block_signing_key': KEYS[0]}),
+    ('witness_update', {'owner': 'alice', 'url': '', 'block_signing_key': ''}),
+    ('account_witness_vote', {'account': 'alice', 'witness': 'bob', 'approve': 1}),
+    ('custom', {'required_active_auths': [], 'required_regular_auths': ['alice'], 'id': 'test', 'json': [1, 'a']}),
+]
+
+
+def reference(name, data):
+    # classes modify their kwargs
+    klass = getattr(operations, name[0].upper() + name[1:])
+    return bytes(Operation(klass(**dict(data))))
+
+
+@pytest.mark.parametrize(('name', 'data'), OPS)
+def test_operation(name, data):
+    expected = reference(name, data)
+    assert serialize_op([name, data]) == expected
+    assert serialize_op([operationids.operations[name], data]) == expected
+
+
+def test_transaction():
+    tx = Signed_Transaction(
+        ref_block_num=54051,
+        ref_block_prefix=2406554386,
+        expiration='2020-06-02T13:38:03',
+        operations=[Operation(operations.Transfer(**dict(data))) for name, data in OPS[:2]],
+    )
+    data = tx.json()
+    assert serialize_transaction(data) == bytes(tx)
+    assert transaction_id(data) == tx.id
+
+    data['signatures'] = [hexlify(b'\x1f' + bytes(range(64))).decode('ascii')]
+    assert serialize_transaction(data) == bytes(Signed_Transaction(**data))
+    assert transaction_id(data) == tx.id
+
+
+def test_encoder(monkeypatch):
+    monkeypatch.setattr('graphenebase.ecdsa.SECP256K1_MODULE', 'ecdsa')
+    wif = '5JabcrvaLnBTCkCVFX5r4rmeGGfuJuVp4NAKRNLTey6pxhRQmf4'
+    chain = KNOWN_CHAINS['VIZ']
+    tx = Signed_Transaction(
+        ref_block_num=1,
+        ref_block_prefix=2,
+        expiration='2020-06-02T13:38:03',
+        operations=[Operation(operations.Transfer(**dict(OPS[0][1])))],
+    )
+    data = tx.json()
+    encoder = TransactionEncoder(chain['chain_id'], size=64)
+
+    data['signatures'] = encoder.sign(data, [wif, wif])
+    assert len(data['signatures']) == 1
+    assert Signed_Transaction(**data).verify([PrivateKey(wif).pubkey], chain)
+    tx.deriveDigest(chain)
+    assert encoder.digest(data) == tx.digest
+    assert encoder.transaction_id(data) == tx.id
+
+    view = encoder.encode(data)
+    assert bytes(view) == bytes(Signed_Transaction(**data))
+    # buffer is replaced while a view is alive
+    data['operations'] *= 10
+    assert bytes(encoder.encode(data)) == bytes(Signed_Transaction(**data))
+    assert bytes(view) == bytes(Signed_Transaction(**dict(data, operations=data['operations'][:1])))
+
+
+def test_errors():
+    assert serialize_ops([['transfer', OPS[0][1]]] * 3) == [reference(*OPS[0])] * 3
+    with pytest.raises(ValueError, match='not supported'):
+        serialize_op(['vote', {}])
+    with pytest.raises(KeyError):
+        serialize_op(['transfer', {'from': 'alice'}])
+    with pytest.raises(ValueError, match='too long'):
+        serialize_op(['custom', dict(OPS[-1][1], id='x' * 33)])
+
+
+@pytest.mark.parametrize(('name', 'data', 'variable'), [(*OPS[0], ['to', 'amount']), (*OPS[14], ['receiver', 'memo'])])
+def test_template(name, data, variable):
+    template = OperationTemplate([name, {k: v for k, v in data.items() if k not in variable}], variable)
+    values = {'to': 'carol', 'receiver': 'carol', 'amount': '12.345 VIZ', 'memo': 'changed'}
+    values = {field: values[field] for field in variable}
+    op = template.op(values)
+    assert op == [name, dict(data, **values)]
+    assert template.serialize(values) == reference(*op)
+    tx = {'ref_block_num': 1, 'ref_block_prefix': 2, 'expiration': '2020-06-02T13:38:03', 'operations': [op]}
+    assert transaction_id(dict(tx, operations=[template.serialize(values)])) == transaction_id(tx)
+
+    with pytest.raises(KeyError):
+        template.serialize({})
+    with pytest.raises(ValueError, match='Unknown fields'):
+        OperationTemplate([name, data], ['unknown'])
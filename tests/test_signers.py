@@ -0,0 +1,107 @@
+from types import SimpleNamespace
+
+import pytest
+
+from viz.signers import SignerCache
+from viz.transactionbuilder import TransactionBuilder
+from vizbase import operations
+from vizbase.account import PrivateKey
+from vizbase.chains import KNOWN_CHAINS
+from vizbase.objects import Operation
+
+WIFS = [
+    "5JabcrvaLnBTCkCVFX5r4rmeGGfuJuVp4NAKRNLTey6pxhRQmf4",
+    "5Hw9YPABaFxa2LooiANLrhUK5TPryy8f7v9Y1rk923PuYqbYdfC",
+]
+
+
+@pytest.fixture()
+def clock(monkeypatch):
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr('viz.signers.time.monotonic', lambda: clock.now)
+    return clock
+
+
+def authority(key=None, account=None):
+    return {
+        'weight_threshold': 1,
+        'key_auths': [[str(PrivateKey(key).pubkey), 1]] if key else [],
+        'account_auths': [[account, 1]] if account else [],
+    }
+
+
+def test_cache(clock):
+    cache = SignerCache(ttl=60)
+    assert cache.get('alice', 'active') is None
+    cache.set('alice', 'active', WIFS[:1])
+    cache.set('bob', 'active', WIFS[1:], accounts=['carol'])
+    assert cache.get('alice', 'active') == WIFS[:1]
+    assert cache.get('alice', 'regular') is None
+
+    clock.now += 60
+    assert cache.get('alice', 'active') is None
+
+    cache.set('alice', 'active', WIFS[:1])
+    cache.invalidate('carol')
+    assert cache.get('bob', 'active') is None
+    assert cache.get('alice', 'active') == WIFS[:1]
+    cache.invalidate()
+    assert cache.get('alice', 'active') is None
+
+
+@pytest.mark.parametrize(
+    'op',
+    [
+        {'type': 'account_update', 'account': 'alice', 'block_num': 1},
+        ['account_update', {'account': 'alice'}],
+        [5, {'account': 'alice'}],
+        ['recover_account', {'account_to_recover': 'alice'}],
+        operations.Account_update(account='alice', memo_key=str(PrivateKey(WIFS[0]).pubkey), json_metadata=''),
+        Operation(
+            operations.Account_update(account='alice', memo_key=str(PrivateKey(WIFS[0]).pubkey), json_metadata='')
+        ),
+    ],
+)
+def test_observe(op):
+    cache = SignerCache()
+    cache.set('alice', 'active', WIFS[:1])
+    cache.observe(['transfer', {'from': 'alice', 'to': 'bob'}])
+    assert cache.get('alice', 'active') == WIFS[:1]
+    cache.observe(op)
+    assert cache.get('alice', 'active') is None
+
+
+def test_transactionbuilder():
+    accounts = {
+        'alice': {'name': 'alice', 'active_authority': authority(key=WIFS[0])},
+        'bob': {'name': 'bob', 'active_authority': authority(account='carol')},
+        'carol': {'name': 'carol', 'active_authority': authority(key=WIFS[1])},
+    }
+    keys = {str(PrivateKey(wif).pubkey): wif for wif in WIFS}
+    calls = []
+
+    def account_class(name, blockchain_instance):
+        calls.append(name)
+        return accounts[name]
+
+    wallet = SimpleNamespace(locked=lambda: False, getPrivateKeyForPublicKey=lambda key: keys[key])
+    client = SimpleNamespace(
+        rpc=SimpleNamespace(chain_params=KNOWN_CHAINS['VIZ']), wallet=wallet, expiration=30, signer_cache=SignerCache()
+    )
+
+    def sign(account):
+        builder = TransactionBuilder(blockchain_instance=client)
+        builder.account_class = account_class
+        builder.appendSigner(account, 'active')
+        return builder.wifs
+
+    assert sign('alice') == {WIFS[0]}
+    assert sign('alice') == {WIFS[0]}
+    assert sign('bob') == {WIFS[1]}
+    assert sign('bob') == {WIFS[1]}
+    assert calls == ['alice', 'bob', 'carol']
+
+    client.signer_cache.observe(['account_update', {'account': 'carol'}])
+    assert sign('bob') == {WIFS[1]}
+    assert sign('alice') == {WIFS[0]}
+    assert calls == ['alice', 'bob', 'carol', 'bob', 'carol']
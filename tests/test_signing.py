@@ -0,0 +1,56 @@
+from types import SimpleNamespace
+
+import pytest
+
+from viz.signing import SigningService
+from viz.transactionbuilder import TransactionBuilder
+from vizbase import operations
+from vizbase.account import PrivateKey
+from vizbase.chains import KNOWN_CHAINS
+from vizbase.signedtransactions import Signed_Transaction
+
+WIFS = [
+    "5JabcrvaLnBTCkCVFX5r4rmeGGfuJuVp4NAKRNLTey6pxhRQmf4",
+    "5Hw9YPABaFxa2LooiANLrhUK5TPryy8f7v9Y1rk923PuYqbYdfC",
+]
+CHAIN = KNOWN_CHAINS['VIZ']
+
+
+def make_tx(memo='hello'):
+    op = operations.Transfer(**{'from': 'alice', 'to': 'bob', 'amount': '1.000 VIZ', 'memo': memo})
+    return Signed_Transaction(
+        ref_block_num=1, ref_block_prefix=2, expiration='2020-01-01T00:00:00', operations=[operations.Operation(op)]
+    )
+
+
+@pytest.fixture()
+def service(monkeypatch):
+    # pure python backend is always available, worker processes inherit it
+    monkeypatch.setattr('graphenebase.ecdsa.SECP256K1_MODULE', 'ecdsa')
+    with SigningService(wifs=WIFS[:1], max_workers=2) as service:
+        yield service
+
+
+def test_sign(service):
+    txs = service.sign_many([(make_tx(str(i)), WIFS) for i in range(4)], chain=CHAIN)
+    pubkeys = [PrivateKey(wif).pubkey for wif in WIFS]
+    for tx in txs:
+        assert len(tx.json()['signatures']) == 2
+        tx.verify(pubkeys, chain=CHAIN)
+
+
+def test_transactionbuilder(service):
+    rpc = SimpleNamespace(
+        chain_params=CHAIN,
+        get_dynamic_global_properties=lambda: {
+            'head_block_number': 5,
+            'head_block_id': '0000000500000000aaaaaaaa0000000000000000',
+        },
+    )
+    client = SimpleNamespace(rpc=rpc, expiration=30, proposer=None, signing_service=service)
+    builder = TransactionBuilder(blockchain_instance=client)
+    builder.appendOps(operations.Transfer(**{'from': 'alice', 'to': 'bob', 'amount': '1.000 VIZ', 'memo': ''}))
+    builder.appendWif(WIFS[0])
+    tx = builder.sign()
+    assert len(builder['signatures']) == 1
+    tx.verify([PrivateKey(WIFS[0]).pubkey], chain=CHAIN)
@@ -0,0 +1,75 @@
+from types import SimpleNamespace
+
+import pytest
+from graphenecommon.exceptions import WalletLocked
+
+from viz.templates import TxTemplate
+from viz.transactionbuilder import TransactionBuilder
+from vizbase.account import PrivateKey
+from vizbase.chains import KNOWN_CHAINS
+from vizbase.objects import Operation
+from vizbase.operations import Transfer
+from vizbase.signedtransactions import Signed_Transaction
+
+WIF = "5JabcrvaLnBTCkCVFX5r4rmeGGfuJuVp4NAKRNLTey6pxhRQmf4"
+
+
+@pytest.fixture()
+def client(monkeypatch):
+    # pure python backend is always available
+    monkeypatch.setattr('graphenebase.ecdsa.SECP256K1_MODULE', 'ecdsa')
+
+    def append_signer(self, accounts, permission):
+        self.appendWif(WIF)
+        client.resolved += 1
+
+    monkeypatch.setattr(TransactionBuilder, 'appendSigner', append_signer)
+
+    broadcasted = []
+    rpc = SimpleNamespace(
+        chain_params=KNOWN_CHAINS['VIZ'],
+        get_dynamic_global_properties=lambda: {
+            'head_block_number': 5,
+            'head_block_id': '0000000500000000aaaaaaaa0000000000000000',
+        },
+        broadcast_transaction=lambda tx, api: broadcasted.append(tx),
+    )
+    client = SimpleNamespace(
+        rpc=rpc,
+        expiration=30,
+        proposer=None,
+        nobroadcast=False,
+        blocking=False,
+        wallet=SimpleNamespace(locked=lambda: client.locked),
+        locked=False,
+        resolved=0,
+        broadcasted=broadcasted,
+    )
+    return client
+
+
+def test_new_tx(client):
+    template = TxTemplate(
+        ['transfer', {'from': 'alice', 'memo': 'payout'}], ['to', 'amount'], 'alice', blockchain_instance=client
+    )
+    builder = template.new_tx(to='bob', amount='1.000 VIZ')
+    data = builder.json()
+    assert data['ref_block_num'] == 5
+    assert data['operations'] == [['transfer', {'from': 'alice', 'to': 'bob', 'amount': '1.000 VIZ', 'memo': 'payout'}]]
+
+    tx = Signed_Transaction(**data)
+    assert bytes(tx.data['operations'].data[0]) == bytes(
+        Operation(Transfer(**{'from': 'alice', 'to': 'bob', 'amount': '1.000 VIZ', 'memo': 'payout'}))
+    )
+    assert tx.verify([PrivateKey(WIF).pubkey], KNOWN_CHAINS['VIZ'])
+    assert builder.id == tx.id
+
+    template.broadcast(to='carol', amount='2.000 VIZ')
+    assert client.broadcasted[0]['operations'][0][1]['to'] == 'carol'
+    assert Signed_Transaction(**client.broadcasted[0]).verify([PrivateKey(WIF).pubkey], KNOWN_CHAINS['VIZ'])
+    # keys are resolved once
+    assert client.resolved == 1
+
+    client.locked = True
+    with pytest.raises(WalletLocked):
+        template.new_tx(to='bob', amount='1.000 VIZ')
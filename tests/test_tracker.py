@@ -0,0 +1,109 @@
+from types import SimpleNamespace
+
+import pytest
+
+from viz.exceptions import TransactionExpired
+from viz.tracker import Confirmation, TxTracker
+from viz.transactionbuilder import TransactionBuilder
+from vizbase import operations
+from vizbase.chains import KNOWN_CHAINS
+
+WIF = "5JabcrvaLnBTCkCVFX5r4rmeGGfuJuVp4NAKRNLTey6pxhRQmf4"
+
+
+@pytest.fixture()
+def chain():
+    chain = SimpleNamespace(blocks={}, head=0, irreversible=8, broadcasted=[])
+
+    def add_block(tx_ids, timestamp='2020-01-01T00:00:00'):
+        chain.head += 1
+        chain.blocks[chain.head] = {'timestamp': timestamp, 'transaction_ids': tx_ids}
+
+    chain.add_block = add_block
+    for _ in range(10):
+        add_block([])
+    chain.rpc = SimpleNamespace(
+        config={'CHAIN_BLOCK_INTERVAL': 3},
+        chain_params=KNOWN_CHAINS['VIZ'],
+        get_dynamic_global_properties=lambda: {
+            'head_block_number': chain.head,
+            'head_block_id': '0000000a00000000aaaaaaaa0000000000000000',
+            'last_irreversible_block_num': chain.irreversible,
+        },
+        get_block=lambda num: chain.blocks.get(num),
+        broadcast_transaction=lambda tx, api: chain.broadcasted.append(tx),
+    )
+    return chain
+
+
+@pytest.fixture()
+def tracker(chain):
+    tracker = TxTracker(blockchain_instance=SimpleNamespace(rpc=chain.rpc), own_connection=False)
+    tracker.poll()
+    return tracker
+
+
+def test_track(chain, tracker):
+    first = tracker.track('a' * 40, '2020-01-01T00:01:00')
+    second = tracker.track('b' * 40, '2020-01-01T00:01:00')
+    chain.add_block([])
+    chain.add_block(['c' * 40, 'a' * 40])
+    tracker.poll()
+    assert first.included.result(timeout=0) == Confirmation('a' * 40, 12)
+    assert not first.irreversible.done()
+    assert not second.included.done()
+    assert len(tracker) == 2
+
+    chain.irreversible = 12
+    chain.add_block(['b' * 40])
+    tracker.poll()
+    assert first.irreversible.result(timeout=0) == Confirmation('a' * 40, 12)
+    assert second.included.result(timeout=0).block_num == 13
+    assert len(tracker) == 1
+
+
+def test_expired(chain, tracker):
+    tracked = tracker.track('a' * 40, '2020-01-01T00:01:00')
+    chain.add_block([], timestamp='2020-01-01T00:01:00')
+    tracker.poll()
+    assert not tracked.included.done()
+    chain.add_block([], timestamp='2020-01-01T00:01:03')
+    tracker.poll()
+    with pytest.raises(TransactionExpired):
+        tracked.included.result(timeout=0)
+    with pytest.raises(TransactionExpired):
+        tracked.irreversible.result(timeout=0)
+    assert len(tracker) == 0
+
+
+def test_fork(chain, tracker):
+    tracked = tracker.track('a' * 40, '2020-01-01T00:01:00')
+    chain.add_block(['a' * 40])
+    tracker.poll()
+    assert tracked.included.result(timeout=0).block_num == 11
+    # block 11 was replaced, the transaction landed in block 12
+    chain.blocks[11] = {'timestamp': '2020-01-01T00:00:00', 'transaction_ids': []}
+    chain.add_block(['a' * 40])
+    chain.irreversible = 11
+    tracker.poll()
+    assert not tracked.irreversible.done()
+    assert tracked.block_num == 12
+    chain.irreversible = 12
+    tracker.poll()
+    assert tracked.irreversible.result(timeout=0) == Confirmation('a' * 40, 12)
+
+
+def test_broadcast(monkeypatch, chain, tracker):
+    # pure python backend is always available
+    monkeypatch.setattr('graphenebase.ecdsa.SECP256K1_MODULE', 'ecdsa')
+    client = SimpleNamespace(rpc=chain.rpc, expiration=30, proposer=None)
+    builder = TransactionBuilder(blockchain_instance=client)
+    builder.appendOps(operations.Transfer(**{'from': 'alice', 'to': 'bob', 'amount': '1.000 VIZ', 'memo': ''}))
+    builder.appendWif(WIF)
+    tracked = tracker.broadcast(builder)
+    assert len(chain.broadcasted) == 1
+    assert len(tracked.tx_id) == 40
+
+    chain.add_block([tracked.tx_id])
+    tracker.poll()
+    assert tracked.included.result(timeout=0).block_num == 11
@@ -0,0 +1,89 @@
+from types import SimpleNamespace
+
+import time
+
+import pytest
+from graphenecommon.exceptions import KeyNotFound, WalletLocked
+from graphenestorage import InRamConfigurationStore, InRamEncryptedKeyStore
+
+from viz.wallet import Wallet
+from vizbase.account import PrivateKey
+
+WIFS = [
+    '5JabcrvaLnBTCkCVFX5r4rmeGGfuJuVp4NAKRNLTey6pxhRQmf4',
+    '5Hw9YPABaFxa2LooiANLrhUK5TPryy8f7v9Y1rk923PuYqbYdfC',
+]
+
+
+@pytest.fixture()
+def wallet(monkeypatch):
+    monkeypatch.setattr('graphenebase.ecdsa.SECP256K1_MODULE', 'ecdsa')
+    references = {str(PrivateKey(WIFS[0]).pubkey): ['alice', 'bob'], str(PrivateKey(WIFS[1]).pubkey): ['bob']}
+    rpc = SimpleNamespace(get_key_references=lambda pubkeys: [references[pub] for pub in pubkeys])
+    client = SimpleNamespace(is_connected=lambda: True, prefix='VIZ', rpc=rpc)
+    wallet = Wallet(keys=[], blockchain_instance=client)
+    wallet.store = InRamEncryptedKeyStore(config=InRamConfigurationStore())
+    wallet.unlock('password')
+    wallet.addPrivateKey(WIFS[0])
+    wallet.lock()
+    return wallet
+
+
+def test_key_index(wallet, monkeypatch):
+    pubkeys = [str(PrivateKey(wif).pubkey) for wif in WIFS]
+    with pytest.raises(WalletLocked):
+        wallet.find_private_key(pubkeys[0])
+
+    decrypted = []
+    decrypt = wallet.store.getPrivateKeyForPublicKey
+    monkeypatch.setattr(wallet.store, 'getPrivateKeyForPublicKey', lambda pub: decrypted.append(pub) or decrypt(pub))
+    wallet.unlock('password')
+    assert decrypted == pubkeys[:1]
+    for _ in range(3):
+        assert wallet.getPrivateKeyForPublicKey(pubkeys[0]) == WIFS[0]
+        assert wallet.find_private_key(pubkeys[1]) is None
+    assert len(decrypted) == 1
+    with pytest.raises(KeyNotFound):
+        wallet.getPrivateKeyForPublicKey(pubkeys[1])
+
+    wallet.addPrivateKey(WIFS[1])
+    assert wallet.find_private_key(pubkeys[1]) == WIFS[1]
+    wallet.removePrivateKeyFromPublicKey(pubkeys[0])
+    assert wallet.find_private_key(pubkeys[0]) is None
+
+    wallet.lock()
+    with pytest.raises(WalletLocked):
+        wallet.find_private_key(pubkeys[1])
+
+
+def test_keyring(wallet):
+    with pytest.raises(WalletLocked):
+        wallet.find_account_keys('alice')
+    wallet.unlock('password')
+    keyring = wallet.keyring
+    assert wallet.find_account_keys('alice') == WIFS[:1]
+    wallet.addPrivateKey(WIFS[1])
+    # accounts are reloaded after a key is added
+    assert sorted(wallet.find_account_keys('bob')) == sorted(WIFS)
+    assert wallet.find_account_keys('carol') == []
+
+    wallet.lock()
+    assert len(keyring) == 0
+    assert not keyring.has_accounts
+    assert wallet.keyring is None
+
+
+def test_auto_lock(wallet):
+    wallet.auto_lock = 0.1
+    wallet.unlock('password')
+    pub = str(PrivateKey(WIFS[0]).pubkey)
+    keyring = wallet.keyring
+    # lookups keep the wallet unlocked
+    for _ in range(3):
+        time.sleep(0.05)
+        assert wallet.find_private_key(pub) == WIFS[0]
+    time.sleep(0.3)
+    assert wallet.locked()
+    assert len(keyring) == 0
+    with pytest.raises(WalletLocked):
+        wallet.find_private_key(pub)
@@ -4,10 +4,26 @@ from .viz import Client  # noqa: F401
 __all__ = [
     "viz",
     "account",
+    "accountarray",
     "amount",
+    "amountarray",
     "block",
     "blockchain",
+    "connections",
+    "crawler",
+    "delegations",
+    "energy",
+    "keygen",
+    "keyring",
+    "packer",
+    "refblock",
+    "registration",
+    "retry",
+    "signers",
+    "signing",
     "storage",
+    "templates",
+    "tracker",
     "utils",
     "wallet",
 ]
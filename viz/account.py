@@ -1,9 +1,13 @@
-from typing import TYPE_CHECKING, Generator, List, Optional, Union
+import json
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, Generator, List, NamedTuple, Optional, Tuple, Union
 from warnings import warn
 from graphenecommon.exceptions import AccountDoesNotExistsException
 from toolz import dissoc
 
-from .amount import Amount
+from vizbase.chains import PRECISIONS
+
+from .amount import Amount, amount_to_units, units_to_amount
 from .blockchain import Blockchain
 from .instance import shared_blockchain_instance
 from .utils import json_expand, parse_time, time_elapsed
@@ -13,6 +17,8 @@ if TYPE_CHECKING:
 
 HistoryGenerator = Generator[Union[dict, list], None, int]
 
+_UNPARSED = object()
+
 
 class Account(dict):
     """
@@ -76,6 +82,10 @@ class Account(dict):
 
         return energy
 
+    def snapshot(self) -> 'AccountSnapshot':
+        """Returns compact :py:class:`AccountSnapshot` of the loaded account data (no RPC call)."""
+        return AccountSnapshot.from_dict(self)
+
     def virtual_op_count(self) -> int:
         """Returns number of virtual ops performed by this account."""
         try:
@@ -306,3 +316,184 @@ class Account(dict):
                 break
 
         return op_count
+
+
+class Authority(NamedTuple):
+    """Compact immutable representation of account authority."""
+
+    weight_threshold: int
+    account_auths: Tuple[Tuple[str, int], ...]
+    key_auths: Tuple[Tuple[str, int], ...]
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Authority':
+        return cls(
+            int(data["weight_threshold"]),
+            tuple((name, int(weight)) for name, weight in data["account_auths"]),
+            tuple((key, int(weight)) for key, weight in data["key_auths"]),
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "weight_threshold": self.weight_threshold,
+            "account_auths": [list(auth) for auth in self.account_auths],
+            "key_auths": [list(auth) for auth in self.key_auths],
+        }
+
+
+class AccountSnapshot:
+    """
+    Compact read-only snapshot of account data.
+
+    Unlike :py:class:`Account`, this class is not a dict and does not talk to the node. Only frequently used fields are
+    kept, balances are stored as integer units of the asset (e.g. ``1000`` for ``1.000 VIZ``), and ``json_metadata`` is
+    parsed on first access. This makes it suitable for caches holding a lot of accounts.
+
+    .. warning::
+
+        Fields not listed below are dropped, so :py:meth:`to_dict` does not return the complete account.
+
+    .. code-block:: python
+
+        accounts = viz.rpc.get_accounts(['alice', 'bob'])
+        snapshots = [AccountSnapshot.from_dict(account) for account in accounts]
+        print(snapshots[0].balances)
+
+    :param str name: account name
+    :param int balance: liquid balance in units
+    :param int vesting_shares: own SHARES in units
+    :param int delegated_vesting_shares: SHARES delegated to other accounts, in units
+    :param int received_vesting_shares: SHARES received from other accounts, in units
+    :param int energy: energy at the moment of last vote, ``CHAIN_100_PERCENT`` based
+    :param datetime.datetime last_vote_time: time of the last vote (UTC)
+    :param Authority master_authority: master authority
+    :param Authority active_authority: active authority
+    :param Authority regular_authority: regular authority
+    :param str memo_key: memo public key
+    :param str,dict json_metadata: account metadata, raw json string or already parsed dict
+    """
+
+    __slots__ = (
+        "name",
+        "balance",
+        "vesting_shares",
+        "delegated_vesting_shares",
+        "received_vesting_shares",
+        "energy",
+        "last_vote_time",
+        "master_authority",
+        "active_authority",
+        "regular_authority",
+        "memo_key",
+        "_raw_json_metadata",
+        "_json_metadata",
+    )
+
+    core_symbol = "VIZ"
+    shares_symbol = "SHARES"
+
+    def __init__(
+        self,
+        name: str,
+        balance: int,
+        vesting_shares: int,
+        delegated_vesting_shares: int,
+        received_vesting_shares: int,
+        energy: int,
+        last_vote_time: datetime,
+        master_authority: Authority,
+        active_authority: Authority,
+        regular_authority: Authority,
+        memo_key: str,
+        json_metadata: Union[str, Dict[str, Any]] = "",
+    ) -> None:
+        self.name = name
+        self.balance = balance
+        self.vesting_shares = vesting_shares
+        self.delegated_vesting_shares = delegated_vesting_shares
+        self.received_vesting_shares = received_vesting_shares
+        self.energy = energy
+        self.last_vote_time = last_vote_time
+        self.master_authority = master_authority
+        self.active_authority = active_authority
+        self.regular_authority = regular_authority
+        self.memo_key = memo_key
+        if isinstance(json_metadata, str):
+            self._raw_json_metadata = json_metadata
+            self._json_metadata = _UNPARSED
+        else:
+            self._raw_json_metadata = None
+            self._json_metadata = json_metadata
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'AccountSnapshot':
+        """
+        Create snapshot from account dict as returned by ``get_accounts`` RPC or from :py:class:`Account`.
+
+        :param dict data: account data
+        """
+        return cls(
+            name=data["name"],
+            balance=amount_to_units(data["balance"]),
+            vesting_shares=amount_to_units(data["vesting_shares"]),
+            delegated_vesting_shares=amount_to_units(data["delegated_vesting_shares"]),
+            received_vesting_shares=amount_to_units(data["received_vesting_shares"]),
+            energy=int(data["energy"]),
+            last_vote_time=parse_time(data["last_vote_time"]),
+            master_authority=Authority.from_dict(data["master_authority"]),
+            active_authority=Authority.from_dict(data["active_authority"]),
+            regular_authority=Authority.from_dict(data["regular_authority"]),
+            memo_key=data["memo_key"],
+            json_metadata=data.get("json_metadata") or "",
+        )
+
+    @property
+    def json_metadata(self) -> Dict[str, Any]:
+        """Account metadata, parsed from json on first access."""
+        if self._json_metadata is _UNPARSED:
+            try:
+                self._json_metadata = json.loads(self._raw_json_metadata) if self._raw_json_metadata else {}
+            except json.JSONDecodeError:
+                self._json_metadata = {}
+            self._raw_json_metadata = None
+        return self._json_metadata
+
+    @property
+    def effective_vesting_shares(self) -> int:
+        """Own SHARES minus delegated plus received, in units."""
+        return self.vesting_shares - self.delegated_vesting_shares + self.received_vesting_shares
+
+    @property
+    def balances(self) -> dict:
+        """Balances in the same format as :py:meth:`Account.get_balances`"""
+        return {
+            self.core_symbol: self.balance / 10 ** PRECISIONS[self.core_symbol],
+            self.shares_symbol: self.vesting_shares / 10 ** PRECISIONS[self.shares_symbol],
+        }
+
+    def to_dict(self) -> dict:
+        """
+        Returns account data in the same format as :py:class:`Account`.
+
+        .. warning::
+
+            Only the fields kept in the snapshot are returned, all other fields of the original account dict (e.g.
+            ``created``, ``recovery_account``, ``witnesses_voted_for``) are dropped by :py:meth:`from_dict`.
+        """
+        return {
+            "name": self.name,
+            "balance": units_to_amount(self.balance, self.core_symbol),
+            "vesting_shares": units_to_amount(self.vesting_shares, self.shares_symbol),
+            "delegated_vesting_shares": units_to_amount(self.delegated_vesting_shares, self.shares_symbol),
+            "received_vesting_shares": units_to_amount(self.received_vesting_shares, self.shares_symbol),
+            "energy": self.energy,
+            "last_vote_time": self.last_vote_time.strftime('%Y-%m-%dT%H:%M:%S'),
+            "master_authority": self.master_authority.to_dict(),
+            "active_authority": self.active_authority.to_dict(),
+            "regular_authority": self.regular_authority.to_dict(),
+            "memo_key": self.memo_key,
+            "json_metadata": self.json_metadata,
+        }
+
+    def __repr__(self) -> str:
+        return "<AccountSnapshot {}>".format(self.name)
@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+import calendar
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Union
+
+from vizbase.chains import PRECISIONS
+
+from .account import AccountSnapshot
+from .instance import shared_blockchain_instance
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+if TYPE_CHECKING:
+    from .viz import Client  # noqa: F401
+
+
+def _timestamp(dt: datetime) -> int:
+    """Convert naive UTC datetime into unix timestamp."""
+    return calendar.timegm(dt.utctimetuple())
+
+
+class AccountArray:
+    """
+    Vectorized computations over many accounts.
+
+    Account data is taken from :py:class:`~viz.account.AccountSnapshot` objects (or raw account dicts), so no account
+    is refreshed from the node. Chain config is read once on initialization.
+
+    .. code-block:: python
+
+        accounts = viz.rpc.get_accounts(['alice', 'bob'])
+        array = AccountArray(accounts)
+        for name, energy in zip(array.names, array.current_energy()):
+            print(name, energy)
+
+    .. note::
+
+        This class requires `numpy` to be installed.
+
+    :param list snapshots: account snapshots or account dicts as returned by ``get_accounts`` RPC
+    :param viz.viz.Client blockchain_instance: Client instance
+    """
+
+    def __init__(
+        self, snapshots: Iterable[Union[AccountSnapshot, dict]], blockchain_instance: Optional['Client'] = None
+    ) -> None:
+        if np is None:
+            raise ImportError("AccountArray requires numpy, please install it")
+
+        self.blockchain_instance = blockchain_instance or shared_blockchain_instance()
+        cfg = self.blockchain_instance.rpc.config
+        self.energy_100_percent = cfg['CHAIN_100_PERCENT']
+        self.energy_1_percent = cfg['CHAIN_1_PERCENT']
+        self.energy_regeneration_seconds = cfg['CHAIN_ENERGY_REGENERATION_SECONDS']
+
+        snapshots = [s if isinstance(s, AccountSnapshot) else AccountSnapshot.from_dict(s) for s in snapshots]
+
+        self.names: List[str] = [s.name for s in snapshots]
+        self._index = {name: i for i, name in enumerate(self.names)}
+        self.energy = np.fromiter((s.energy for s in snapshots), dtype=np.int64, count=len(snapshots))
+        self.last_vote_time = np.fromiter(
+            (_timestamp(s.last_vote_time) for s in snapshots), dtype=np.int64, count=len(snapshots)
+        )
+        self.balance = np.fromiter((s.balance for s in snapshots), dtype=np.int64, count=len(snapshots))
+        self.vesting_shares = np.fromiter((s.vesting_shares for s in snapshots), dtype=np.int64, count=len(snapshots))
+        self.delegated_vesting_shares = np.fromiter(
+            (s.delegated_vesting_shares for s in snapshots), dtype=np.int64, count=len(snapshots)
+        )
+        self.received_vesting_shares = np.fromiter(
+            (s.received_vesting_shares for s in snapshots), dtype=np.int64, count=len(snapshots)
+        )
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def index(self, name: str) -> int:
+        """
+        Get position of the account in the arrays.
+
+        :param str name: account name
+        :raises KeyError: if account is not in the array
+        """
+        return self._index[name]
+
+    def current_energy(self, now: Optional[datetime] = None) -> 'np.ndarray':
+        """
+        Calculate current energy of all accounts, counting regenerated energy.
+
+        This is a vectorized version of :py:meth:`viz.account.Account.current_energy`.
+
+        :param datetime.datetime now: (optional) naive UTC time to calculate energy at, defaults to current time
+        :return: array of energy as 0-100%
+        """
+        if now is None:
+            now = datetime.utcnow()
+        elapsed = np.maximum(_timestamp(now) - self.last_vote_time, 0)
+        regenerated_energy = self.energy_100_percent * elapsed / self.energy_regeneration_seconds
+        current_energy = np.minimum(self.energy + regenerated_energy, self.energy_100_percent)
+
+        return current_energy / self.energy_1_percent
+
+    def effective_vesting_shares(self) -> 'np.ndarray':
+        """Own SHARES minus delegated plus received, in units."""
+        return self.vesting_shares - self.delegated_vesting_shares + self.received_vesting_shares
+
+    def get_balances(self) -> Dict[str, 'np.ndarray']:
+        """
+        Obtain account balances.
+
+        :return: dict with balances arrays like ``{'VIZ': array([49400000.0]), 'SHARES': array([0.0])}``
+        """
+        return {
+            AccountSnapshot.core_symbol: self.balance / 10 ** PRECISIONS[AccountSnapshot.core_symbol],
+            AccountSnapshot.shares_symbol: self.vesting_shares / 10 ** PRECISIONS[AccountSnapshot.shares_symbol],
+        }
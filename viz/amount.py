@@ -1,195 +1,269 @@
+import sys
+from collections.abc import Mapping
+from decimal import ROUND_FLOOR, ROUND_HALF_EVEN, Decimal, InvalidOperation
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from vizbase.amount import DEFAULT_PRECISION, format_units, parse_amount
 from vizbase.chains import PRECISIONS
 
+_KEYS = ("amount", "asset")
+
 
-class Amount(dict):
+class Amount:
     """
     This class helps deal and calculate with the different assets on the chain.
 
+    The amount is stored as integer units of the asset (``1.000 VIZ`` is ``1000`` units), so sums of amounts are
+    exact. Operations with plain numbers are rounded to the asset precision.
+
+    The class used to be a ``dict`` subclass. It's registered as :py:class:`collections.abc.Mapping` and supports
+    item access (``amount["amount"]``, ``amount["asset"]``), ``keys()`` and ``dict(amount)``, but
+    ``isinstance(amount, dict)`` is False and ``json.dumps()`` needs the dict from :py:meth:`json`.
+
     :param str amount_string: Amount string as used by the backend (e.g. "10 VIZ")
     """
 
+    __slots__ = ("units", "asset", "precision", "_str")
+
     def __init__(self, amount_string="0 VIZ"):
         if isinstance(amount_string, Amount):
-            self["amount"] = amount_string["amount"]
-            self["asset"] = amount_string["asset"]
+            self._set(amount_string.units, amount_string.asset)
         elif isinstance(amount_string, str):
-            self["amount"], self["asset"] = amount_string.split(" ")
+            self.units, self.asset, self.precision, canonical = parse_amount(amount_string)
+            # chain format string is kept for __str__
+            self._str = amount_string if canonical else None
         else:
             raise ValueError("Need an instance of 'Amount' or a string with amount and asset")
 
-        self["amount"] = float(self["amount"])
+    def _set(self, units: int, asset: str) -> None:
+        self.units = units
+        # few distinct assets, share their strings
+        self.asset = sys.intern(asset)
+        self.precision = PRECISIONS.get(asset, DEFAULT_PRECISION)
+        self._str: Optional[str] = None
+
+    def _new(self, units: int) -> 'Amount':
+        am = object.__new__(Amount)
+        am.units = units
+        am.asset = self.asset
+        am.precision = self.precision
+        am._str = None
+        return am
+
+    def _update(self, units: int) -> 'Amount':
+        self.units = units
+        self._str = None
+        return self
+
+    @property
+    def _scale(self) -> int:
+        return 10 ** self.precision
+
+    def _units_of(self, other: Any) -> int:
+        # units of the same asset in an Amount or a number of whole assets
+        if isinstance(other, Amount):
+            assert other.asset == self.asset
+            return other.units
+        if isinstance(other, int):
+            return other * self._scale
+        return _round(_decimal(other) * self._scale)
 
     @property
     def amount(self):
-        return self["amount"]
+        return self.units / self._scale
 
     @property
     def symbol(self):
-        return self["asset"]
+        return self.asset
+
+    # dict-compatible view
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "amount":
+            return self.amount
+        if key == "asset":
+            return self.asset
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key == "amount":
+            self._update(_round(_decimal(value) * self._scale))
+        elif key == "asset":
+            self._set(self.units, value)
+        else:
+            raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in _KEYS
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(_KEYS)
+
+    def __len__(self) -> int:
+        return len(_KEYS)
+
+    def keys(self) -> Tuple[str, ...]:
+        return _KEYS
 
-    @property  # noqa: CCE001
-    def asset(self):
-        return self["asset"]
+    def values(self) -> Tuple[float, str]:
+        return self.amount, self.asset
+
+    def items(self) -> Tuple[Tuple[str, Any], ...]:
+        return tuple(zip(_KEYS, self.values()))
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self[key] if key in _KEYS else default
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the amount as ``{"amount": float, "asset": str}`` dict, like the former ``dict`` based class."""
+        return {"amount": self.amount, "asset": self.asset}
+
+    def json(self) -> Dict[str, Any]:
+        """JSON-serializable form, same as :py:meth:`as_dict`."""
+        return self.as_dict()
 
     def __str__(self):
-        prec = PRECISIONS.get(self["asset"], 6)
-        return "{:.{prec}f} {}".format(self["amount"], self["asset"], prec=prec)
+        if self._str is None:
+            self._str = units_to_amount(self.units, self.asset)
+        return self._str
 
     def __float__(self):
-        return self["amount"]
+        return self.amount
 
     def __int__(self):
-        return int(self["amount"])
+        # truncates towards zero, like int() of float
+        return _sign(self.units) * (abs(self.units) // self._scale)
 
     def __add__(self, other):
-        am = Amount(self)
-        if isinstance(other, Amount):
-            assert other["asset"] == self["asset"]
-            am["amount"] += other["amount"]
-        else:
-            am["amount"] += float(other)
-        return am
+        return self._new(self.units + self._units_of(other))
 
     def __sub__(self, other):
-        am = Amount(self)
-        if isinstance(other, Amount):
-            assert other["asset"] == self["asset"]
-            am["amount"] -= other["amount"]
-        else:
-            am["amount"] -= float(other)
-        return am
+        return self._new(self.units - self._units_of(other))
 
     def __mul__(self, other):
-        am = Amount(self)
         if isinstance(other, Amount):
-            am["amount"] *= other["amount"]
-        else:
-            am["amount"] *= other
-        return am
+            return self._new(_round(Decimal(self.units * other.units) / other._scale))
+        return self._new(_multiply(self.units, other))
 
     def __floordiv__(self, other):
-        am = Amount(self)
         if isinstance(other, Amount):
             raise ValueError("Cannot divide two Amounts")
-        else:
-            am["amount"] //= other
-        return am
+        # whole number of assets, as float floor division did
+        return self._new(_round(Decimal(self.units) / (_decimal(other) * self._scale), ROUND_FLOOR) * self._scale)
 
     def __div__(self, other):
-        am = Amount(self)
         if isinstance(other, Amount):
             raise ValueError("Cannot divide two Amounts")
-        else:
-            am["amount"] /= other
-        return am
+        return self._new(_round(Decimal(self.units) / _decimal(other)))
 
     def __mod__(self, other):
-        am = Amount(self)
         if isinstance(other, Amount):
-            am["amount"] %= other["amount"]
-        else:
-            am["amount"] %= other
-        return am
+            return self._new(self.units % other.units)
+        return self._new(_round(Decimal(self.units) % (_decimal(other) * self._scale)))
 
     def __pow__(self, other):
-        am = Amount(self)
-        if isinstance(other, Amount):
-            am["amount"] **= other["amount"]
-        else:
-            am["amount"] **= other
-        return am
+        exponent = other.amount if isinstance(other, Amount) else other
+        return self._new(round(self.amount ** exponent * self._scale))
 
     def __iadd__(self, other):
-        if isinstance(other, Amount):
-            assert other["asset"] == self["asset"]
-            self["amount"] += other["amount"]
-        else:
-            self["amount"] += other
-        return self
+        return self._update(self.units + self._units_of(other))
 
     def __isub__(self, other):
-        if isinstance(other, Amount):
-            assert other["asset"] == self["asset"]
-            self["amount"] -= other["amount"]
-        else:
-            self["amount"] -= other
-        return self
+        return self._update(self.units - self._units_of(other))
 
     def __imul__(self, other):
-        if isinstance(other, Amount):
-            self["amount"] *= other["amount"]
-        else:
-            self["amount"] *= other
-        return self
+        return self._update(self.__mul__(other).units)
 
     def __idiv__(self, other):
         if isinstance(other, Amount):
-            assert other["asset"] == self["asset"]
-            return self["amount"] / other["amount"]
-        else:
-            self["amount"] /= other
-            return self
+            assert other.asset == self.asset
+            return self.units / other.units
+        return self._update(self.__div__(other).units)
 
     def __ifloordiv__(self, other):
         if isinstance(other, Amount):
-            self["amount"] //= other["amount"]
-        else:
-            self["amount"] //= other
-        return self
+            return self._update(self.units // other.units * self._scale)
+        return self._update(self.__floordiv__(other).units)
 
     def __imod__(self, other):
-        if isinstance(other, Amount):
-            self["amount"] %= other["amount"]
-        else:
-            self["amount"] %= other
-        return self
+        return self._update(self.__mod__(other).units)
 
     def __ipow__(self, other):
-        self["amount"] **= other
-        return self
+        return self._update(self.__pow__(other).units)
 
-    def __lt__(self, other):
+    def _compared(self, other: Any) -> Tuple[Any, Any]:
         if isinstance(other, Amount):
-            assert other["asset"] == self["asset"]
-            return self["amount"] < other["amount"]
-        else:
-            return self["amount"] < float(other or 0)
+            assert other.asset == self.asset
+            return self.units, other.units
+        return self.units, _decimal(float(other or 0)) * self._scale
+
+    def __lt__(self, other):
+        mine, theirs = self._compared(other)
+        return mine < theirs
 
     def __le__(self, other):
-        if isinstance(other, Amount):
-            assert other["asset"] == self["asset"]
-            return self["amount"] <= other["amount"]
-        else:
-            return self["amount"] <= float(other or 0)
+        mine, theirs = self._compared(other)
+        return mine <= theirs
 
     def __eq__(self, other):
-        if isinstance(other, Amount):
-            assert other["asset"] == self["asset"]
-            return self["amount"] == other["amount"]
-        else:
-            return self["amount"] == float(other or 0)
+        mine, theirs = self._compared(other)
+        return mine == theirs
 
     def __ne__(self, other):
-        if isinstance(other, Amount):
-            assert other["asset"] == self["asset"]
-            return self["amount"] != other["amount"]
-        else:
-            return self["amount"] != float(other or 0)
+        mine, theirs = self._compared(other)
+        return mine != theirs
 
     def __ge__(self, other):
-        if isinstance(other, Amount):
-            assert other["asset"] == self["asset"]
-            return self["amount"] >= other["amount"]
-        else:
-            return self["amount"] >= float(other or 0)
+        mine, theirs = self._compared(other)
+        return mine >= theirs
 
     def __gt__(self, other):  # noqa: CCE001
-        if isinstance(other, Amount):
-            assert other["asset"] == self["asset"]
-            return self["amount"] > other["amount"]
-        else:
-            return self["amount"] > float(other or 0)
+        mine, theirs = self._compared(other)
+        return mine > theirs
 
     __repr__ = __str__
     __truediv__ = __div__
+    __itruediv__ = __idiv__
     __truemul__ = __mul__
+
+
+Mapping.register(Amount)
+
+
+def _decimal(value: Any) -> Decimal:
+    # str() keeps the shortest decimal form of floats, e.g. 0.1 instead of 0.1000000000000000055...
+    try:
+        return Decimal(str(value))
+    except InvalidOperation:
+        raise ValueError("Invalid amount: {!r}".format(value))
+
+
+def _round(value: Decimal, rounding: str = ROUND_HALF_EVEN) -> int:
+    return int(value.to_integral_value(rounding))
+
+
+def _multiply(units: int, factor: Any) -> int:
+    if isinstance(factor, int):
+        return units * factor
+    return _round(units * _decimal(factor))
+
+
+def _sign(value: int) -> int:
+    return -1 if value < 0 else 1
+
+
+def amount_to_units(amount_string: str) -> int:
+    """
+    Convert amount string like ``1.000 VIZ`` into integer units of the asset (``1000``).
+
+    The decimal string is parsed directly, without float rounding.
+    """
+    units, asset, precision, canonical = parse_amount(amount_string)
+    if not canonical and len(amount_string.split(" ")[0].partition(".")[2]) > precision:
+        raise ValueError("Too many decimal places for {}: {}".format(asset, amount_string))
+    return units
+
+
+def units_to_amount(units: int, asset: str) -> str:
+    """Format integer units of the asset as amount string like ``1.000 VIZ``."""
+    return format_units(units, asset, PRECISIONS.get(asset, DEFAULT_PRECISION))
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+from vizbase.chains import PRECISIONS
+
+from .amount import Amount, units_to_amount
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+#: assets known to AmountArray, position in the tuple is the asset code
+ASSETS = tuple(PRECISIONS)
+
+
+class AmountArray:
+    """
+    Many amounts stored as int64 units with asset codes, for vectorized ledger aggregation.
+
+    Amounts are parsed in bulk from chain strings and summed with integer arithmetic, so totals are exact. Every amount
+    may be labeled with an account, e.g. transfer receiver, to aggregate per account.
+
+    .. code-block:: python
+
+        transfers = list(Blockchain(blockchain_instance=viz).stream(['transfer'], start=start, stop=stop))
+        array = AmountArray.from_ops(transfers, account_field='to')
+        array.sum()  # {'VIZ': <Amount>}
+        totals = array.groupby_account()
+        for account, amount in zip(totals.accounts, totals.to_strings()):
+            print(account, amount)
+
+    .. note::
+
+        This class requires `numpy` to be installed.
+
+    :param units: amounts in units of their assets
+    :param codes: asset codes, positions in :py:data:`ASSETS`
+    :param accounts: (optional) account of every amount
+    """
+
+    def __init__(self, units: Any, codes: Any, accounts: Optional[Any] = None) -> None:
+        if np is None:
+            raise ImportError("AmountArray requires numpy, please install it")
+
+        self.units = np.asarray(units, dtype=np.int64)
+        self.codes = np.asarray(codes, dtype=np.uint8)
+        self.accounts = None if accounts is None else np.asarray(accounts, dtype=object)
+        if len(self.codes) != len(self.units) or (self.accounts is not None and len(self.accounts) != len(self.units)):
+            raise ValueError("Arrays must have the same length")
+
+    @classmethod
+    def from_strings(cls, amounts: Sequence[str], accounts: Optional[Sequence[str]] = None) -> 'AmountArray':
+        """
+        Parse amount strings like ``1.000 VIZ``.
+
+        :param list amounts: amount strings
+        :param list accounts: (optional) account of every amount
+        :raises ValueError: on unknown asset or more decimal places than the asset has
+        """
+        if np is None:
+            raise ImportError("AmountArray requires numpy, please install it")
+
+        strings = np.asarray(amounts, dtype=str)
+        if not len(strings):
+            return cls([], [], accounts)
+        values, _, assets = np.char.partition(strings, " ").T
+        codes = np.full(len(strings), len(ASSETS), dtype=np.uint8)
+        for code, asset in enumerate(ASSETS):
+            codes[assets == asset] = code
+        if (codes == len(ASSETS)).any():
+            unknown = sorted(set(assets[codes == len(ASSETS)]))
+            raise ValueError("Unknown assets: {}".format(", ".join(unknown)))
+
+        # "-1.5" -> -15 with 1 decimal place, then scaled to asset precision
+        integer, _, fraction = np.char.partition(values, ".").T
+        decimals = np.char.str_len(fraction)
+        shift = np.array([PRECISIONS[asset] for asset in ASSETS])[codes] - decimals
+        if (shift < 0).any():
+            raise ValueError("Too many decimal places: {}".format(strings[shift < 0][0]))
+        units = np.char.add(integer, fraction).astype(np.int64) * 10 ** shift
+        return cls(units, codes, accounts)
+
+    @classmethod
+    def from_ops(
+        cls, ops: Iterable[Dict[str, Any]], amount_field: str = "amount", account_field: Optional[str] = None
+    ) -> 'AmountArray':
+        """
+        Collect amounts from operations, e.g. yielded by :py:meth:`viz.blockchain.Blockchain.stream`.
+
+        :param ops: operation dicts
+        :param str amount_field: field holding the amount, e.g. ``reward_amount`` of ``fixed_award``
+        :param str account_field: (optional) field holding the account to label the amount with, e.g. ``to``
+        """
+        ops = list(ops)
+        amounts = [op[amount_field] for op in ops]
+        accounts = None if account_field is None else [op[account_field] for op in ops]
+        return cls.from_strings(amounts, accounts)
+
+    def __len__(self) -> int:
+        return len(self.units)
+
+    def __getitem__(self, key: Any) -> 'AmountArray':
+        """Select amounts with a boolean mask, index array or slice."""
+        accounts = None if self.accounts is None else self.accounts[key]
+        return AmountArray(self.units[key], self.codes[key], accounts)
+
+    def asset_mask(self, asset: str) -> 'np.ndarray':
+        """Return boolean mask of amounts of the asset."""
+        return self.codes == ASSETS.index(asset)
+
+    def account_mask(self, accounts: Union[str, Iterable[str]]) -> 'np.ndarray':
+        """Return boolean mask of amounts labeled with the account(s)."""
+        if self.accounts is None:
+            raise ValueError("Amounts are not labeled with accounts")
+        if isinstance(accounts, str):
+            accounts = [accounts]
+        return np.isin(self.accounts, list(accounts))
+
+    def sum(self) -> Dict[str, Amount]:  # noqa: A003
+        """Return exact total of every asset present."""
+        totals = np.bincount(self.codes, minlength=len(ASSETS))
+        result = {}
+        for code, asset in enumerate(ASSETS):
+            if totals[code]:
+                result[asset] = Amount(units_to_amount(int(self.units[self.codes == code].sum()), asset))
+        return result
+
+    def cumsum(self) -> 'AmountArray':
+        """Return running totals, accumulated separately per asset."""
+        units = np.empty_like(self.units)
+        for code in np.unique(self.codes):
+            mask = self.codes == code
+            units[mask] = np.cumsum(self.units[mask])
+        return AmountArray(units, self.codes, self.accounts)
+
+    def groupby_account(self) -> 'AmountArray':
+        """Return totals per account and asset, sorted by account."""
+        if self.accounts is None:
+            raise ValueError("Amounts are not labeled with accounts")
+        names, account_index = np.unique(self.accounts.astype(str), return_inverse=True)
+        keys, key_index = np.unique(account_index.reshape(-1) * len(ASSETS) + self.codes, return_inverse=True)
+        units = np.zeros(len(keys), dtype=np.int64)
+        np.add.at(units, key_index.reshape(-1), self.units)
+        return AmountArray(units, keys % len(ASSETS), names[keys // len(ASSETS)].astype(object))
+
+    def to_strings(self) -> List[str]:
+        """Format amounts as chain strings like ``1.000 VIZ``."""
+        result = np.empty(len(self.units), dtype=object)
+        for code in np.unique(self.codes):
+            asset = ASSETS[code]
+            precision = PRECISIONS[asset]
+            mask = self.codes == code
+            units = self.units[mask]
+            integer, fraction = np.divmod(np.abs(units), 10 ** precision)
+            strings = np.char.add(np.where(units < 0, "-", ""), integer.astype(str))
+            strings = np.char.add(np.char.add(strings, "."), np.char.zfill(fraction.astype(str), precision))
+            result[mask] = np.char.add(strings, " " + asset)
+        return result.tolist()
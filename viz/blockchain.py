@@ -170,6 +170,8 @@ class Blockchain(GrapheneBlockchain):
                 'type': 'transfer',
                 'timestamp': '2020-05-29T19:20:07',
                 'block_num': 6,
+                'trx_id': '2d2d5a0c6a47a0b0ba3a6a4c0ae5b6f6e0fbb8a3',
+                'op_in_trx': 0,
                 'from': 'viz',
                 'to': 'alice',
                 'amount': '1.000 VIZ',
@@ -185,13 +187,16 @@ class Blockchain(GrapheneBlockchain):
         if not bool(set(filter_by).intersection(operationids.VIRTUAL_OPS)):
             # uses get_block instead of get_ops_in_block
             for block in self.stream_from(full_blocks=True, start_block=start_block, end_block=end_block):
-                for tx in block["transactions"]:
-                    for op in tx["operations"]:
+                trx_ids = block.get("transaction_ids") or []
+                for trx_in_block, tx in enumerate(block["transactions"]):
+                    for op_in_trx, op in enumerate(tx["operations"]):
                         if not filter_by or op[0] in filter_by:
                             operation = {
                                 "type": op[0],
                                 "timestamp": block.get("timestamp"),
                                 "block_num": block.get("block_num"),
+                                "trx_id": trx_ids[trx_in_block] if trx_in_block < len(trx_ids) else None,
+                                "op_in_trx": op_in_trx,
                             }
                             operation.update(op[1])
                             yield operation
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+import threading
+from typing import TYPE_CHECKING, List, Optional
+
+from vizapi.noderpc import NodeRPC
+
+from .instance import shared_blockchain_instance
+
+if TYPE_CHECKING:
+    from .viz import Client  # noqa: F401
+
+
+class ThreadConnections:
+    """
+    Node connections for worker threads, one connection per thread.
+
+    Connections are opened lazily with the same nodes and options as the client connection, and stay open until
+    :py:meth:`close`. A node connection can't be used by several threads at once, so it's the way to run RPC calls
+    concurrently.
+
+    :param viz.viz.Client blockchain_instance: Client instance
+    :param bool enabled: if disabled, the client connection is returned instead, so callers must not use it from
+        several threads
+    """
+
+    def __init__(self, blockchain_instance: Optional['Client'] = None, enabled: bool = True) -> None:
+        self.blockchain_instance = blockchain_instance or shared_blockchain_instance()
+        self.enabled = enabled
+        self._local = threading.local()
+        self._connections: List[NodeRPC] = []
+        self._lock = threading.Lock()
+
+    def get(self) -> NodeRPC:
+        """Node connection of the current thread."""
+        if not self.enabled:
+            return self.blockchain_instance.rpc
+        rpc = getattr(self._local, "rpc", None)
+        if rpc is None:
+            main_rpc = self.blockchain_instance.rpc
+            # start from the node the client is connected to, keep the others for failover
+            urls = sorted(main_rpc._url_counter, key=lambda url: url != main_rpc.url)
+            rpc = NodeRPC(urls, num_retries=main_rpc.num_retries, **main_rpc._kwargs)
+            self._local.rpc = rpc
+            with self._lock:
+                self._connections.append(rpc)
+        return rpc
+
+    def close(self) -> None:
+        """Close all opened connections."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        self._local = threading.local()
+        for rpc in connections:
+            rpc.connection.disconnect()
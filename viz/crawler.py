@@ -0,0 +1,304 @@
+# -*- coding: utf-8 -*-
+import json
+import logging
+import os
+import sqlite3
+from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import IO, TYPE_CHECKING, Any, Callable, Deque, Iterable, Iterator, List, Optional, Union
+
+from vizapi.noderpc import NodeRPC
+
+from .connections import ThreadConnections
+from .instance import shared_blockchain_instance
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor, Future  # noqa: F401
+
+    from .viz import Client  # noqa: F401
+
+log = logging.getLogger(__name__)
+
+
+def bounded_map(
+    executor: 'Executor', fn: Callable[[Any], Any], iterable: Iterable[Any], max_pending: int
+) -> Iterator[Any]:
+    """
+    Like ``executor.map()``, but consumes ``iterable`` lazily keeping at most ``max_pending`` tasks in flight.
+
+    Results are yielded in order.
+    """
+    pending: Deque['Future'] = deque()
+    for item in iterable:
+        pending.append(executor.submit(fn, item))
+        if len(pending) >= max_pending:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def _reverse_lines(f: IO[bytes], chunk_size: int = 65536) -> Iterator[bytes]:
+    """Yield non-empty lines of a binary file starting from the end."""
+    f.seek(0, os.SEEK_END)
+    position = f.tell()
+    buf = b""
+    while position > 0:
+        step = min(position, chunk_size)
+        position -= step
+        f.seek(position)
+        lines = (f.read(step) + buf).split(b"\n")
+        # first line may continue in the previous chunk
+        buf = lines.pop(0)
+        for line in reversed(lines):
+            if line.strip():
+                yield line
+    if buf.strip():
+        yield buf
+
+
+class Sink(ABC):
+    """Base class for account crawler sinks."""
+
+    @abstractmethod
+    def write(self, account: dict) -> None:
+        """Store account dict."""
+
+    def flush(self) -> None:  # noqa: B027
+        """Called by crawler after each batch of accounts."""
+
+    def last_name(self) -> Optional[str]:
+        """Name of the last stored account, used to resume crawling."""
+        return None
+
+    def close(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> 'Sink':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+class CallbackSink(Sink):
+    """
+    Pass every account into a callback.
+
+    :param callable callback: function accepting account dict
+    """
+
+    def __init__(self, callback: Callable[[dict], None]) -> None:
+        self.callback = callback
+        self._last_name: Optional[str] = None
+
+    def write(self, account: dict) -> None:
+        self.callback(account)
+        self._last_name = account["name"]
+
+    def last_name(self) -> Optional[str]:
+        return self._last_name
+
+
+class JsonlSink(Sink):
+    """
+    Append accounts to a JSON Lines file, one account per line.
+
+    An incomplete trailing line left by an interrupted run is removed when the file is opened.
+
+    :param str path: file path
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._truncate_partial_line()
+        self._file = open(path, "a", encoding="utf-8")
+
+    def _truncate_partial_line(self) -> None:
+        try:
+            f = open(self.path, "r+b")
+        except FileNotFoundError:
+            return
+        with f:
+            end = position = f.seek(0, os.SEEK_END)
+            while position > 0:
+                step = min(position, 65536)
+                position -= step
+                f.seek(position)
+                newline = f.read(step).rfind(b"\n")
+                if newline != -1:
+                    position += newline + 1
+                    break
+            if position < end:
+                log.warning("Removing incomplete last line of %s", self.path)
+                f.truncate(position)
+
+    def write(self, account: dict) -> None:
+        self._file.write(json.dumps(account))
+        self._file.write("\n")
+
+    def flush(self) -> None:
+        self._file.flush()
+
+    def last_name(self) -> Optional[str]:
+        self.flush()
+        with open(self.path, "rb") as f:
+            for line in _reverse_lines(f):
+                try:
+                    return json.loads(line)["name"]
+                except (ValueError, KeyError, TypeError):
+                    log.warning("Skipping malformed line in %s", self.path)
+        return None
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class SqliteSink(Sink):
+    """
+    Store accounts in SQLite database table with ``name`` and ``data`` (json) columns.
+
+    :param str path: database file path
+    :param str table: table name
+    """
+
+    def __init__(self, path: str, table: str = "accounts") -> None:
+        self.table = table
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS {} (name TEXT PRIMARY KEY, data TEXT NOT NULL)".format(table))
+        self._conn.commit()
+
+    def write(self, account: dict) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO {} (name, data) VALUES (?, ?)".format(self.table),
+            (account["name"], json.dumps(account)),
+        )
+
+    def flush(self) -> None:
+        self._conn.commit()
+
+    def last_name(self) -> Optional[str]:
+        return self._conn.execute("SELECT MAX(name) FROM {}".format(self.table)).fetchone()[0]
+
+    def close(self) -> None:
+        self.flush()
+        self._conn.close()
+
+
+class AccountCrawler:
+    """
+    Enumerate all accounts of the chain and fetch their details.
+
+    Names are paged with ``lookup_accounts``, details are fetched with ``get_accounts`` in parallel batches. Every
+    worker thread uses its own node connection. Accounts are passed into the sink in name order, and only a bounded
+    number of batches is kept in memory, so crawling can be resumed from the last stored name.
+
+    .. code-block:: python
+
+        from viz.crawler import AccountCrawler, SqliteSink
+
+        crawler = AccountCrawler(blockchain_instance=viz)
+        with SqliteSink('accounts.sqlite') as sink:
+            # resumes from sink.last_name()
+            crawler.crawl(sink)
+
+    :param viz.viz.Client blockchain_instance: Client instance
+    :param int page_size: how many names to request per ``lookup_accounts`` call (node limit is 1000)
+    :param int batch_size: how many accounts to request per ``get_accounts`` call
+    :param int max_workers: number of parallel connections
+    :param int max_pending: maximum number of batches being fetched or waiting to be written, defaults to
+        ``2 * max_workers``
+    :param bool parallel_connections: open a separate node connection per worker (default). If disabled, the client
+        connection is used and ``max_workers`` is forced to 1, because a connection can't be shared between threads.
+    """
+
+    def __init__(
+        self,
+        blockchain_instance: Optional['Client'] = None,
+        page_size: int = 1000,
+        batch_size: int = 100,
+        max_workers: int = 4,
+        max_pending: Optional[int] = None,
+        parallel_connections: bool = True,
+    ) -> None:
+        self.blockchain_instance = blockchain_instance or shared_blockchain_instance()
+        self.page_size = page_size
+        self.batch_size = batch_size
+        self.max_workers = max_workers if parallel_connections else 1
+        self.max_pending = max_pending or 2 * self.max_workers
+        self.parallel_connections = parallel_connections
+        self._connections = ThreadConnections(self.blockchain_instance, enabled=parallel_connections)
+
+    def thread_rpc(self) -> NodeRPC:
+        """
+        Node connection of the current worker thread.
+
+        Connections are opened with the same nodes and options as the client connection, and stay open until
+        :py:meth:`close`.
+        """
+        return self._connections.get()
+
+    def close(self) -> None:
+        """Close connections opened by :py:meth:`thread_rpc`."""
+        self._connections.close()
+
+    def count(self) -> int:
+        """Total number of accounts."""
+        return self.blockchain_instance.rpc.get_account_count()
+
+    def names(self, start: str = "") -> Iterator[str]:
+        """
+        Yield account names in chain order.
+
+        :param str start: yield only names after this one
+        """
+        lower_bound = start
+        # lower bound is inclusive, so at least 2 names are needed to make progress
+        limit = max(self.page_size, 2)
+        while True:
+            page = self.blockchain_instance.rpc.lookup_accounts(lower_bound, limit)
+            new_names = [name for name in page if name > lower_bound]
+            yield from new_names
+            if len(page) < limit or not new_names:
+                return
+            lower_bound = new_names[-1]
+
+    def _batches(self, start: str) -> Iterator[List[str]]:
+        batch: List[str] = []
+        for name in self.names(start):
+            batch.append(name)
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def _fetch(self, names: List[str]) -> List[dict]:
+        return self.thread_rpc().get_accounts(names)
+
+    def crawl(self, sink: Union[Sink, Callable[[dict], None]], start: Optional[str] = None) -> int:
+        """
+        Fetch all accounts and pass them into the sink.
+
+        :param sink: :py:class:`Sink` instance or a callable accepting account dict
+        :param str start: fetch only accounts after this name, defaults to ``sink.last_name()``
+        :return: number of fetched accounts
+        """
+        if not isinstance(sink, Sink):
+            sink = CallbackSink(sink)
+        if start is None:
+            start = sink.last_name() or ""
+
+        count = 0
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                for accounts in bounded_map(executor, self._fetch, self._batches(start), self.max_pending):
+                    for account in accounts:
+                        sink.write(account)
+                    sink.flush()
+                    count += len(accounts)
+                    log.debug("Fetched %s accounts", count)
+        finally:
+            self.close()
+
+        return count
@@ -0,0 +1,325 @@
+# -*- coding: utf-8 -*-
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from .amount import amount_to_units
+from .crawler import AccountCrawler, bounded_map
+from .instance import shared_blockchain_instance
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+if TYPE_CHECKING:
+    from .viz import Client  # noqa: F401
+
+
+class CSRGraph(NamedTuple):
+    """
+    Directed weighted graph in compressed sparse row form.
+
+    Outgoing edges of node ``i`` are ``indices[indptr[i]:indptr[i + 1]]`` with weights
+    ``weights[indptr[i]:indptr[i + 1]]``. Node names are ``names[i]``.
+    """
+
+    names: List[str]
+    indptr: 'np.ndarray'
+    indices: 'np.ndarray'
+    weights: 'np.ndarray'
+
+
+class DelegationGraph:
+    """
+    Graph of vesting delegations and vesting withdraw routes.
+
+    The graph is filled by :py:meth:`crawl` for a set of accounts or for the whole chain, and can be kept up to date by
+    feeding ``delegate_vesting_shares`` and ``set_withdraw_vesting_route`` operations from
+    :py:meth:`viz.blockchain.Blockchain.stream` into :py:meth:`apply_op`. Queries use compact CSR arrays which are
+    rebuilt lazily after changes.
+
+    Delegation weights are SHARES units (e.g. ``1000000`` for ``1.000000 SHARES``), withdraw route weights are percents
+    in ``CHAIN_100_PERCENT`` based units.
+
+    .. code-block:: python
+
+        graph = DelegationGraph(blockchain_instance=viz)
+        graph.crawl(['alice', 'bob'])
+        print(graph.inbound_delegation('bob'))
+        print(graph.top_delegators(10))
+
+    .. note::
+
+        This class requires `numpy` to be installed.
+
+    :param viz.viz.Client blockchain_instance: Client instance
+    :param int max_workers: number of parallel connections used for crawling
+    :param int page_size: how many items to request per RPC call (node limit is 1000)
+    :param bool parallel_connections: open a separate node connection per worker (default), otherwise a single
+        worker uses the client connection
+    """
+
+    def __init__(
+        self,
+        blockchain_instance: Optional['Client'] = None,
+        max_workers: int = 4,
+        page_size: int = 1000,
+        parallel_connections: bool = True,
+    ) -> None:
+        if np is None:
+            raise ImportError("DelegationGraph requires numpy, please install it")
+
+        self.blockchain_instance = blockchain_instance or shared_blockchain_instance()
+        self.max_workers = max_workers
+        self.page_size = page_size
+        self.parallel_connections = parallel_connections
+
+        # (delegator, delegatee) -> SHARES units
+        self.delegations: Dict[Tuple[str, str], int] = {}
+        # delegator -> SHARES units returning after delegation removal
+        self.expiring: Dict[str, int] = {}
+        # (from_account, to_account) -> (percent, auto_vest)
+        self.routes: Dict[Tuple[str, str], Tuple[int, bool]] = {}
+
+        self._csr: Dict[Tuple[str, bool], CSRGraph] = {}
+        self._names: List[str] = []
+        self._index: Dict[str, int] = {}
+
+    # Crawling
+
+    def _get_delegations(self, crawler: AccountCrawler, account: str, type_: str) -> List[dict]:
+        rpc = crawler.thread_rpc()
+        result: List[dict] = []
+        lower_bound = ""
+        key = "delegatee" if type_ == "delegated" else "delegator"
+        # lower bound is inclusive, so at least 2 items are needed to make progress
+        limit = max(self.page_size, 2)
+        while True:
+            page = rpc.get_vesting_delegations(account, lower_bound, limit, type_)
+            new_items = [item for item in page if item[key] > lower_bound]
+            result.extend(new_items)
+            if len(page) < limit or not new_items:
+                return result
+            lower_bound = new_items[-1][key]
+
+    def _get_expiring(self, crawler: AccountCrawler, account: str) -> List[dict]:
+        rpc = crawler.thread_rpc()
+        result: List[dict] = []
+        from_time = "1970-01-01T00:00:00"
+        limit = max(self.page_size, 2)
+        seen: Set[int] = set()
+        while True:
+            page = rpc.get_expiring_vesting_delegations(account, from_time, limit)
+            new_items = [item for item in page if item["id"] not in seen]
+            result.extend(new_items)
+            seen.update(item["id"] for item in new_items)
+            # a page of already seen items means more than a page of items share the same expiration
+            if len(page) < limit or not new_items:
+                return result
+            from_time = page[-1]["expiration"]
+
+    def _fetch(self, crawler: AccountCrawler, account: str, incoming: bool) -> tuple:
+        rpc = crawler.thread_rpc()
+        delegations = self._get_delegations(crawler, account, "delegated")
+        routes = rpc.get_withdraw_routes(account, "outgoing")
+        if incoming:
+            delegations.extend(self._get_delegations(crawler, account, "received"))
+            routes.extend(rpc.get_withdraw_routes(account, "incoming"))
+        return account, delegations, self._get_expiring(crawler, account), routes
+
+    def _drop_edges(self, accounts: Set[str]) -> None:
+        """Remove outgoing and incoming edges of the accounts."""
+        self.delegations = {pair: value for pair, value in self.delegations.items() if accounts.isdisjoint(pair)}
+        self.routes = {pair: value for pair, value in self.routes.items() if accounts.isdisjoint(pair)}
+        for account in accounts:
+            self.expiring.pop(account, None)
+        self._csr.clear()
+
+    def crawl(self, accounts: Optional[Iterable[str]] = None) -> None:
+        """
+        Load delegations, expiring delegations and withdraw routes from the node.
+
+        Data previously loaded for the crawled accounts is replaced, so removed delegations and routes disappear.
+
+        :param list accounts: accounts to load data for; incoming delegations and routes of these accounts are loaded
+            too. If not provided, all accounts of the chain are crawled and the whole graph is replaced.
+        """
+        crawler = AccountCrawler(
+            blockchain_instance=self.blockchain_instance,
+            page_size=self.page_size,
+            max_workers=self.max_workers,
+            parallel_connections=self.parallel_connections,
+        )
+        incoming = accounts is not None
+        if accounts is None:
+            self.delegations.clear()
+            self.expiring.clear()
+            self.routes.clear()
+            self._csr.clear()
+            accounts = crawler.names()
+        else:
+            accounts = list(accounts)
+            self._drop_edges(set(accounts))
+
+        try:
+            with ThreadPoolExecutor(max_workers=crawler.max_workers) as executor:
+                results = bounded_map(
+                    executor, lambda name: self._fetch(crawler, name, incoming), accounts, crawler.max_pending
+                )
+                for account, delegations, expiring, routes in results:
+                    for item in delegations:
+                        shares = amount_to_units(item["vesting_shares"])
+                        self.set_delegation(item["delegator"], item["delegatee"], shares)
+                    expiring_shares = sum(amount_to_units(item["vesting_shares"]) for item in expiring)
+                    if expiring_shares:
+                        self.expiring[account] = expiring_shares
+                    for item in routes:
+                        self.set_route(item["from_account"], item["to_account"], item["percent"], item["auto_vest"])
+        finally:
+            crawler.close()
+
+    # Updates
+
+    def set_delegation(self, delegator: str, delegatee: str, shares: int) -> None:
+        """Set delegation amount in SHARES units, zero removes the delegation."""
+        if shares:
+            self.delegations[(delegator, delegatee)] = shares
+        else:
+            self.delegations.pop((delegator, delegatee), None)
+        self._csr.clear()
+
+    def set_route(self, from_account: str, to_account: str, percent: int, auto_vest: bool = False) -> None:
+        """Set withdraw route, zero percent removes the route."""
+        if percent:
+            self.routes[(from_account, to_account)] = (percent, auto_vest)
+        else:
+            self.routes.pop((from_account, to_account), None)
+        self._csr.clear()
+
+    def apply_op(self, op: dict) -> None:
+        """
+        Update the graph with an operation from :py:meth:`viz.blockchain.Blockchain.stream`.
+
+        Operations other than ``delegate_vesting_shares`` and ``set_withdraw_vesting_route`` are ignored.
+
+        .. note::
+
+            Delegation decrease is applied immediately, returning SHARES are not added to :py:attr:`expiring`.
+
+        :param dict op: operation in non-raw stream format
+        """
+        if op["type"] == "delegate_vesting_shares":
+            self.set_delegation(op["delegator"], op["delegatee"], amount_to_units(op["vesting_shares"]))
+        elif op["type"] == "set_withdraw_vesting_route":
+            self.set_route(op["from_account"], op["to_account"], op["percent"], op["auto_vest"])
+
+    # CSR representation
+
+    def _build_index(self) -> None:
+        names: Set[str] = set()
+        for edges in (self.delegations, self.routes):
+            for source, target in edges:
+                names.add(source)
+                names.add(target)
+        self._names = sorted(names)
+        self._index = {name: i for i, name in enumerate(self._names)}
+
+    def csr(self, kind: str = "delegations", reverse: bool = False) -> CSRGraph:
+        """
+        Get graph in CSR form.
+
+        :param str kind: ``delegations`` or ``routes``
+        :param bool reverse: build graph of incoming edges instead of outgoing
+        """
+        key = (kind, reverse)
+        if key in self._csr:
+            return self._csr[key]
+
+        if not self._csr:
+            self._build_index()
+
+        if kind == "delegations":
+            edges = self.delegations
+        elif kind == "routes":
+            edges = {pair: percent for pair, (percent, _) in self.routes.items()}
+        else:
+            raise ValueError("Unknown graph kind: {}".format(kind))
+
+        sources = np.fromiter((self._index[pair[reverse]] for pair in edges), dtype=np.int64, count=len(edges))
+        targets = np.fromiter((self._index[pair[not reverse]] for pair in edges), dtype=np.int64, count=len(edges))
+        weights = np.fromiter(edges.values(), dtype=np.int64, count=len(edges))
+
+        order = np.lexsort((targets, sources))
+        indptr = np.zeros(len(self._names) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=len(self._names)), out=indptr[1:])
+        graph = CSRGraph(self._names, indptr, targets[order], weights[order])
+        self._csr[key] = graph
+        return graph
+
+    # Queries
+
+    def _edges(self, graph: CSRGraph, name: str) -> Tuple['np.ndarray', 'np.ndarray']:
+        i = self._index.get(name)
+        if i is None:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        begin, end = graph.indptr[i], graph.indptr[i + 1]
+        return graph.indices[begin:end], graph.weights[begin:end]
+
+    def inbound_delegation(self, name: str) -> int:
+        """Total SHARES units delegated to the account."""
+        _, weights = self._edges(self.csr(reverse=True), name)
+        return int(weights.sum())
+
+    def outbound_delegation(self, name: str) -> int:
+        """Total SHARES units delegated by the account."""
+        _, weights = self._edges(self.csr(), name)
+        return int(weights.sum())
+
+    def delegators(self, name: str) -> Dict[str, int]:
+        """Accounts delegating to the account, with SHARES units."""
+        graph = self.csr(reverse=True)
+        indices, weights = self._edges(graph, name)
+        return {graph.names[i]: int(w) for i, w in zip(indices, weights)}
+
+    def top_delegators(self, limit: int = 10, to: Optional[str] = None) -> List[Tuple[str, int]]:
+        """
+        Accounts delegating most SHARES.
+
+        :param int limit: number of accounts to return
+        :param str to: (optional) count only delegations to this account
+        :return: list of ``(account, shares_units)`` tuples
+        """
+        if to is not None:
+            return sorted(self.delegators(to).items(), key=lambda item: item[1], reverse=True)[:limit]
+
+        graph = self.csr()
+        totals = np.zeros(len(graph.names), dtype=np.int64)
+        np.add.at(totals, np.repeat(np.arange(len(graph.names)), np.diff(graph.indptr)), graph.weights)
+        top = np.argsort(-totals, kind="stable")[:limit]
+        return [(graph.names[i], int(totals[i])) for i in top if totals[i] > 0]
+
+    def reachable(self, name: str, kind: str = "delegations", reverse: bool = False) -> Set[str]:
+        """
+        Accounts reachable from the account by following edges.
+
+        :param str name: account name
+        :param str kind: ``delegations`` or ``routes``
+        :param bool reverse: follow edges backwards (e.g. who delegates to the account, directly or indirectly)
+        """
+        graph = self.csr(kind, reverse)
+        start = self._index.get(name)
+        if start is None:
+            return set()
+
+        visited = np.zeros(len(graph.names), dtype=bool)
+        visited[start] = True
+        stack = [start]
+        while stack:
+            i = stack.pop()
+            begin, end = graph.indptr[i], graph.indptr[i + 1]
+            for j in graph.indices[begin:end]:
+                if not visited[j]:
+                    visited[j] = True
+                    stack.append(j)
+        visited[start] = False
+        return {graph.names[i] for i in np.flatnonzero(visited)}
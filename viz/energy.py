@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+from datetime import datetime
+from typing import TYPE_CHECKING, Dict, Hashable, Iterable, Optional, Set, Tuple, Union
+
+from .account import AccountSnapshot
+from .instance import shared_blockchain_instance
+from .utils import parse_time
+
+if TYPE_CHECKING:
+    from .viz import Client  # noqa: F401
+
+
+class EnergyModel:
+    """
+    Local model of account energy regeneration.
+
+    The model is initialized from account snapshots and then predicts energy at any moment without network access.
+    It can be kept up to date by feeding ``award`` and ``fixed_award`` operations from
+    :py:meth:`viz.blockchain.Blockchain.stream`. Energy is calculated with integer math the same way the chain does.
+
+    .. code-block:: python
+
+        model = EnergyModel(blockchain_instance=viz)
+        model.update(Account('alice').snapshot())
+        for op in Blockchain().stream(['award', 'fixed_award']):
+            model.apply_op(op)
+            if model.can_spend('alice', 10):
+                ...
+
+    To validate the model against the chain, periodically pass fresh snapshots into :py:meth:`observe` and check
+    :py:meth:`drift_stats`.
+
+    .. note::
+
+        ``fixed_award`` operation contains only maximum energy to spend, actual energy depends on reward fund state.
+        The model conservatively assumes the maximum was spent and marks the account as estimated until the next
+        :py:meth:`update` or :py:meth:`observe`.
+
+    :param viz.viz.Client blockchain_instance: Client instance
+    """
+
+    def __init__(self, blockchain_instance: Optional['Client'] = None) -> None:
+        self.blockchain_instance = blockchain_instance or shared_blockchain_instance()
+        cfg = self.blockchain_instance.rpc.config
+        self.energy_100_percent = cfg['CHAIN_100_PERCENT']
+        self.energy_1_percent = cfg['CHAIN_1_PERCENT']
+        self.energy_regeneration_seconds = cfg['CHAIN_ENERGY_REGENERATION_SECONDS']
+
+        # account name -> (energy, last_vote_time)
+        self._state: Dict[str, Tuple[int, datetime]] = {}
+        # account name -> ids of operations applied at last_vote_time
+        self._applied: Dict[str, Set[Hashable]] = {}
+        self._estimated: Set[str] = set()
+
+        self._drift_count = 0
+        self._drift_sum = 0.0
+        self._drift_abs_sum = 0.0
+        self._drift_abs_max = 0.0
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._state
+
+    def __len__(self) -> int:
+        return len(self._state)
+
+    def _regenerate(self, energy: int, last_vote_time: datetime, at: datetime) -> int:
+        elapsed = max(int((at - last_vote_time).total_seconds()), 0)
+        regenerated_energy = self.energy_100_percent * elapsed // self.energy_regeneration_seconds
+        return min(energy + regenerated_energy, self.energy_100_percent)
+
+    def update(self, snapshot: Union[AccountSnapshot, dict]) -> None:
+        """
+        Set account state from the chain data.
+
+        :param snapshot: account snapshot or account dict
+        """
+        if not isinstance(snapshot, AccountSnapshot):
+            snapshot = AccountSnapshot.from_dict(snapshot)
+        self._state[snapshot.name] = (snapshot.energy, snapshot.last_vote_time)
+        self._applied.pop(snapshot.name, None)
+        self._estimated.discard(snapshot.name)
+
+    def forget(self, name: str) -> None:
+        """Stop tracking an account."""
+        self._state.pop(name, None)
+        self._applied.pop(name, None)
+        self._estimated.discard(name)
+
+    def is_estimated(self, name: str) -> bool:
+        """Whether account energy is an estimation (see ``fixed_award`` note above)."""
+        return name in self._estimated
+
+    def raw_energy(self, name: str, at: Optional[datetime] = None) -> int:
+        """
+        Predict account energy in ``CHAIN_100_PERCENT`` based units.
+
+        :param str name: account name
+        :param datetime.datetime at: (optional) naive UTC time, defaults to current time
+        :raises KeyError: if account is not tracked
+        """
+        energy, last_vote_time = self._state[name]
+        return self._regenerate(energy, last_vote_time, at or datetime.utcnow())
+
+    def predict(self, name: str, at: Optional[datetime] = None) -> float:
+        """
+        Predict account energy.
+
+        :param str name: account name
+        :param datetime.datetime at: (optional) naive UTC time, defaults to current time
+        :return: energy as 0-100%
+        :raises KeyError: if account is not tracked
+        """
+        return self.raw_energy(name, at) / self.energy_1_percent
+
+    def can_spend(self, name: str, energy: float, at: Optional[datetime] = None) -> bool:
+        """
+        Check whether account has enough energy.
+
+        :param str name: account name
+        :param float energy: energy as 0-100%
+        :param datetime.datetime at: (optional) naive UTC time, defaults to current time
+        """
+        return self.raw_energy(name, at) >= round(energy * self.energy_1_percent)
+
+    def apply_op(self, op: dict) -> None:
+        """
+        Update the model with an operation from :py:meth:`viz.blockchain.Blockchain.stream`.
+
+        Operations other than ``award`` and ``fixed_award``, operations of untracked accounts and operations older than
+        the account state (already counted in the snapshot) are ignored. Several operations of an account in one block
+        share the timestamp, so replayed operations are recognized by ``block_num``, ``trx_id`` and ``op_in_trx``
+        (or ``_id``) fields; operations without them are always applied.
+
+        :param dict op: operation in non-raw stream format (must include ``type`` and ``timestamp``)
+        """
+        if op["type"] == "award":
+            used_energy = int(op["energy"])
+        elif op["type"] == "fixed_award":
+            used_energy = int(op["max_energy"])
+        else:
+            return
+
+        name = op["initiator"]
+        if name not in self._state:
+            return
+
+        at = parse_time(op["timestamp"])
+        last_vote_time = self._state[name][1]
+        if at < last_vote_time:
+            return
+        applied = self._applied.get(name) if at == last_vote_time else None
+        if applied is None:
+            applied = self._applied[name] = set()
+        op_id = self._op_id(op)
+        if op_id is not None:
+            if op_id in applied:
+                return
+            applied.add(op_id)
+
+        energy = self.raw_energy(name, at)
+        self._state[name] = (max(energy - used_energy, 0), at)
+        if op["type"] == "fixed_award":
+            self._estimated.add(name)
+
+    @staticmethod
+    def _op_id(op: dict) -> Optional[Hashable]:
+        if op.get("trx_id") is not None and op.get("op_in_trx") is not None:
+            return (op.get("block_num"), op["trx_id"], op["op_in_trx"])
+        return op.get("_id")
+
+    def apply_ops(self, ops: Iterable[dict]) -> None:
+        """Shortcut to call :py:meth:`apply_op` for many operations."""
+        for op in ops:
+            self.apply_op(op)
+
+    def observe(self, snapshot: Union[AccountSnapshot, dict], at: Optional[datetime] = None) -> Optional[float]:
+        """
+        Compare model prediction with the actual chain data and update account state.
+
+        :param snapshot: fresh account snapshot or account dict
+        :param datetime.datetime at: (optional) naive UTC time to compare at, defaults to current time
+        :return: drift (model minus chain) as 0-100%, or None if account was not tracked
+        """
+        if not isinstance(snapshot, AccountSnapshot):
+            snapshot = AccountSnapshot.from_dict(snapshot)
+
+        drift = None
+        if snapshot.name in self._state:
+            at = at or datetime.utcnow()
+            actual = self._regenerate(snapshot.energy, snapshot.last_vote_time, at)
+            drift = (self.raw_energy(snapshot.name, at) - actual) / self.energy_1_percent
+            self._drift_count += 1
+            self._drift_sum += drift
+            self._drift_abs_sum += abs(drift)
+            self._drift_abs_max = max(self._drift_abs_max, abs(drift))
+
+        self.update(snapshot)
+        return drift
+
+    def drift_stats(self) -> dict:
+        """
+        Model-versus-chain drift statistics collected by :py:meth:`observe`.
+
+        Example return:
+
+        .. code-block:: python
+
+            {'count': 10, 'mean': -0.1, 'mean_abs': 0.1, 'max_abs': 1.0}
+        """
+        count = self._drift_count
+        return {
+            'count': count,
+            'mean': self._drift_sum / count if count else 0.0,
+            'mean_abs': self._drift_abs_sum / count if count else 0.0,
+            'max_abs': self._drift_abs_max,
+        }
+
+    def reset_drift_stats(self) -> None:
+        self._drift_count = 0
+        self._drift_sum = 0.0
+        self._drift_abs_sum = 0.0
+        self._drift_abs_max = 0.0
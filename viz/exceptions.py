@@ -17,3 +17,7 @@ class ObjectNotInProposalBuffer(BaseException):
 
 class HtlcDoesNotExistException(BaseException):
     """HTLC object does not exist."""
+
+
+class TransactionExpired(BaseException):
+    """Transaction expired without being included into a block."""
@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from graphenebase import bip38
+
+from vizbase.account import PasswordKey
+from vizbase.chains import DEFAULT_PREFIX
+
+
+class DerivedKey(NamedTuple):
+    """Key derived by :py:func:`derive_password_keys`."""
+
+    account: str
+    role: str
+    #: private key in WIF
+    wif: str
+    #: public key with the chain prefix
+    pubkey: str
+
+
+def _derive_chunk(items: Sequence[Tuple[str, str, str]], prefix: str) -> List[DerivedKey]:
+    keys = []
+    for account, password, role in items:
+        passkey = PasswordKey(account, password, role=role)
+        keys.append(DerivedKey(account, role, str(passkey.get_private_key()), format(passkey.get_public_key(), prefix)))
+    return keys
+
+
+def _encrypt_chunk(wifs: Sequence[str], masterkey: str) -> List[str]:
+    # same as MasterPassword.encrypt() of the key store
+    return [format(bip38.encrypt(wif, masterkey), "encwif") for wif in wifs]
+
+
+def _run_chunks(func, items: list, args: tuple, max_workers: Optional[int], chunk_size: int) -> list:
+    chunks = []
+    for start in range(0, len(items), chunk_size):
+        end = start + chunk_size
+        chunks.append(items[start:end])
+    if len(chunks) <= 1 or max_workers == 1:
+        return [result for chunk in chunks for result in func(chunk, *args)]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(func, chunk, *args) for chunk in chunks]
+        return [result for future in futures for result in future.result()]
+
+
+def derive_password_keys(
+    items: Iterable[Tuple[str, str, str]],
+    prefix: str = DEFAULT_PREFIX,
+    max_workers: Optional[int] = None,
+    chunk_size: int = 64,
+) -> List[DerivedKey]:
+    """
+    Derive keys from account passwords in a pool of worker processes.
+
+    Deriving a public key is an EC point multiplication, done in pure Python in most setups, so deriving keys for
+    thousands of accounts one by one takes minutes.
+
+    .. code-block:: python
+
+        from viz.keygen import derive_password_keys
+
+        roles = ['master', 'active', 'regular', 'memo']
+        keys = derive_password_keys((name, password, role) for name, password in accounts for role in roles)
+
+    :param items: ``(account, password, role)`` tuples
+    :param str prefix: prefix of the public keys
+    :param int max_workers: number of worker processes, defaults to number of CPUs; ``1`` derives in the calling
+        process
+    :param int chunk_size: number of keys derived by a worker at once
+    :return: keys in the order of ``items``
+    """
+    return _run_chunks(_derive_chunk, list(items), (prefix,), max_workers, chunk_size)
+
+
+def encrypt_keys(
+    wifs: Iterable[str], masterkey: str, max_workers: Optional[int] = None, chunk_size: int = 4
+) -> List[str]:
+    """
+    Encrypt private keys for an encrypted key store in a pool of worker processes.
+
+    Key stores encrypt keys with BIP38, which uses scrypt and takes about half a second per key. The decrypted master
+    key of the store is sent to the worker processes.
+
+    :param list wifs: private keys
+    :param str masterkey: decrypted master key of the key store
+    :param int max_workers: number of worker processes, defaults to number of CPUs; ``1`` encrypts in the calling
+        process
+    :param int chunk_size: number of keys encrypted by a worker at once
+    :return: encrypted keys in the order of ``wifs``
+    """
+    return _run_chunks(_encrypt_chunk, [str(wif) for wif in wifs], (masterkey,), max_workers, chunk_size)
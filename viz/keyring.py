@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+import threading
+from typing import Dict, Iterable, List, Mapping, Optional, Set
+
+
+class Keyring:
+    """
+    Private keys decrypted from the wallet, indexed by public key and by account.
+
+    :py:class:`viz.wallet.Wallet` decrypts all keys of its key store into a keyring when unlocked and serves key
+    lookups from it, so a signer holding many keys doesn't query and decrypt the key store per lookup. The keyring is
+    wiped when the wallet is locked, either by :py:meth:`viz.wallet.Wallet.lock` or after ``auto_lock`` seconds of
+    inactivity:
+
+    .. code-block:: python
+
+        viz.wallet.auto_lock = 600
+        viz.wallet.unlock('password')
+        viz.wallet.find_account_keys('alice')
+
+    Wiping drops all references to the keys; Python strings can't be overwritten in place, so copies remain in memory
+    until the garbage collector reuses it.
+
+    :param dict keys: public key -> private key
+    """
+
+    def __init__(self, keys: Optional[Mapping[str, str]] = None) -> None:
+        self._lock = threading.Lock()
+        self._keys: Dict[str, str] = dict(keys or {})
+        # account -> public keys, None until account references are loaded
+        self._accounts: Optional[Dict[str, Set[str]]] = None
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, pub: object) -> bool:
+        return str(pub) in self._keys
+
+    def pubkeys(self) -> List[str]:
+        """Return public keys of all keys."""
+        return list(self._keys)
+
+    def get(self, pub: str) -> Optional[str]:
+        """Return private key for the public key, or None."""
+        return self._keys.get(str(pub))
+
+    def add(self, pub: str, wif: str) -> None:
+        """Add a key, accounts using it are unknown until :py:meth:`set_accounts` is called again."""
+        with self._lock:
+            self._keys[str(pub)] = str(wif)
+            self._accounts = None
+
+    def remove(self, pub: str) -> None:
+        """Remove a key."""
+        with self._lock:
+            self._keys.pop(str(pub), None)
+            if self._accounts is not None:
+                for pubkeys in self._accounts.values():
+                    pubkeys.discard(str(pub))
+
+    @property
+    def has_accounts(self) -> bool:
+        """Whether accounts of the keys are loaded."""
+        return self._accounts is not None
+
+    def set_accounts(self, references: Mapping[str, Iterable[str]]) -> None:
+        """
+        Load accounts of the keys.
+
+        :param dict references: public key -> names of accounts having the key in their authorities, as returned by
+            ``get_key_references``
+        """
+        accounts: Dict[str, Set[str]] = {}
+        for pub, names in references.items():
+            if pub in self._keys:
+                for name in names:
+                    accounts.setdefault(name, set()).add(pub)
+        with self._lock:
+            self._accounts = accounts
+
+    def account_keys(self, account: str) -> List[str]:
+        """
+        Return private keys of the account.
+
+        :raises ValueError: if accounts are not loaded, see :py:meth:`set_accounts`
+        """
+        accounts = self._accounts
+        if accounts is None:
+            raise ValueError("Accounts of the keys are not loaded")
+        wifs = [self._keys.get(pub) for pub in sorted(accounts.get(account, ()))]
+        return [wif for wif in wifs if wif]
+
+    def wipe(self) -> None:
+        """Drop all keys."""
+        with self._lock:
+            self._keys.clear()
+            if self._accounts is not None:
+                self._accounts.clear()
+            self._accounts = None
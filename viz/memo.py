@@ -1,5 +1,8 @@
 # -*- coding: utf-8 -*-
 import secrets
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
 
 from graphenecommon.exceptions import KeyNotFound, MissingKeyError
 from graphenecommon.memo import Memo as GrapheneMemo
@@ -11,6 +14,31 @@ from .account import Account
 from .instance import BlockchainInstance
 
 
+class DecryptedMemo(NamedTuple):
+    """Result of :py:meth:`Memo.decrypt_many`."""
+
+    #: memo as given
+    memo: str
+    #: decrypted message, None on error
+    message: Optional[str]
+    #: error raised while decrypting the memo
+    error: Optional[Exception]
+
+
+def _decrypt_chunk(wif: str, memos: List[str]) -> List[Tuple[Optional[str], Optional[Exception]]]:
+    # memos of the same key pair, the shared secret is derived once
+    priv = PrivateKey(wif)
+    pubkey = priv.pubkey
+    cache = memo.SharedSecretCache(maxsize=1)
+    results: List[Tuple[Optional[str], Optional[Exception]]] = []
+    for message in memos:
+        try:
+            results.append((memo.decode_memo(priv, message, cache=cache, priv_pubkey=pubkey), None))
+        except Exception as error:
+            results.append((None, error))
+    return results
+
+
 @BlockchainInstance.inject
 class Memo(GrapheneMemo):
     """
@@ -49,6 +77,9 @@ class Memo(GrapheneMemo):
         print(memo.decrypt(op_data["memo"]))
 
     if ``op_data`` being the payload of a transfer operation.
+
+    Shared secrets are reused between memos of the same key pair if :py:class:`~vizbase.memo.SharedSecretCache` is set
+    as ``memo_cache`` attribute of the client.
     """
 
     def define_classes(self):
@@ -89,6 +120,8 @@ class Memo(GrapheneMemo):
             nonce,
             message,
             prefix=self.chain_prefix,
+            cache=getattr(self.blockchain, "memo_cache", None),
+            from_pubkey=self.publickey_class(self.from_account["memo_key"], prefix=self.chain_prefix),
         )
 
         return enc
@@ -105,15 +138,95 @@ class Memo(GrapheneMemo):
         keys = memo.involved_keys(message)
         wif = None
         for key in keys:
-            try: 
-                wif = self.blockchain.wallet.getPrivateKeyForPublicKey(str(key))
+            wif = self.blockchain.wallet.find_private_key(str(key))
+            if wif:
                 break
-            except: 
-                continue
         if not wif:
             raise MissingKeyError("None of the required memo keys are installed!")
 
         if not hasattr(self, "chain_prefix"):
             self.chain_prefix = self.blockchain.prefix
 
-        return memo.decode_memo(self.privatekey_class(wif), message)
+        # wallet keys are indexed by their public keys, no need to derive it again
+        return memo.decode_memo(
+            self.privatekey_class(wif), message, cache=getattr(self.blockchain, "memo_cache", None), priv_pubkey=key
+        )
+
+    def decrypt_many(
+        self,
+        memos: Iterable[Union[str, Dict[str, Any]]],
+        max_workers: Optional[int] = None,
+        batch_size: int = 10000,
+        chunk_size: int = 500,
+    ) -> Iterator[DecryptedMemo]:
+        """
+        Decrypt many memos in a pool of worker processes.
+
+        Memos are read in batches, grouped by key pair and decrypted in chunks, so the private key is looked up in the
+        wallet and the shared secret is derived once per key pair and chunk. Results are yielded in the order of
+        memos, errors are reported per memo. Memos not starting with ``#`` are returned as is.
+
+        .. code-block:: python
+
+            ops = Account('alice').history_reverse(only_ops=['transfer'])
+            for result in Memo().decrypt_many(ops):
+                print(result.message if result.error is None else result.error)
+
+        :param memos: encrypted memos, or operation dicts with ``memo`` field (e.g. ``transfer`` ops yielded by
+            :py:meth:`viz.account.Account.history_reverse` or :py:meth:`viz.blockchain.Blockchain.stream`)
+        :param int max_workers: number of worker processes, defaults to number of CPUs
+        :param int batch_size: number of memos read from ``memos`` at once
+        :param int chunk_size: maximum number of memos sent to a worker at once
+        :rtype: generator of :py:class:`DecryptedMemo`
+        """
+        if not hasattr(self, "chain_prefix"):
+            self.chain_prefix = self.blockchain.prefix
+
+        # public key in hex -> private key or None, resolved once
+        wifs: Dict[str, Optional[str]] = {}
+        items = iter(memos)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            while True:
+                batch = [item["memo"] if isinstance(item, dict) else item for item in islice(items, batch_size)]
+                if not batch:
+                    return
+                yield from self._decrypt_batch(executor, batch, wifs, chunk_size)
+
+    def _lookup_wif(self, key: str, wifs: Dict[str, Optional[str]]) -> Optional[str]:
+        if key not in wifs:
+            wifs[key] = self.blockchain.wallet.find_private_key(self.publickey_class(key, prefix=self.chain_prefix))
+        return wifs[key]
+
+    def _decrypt_batch(
+        self, executor: ProcessPoolExecutor, batch: List[str], wifs: Dict[str, Optional[str]], chunk_size: int
+    ) -> List[DecryptedMemo]:
+        results: List[Optional[DecryptedMemo]] = [None] * len(batch)
+        # (private key, key pair) -> positions in the batch
+        groups: Dict[Tuple[str, str, str], List[int]] = {}
+        for index, message in enumerate(batch):
+            if not message.startswith("#"):
+                results[index] = DecryptedMemo(message, message, None)
+                continue
+            try:
+                raw = memo.unpack_memo(message)
+                from_key, to_key = raw.from_key.hex(), raw.to_key.hex()
+                wif = self._lookup_wif(to_key, wifs) or self._lookup_wif(from_key, wifs)
+            except Exception as error:
+                results[index] = DecryptedMemo(message, None, error)
+                continue
+            if not wif:
+                error = MissingKeyError("None of the required memo keys are installed!")
+                results[index] = DecryptedMemo(message, None, error)
+                continue
+            groups.setdefault((wif, from_key, to_key), []).append(index)
+
+        futures = []
+        for (wif, _, _), indexes in groups.items():
+            for start in range(0, len(indexes), chunk_size):
+                end = start + chunk_size
+                chunk = indexes[start:end]
+                futures.append((chunk, executor.submit(_decrypt_chunk, wif, [batch[index] for index in chunk])))
+        for chunk, future in futures:
+            for index, (message, error) in zip(chunk, future.result()):
+                results[index] = DecryptedMemo(batch[index], message, error)
+        return results  # type: ignore[return-value]
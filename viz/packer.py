@@ -0,0 +1,254 @@
+# -*- coding: utf-8 -*-
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple, Union
+
+from graphenebase.objects import GrapheneObject
+from graphenecommon.exceptions import MissingKeyError
+from graphenebase.types import varint
+
+from vizbase.objects import Operation
+from vizbase.serializers import TransactionEncoder
+
+from .connections import ThreadConnections
+from .crawler import bounded_map
+from .instance import shared_blockchain_instance
+from .transactionbuilder import TransactionBuilder
+
+if TYPE_CHECKING:
+    from .viz import Client  # noqa: F401
+
+log = logging.getLogger(__name__)
+
+# ref_block_num, ref_block_prefix, expiration
+TX_HEADER_SIZE = 2 + 4 + 4
+# compact signature
+SIGNATURE_SIZE = 65
+# see database::_push_transaction(), transaction size must fit in a block with some room for block header
+BLOCK_SIZE_RESERVE = 256
+
+
+class OpResult(NamedTuple):
+    """Result of a packed operation."""
+
+    #: position of the operation in the input
+    index: int
+    op: GrapheneObject
+    #: id of the transaction which carried the operation
+    tx_id: Optional[str]
+    #: exception raised on signing or broadcasting, None on success
+    error: Optional[Exception]
+
+
+class Batch(NamedTuple):
+    """Operations packed into one transaction."""
+
+    account: str
+    permission: str
+    #: ``(index, op)`` pairs
+    ops: List[Tuple[int, GrapheneObject]]
+
+
+class _Prepared(NamedTuple):
+    batch: Batch
+    builder: Optional[TransactionBuilder]
+    error: Optional[Exception]
+
+
+class OpPacker:
+    """
+    Pack many operations into as few transactions as possible and broadcast them concurrently.
+
+    Operations sharing signing account and permission are grouped into transactions not exceeding the chain
+    transaction size limit (``maximum_block_size`` minus block header reserve). Transactions are signed and
+    broadcasted by a pool of workers, each with its own node connection. Failure of a transaction doesn't stop the
+    others, results are reported per operation.
+
+    .. code-block:: python
+
+        from vizbase import operations
+        from viz.packer import OpPacker
+
+        payouts = {'bob': '1.000 VIZ', 'carol': '2.000 VIZ'}
+        ops = (
+            (operations.Transfer(**{'from': 'alice', 'to': to, 'amount': amount, 'memo': ''}), 'alice', 'active')
+            for to, amount in payouts.items()
+        )
+        packer = OpPacker(blockchain_instance=viz)
+        for result in packer.broadcast(ops):
+            if result.error:
+                print('failed', result.index, result.error)
+
+    Every transaction requests reference block params, consider installing
+    :py:class:`~viz.refblock.RefBlockProvider` into the client.
+
+    :param viz.viz.Client blockchain_instance: Client instance
+    :param int max_tx_size: maximum serialized transaction size in bytes, defaults to chain limit
+    :param int max_ops: maximum number of operations per transaction (optional)
+    :param int max_workers: number of concurrent broadcasts
+    :param int max_pending: maximum number of signed transactions waiting for broadcast, defaults to
+        ``2 * max_workers``
+    :param bool parallel_connections: open a separate node connection per worker (default). If disabled, the client
+        connection is used and ``max_workers`` is forced to 1.
+    """
+
+    def __init__(
+        self,
+        blockchain_instance: Optional['Client'] = None,
+        max_tx_size: Optional[int] = None,
+        max_ops: Optional[int] = None,
+        max_workers: int = 4,
+        max_pending: Optional[int] = None,
+        parallel_connections: bool = True,
+    ) -> None:
+        self.blockchain_instance = blockchain_instance or shared_blockchain_instance()
+        if max_tx_size is None:
+            props = self.blockchain_instance.rpc.get_dynamic_global_properties()
+            max_tx_size = props["maximum_block_size"] - BLOCK_SIZE_RESERVE
+        self.max_tx_size = max_tx_size
+        self.max_ops = max_ops
+        self.max_workers = max_workers if parallel_connections else 1
+        self.max_pending = max_pending or 2 * self.max_workers
+        self._connections = ThreadConnections(self.blockchain_instance, enabled=parallel_connections)
+        # (account, permission) -> private keys, or exception raised while obtaining them
+        self._wifs: Dict[Tuple[str, str], Union[Set[str], Exception]] = {}
+        # per-thread TransactionEncoder
+        self._local = threading.local()
+
+    def _signer_wifs(self, account: str, permission: str) -> Set[str]:
+        key = (account, permission)
+        if key not in self._wifs:
+            try:
+                builder = TransactionBuilder(blockchain_instance=self.blockchain_instance)
+                builder.appendSigner(account, permission)
+                self._wifs[key] = set(builder.wifs)
+            except Exception as error:
+                self._wifs[key] = error
+        wifs = self._wifs[key]
+        if isinstance(wifs, Exception):
+            raise wifs
+        return wifs
+
+    def _encoder(self) -> TransactionEncoder:
+        encoder = getattr(self._local, "encoder", None)
+        if encoder is None:
+            chain_params = self.blockchain_instance.rpc.chain_params
+            encoder = self._local.encoder = TransactionEncoder(chain_params["chain_id"], chain_params["prefix"])
+        return encoder
+
+    def _sign(self, builder: TransactionBuilder) -> dict:
+        if getattr(self.blockchain_instance, "signing_service", None) or self.blockchain_instance.proposer:
+            builder.sign()
+            return builder.json()
+        # sign the transaction JSON built by constructTx(), without serializing the operation objects
+        if not any(builder.wifs):
+            raise MissingKeyError
+        tx = builder.json()
+        tx["signatures"] = self._encoder().sign(tx, builder.wifs)
+        return tx
+
+    def _tx_size(self, ops_size: int, ops_count: int, signatures: int) -> int:
+        return (
+            TX_HEADER_SIZE
+            + len(varint(ops_count))
+            + ops_size
+            # empty extensions
+            + 1
+            + len(varint(signatures))
+            + signatures * SIGNATURE_SIZE
+        )
+
+    def pack(self, items: Iterable[Tuple[GrapheneObject, str, str]]) -> Iterator[Batch]:
+        """
+        Group operations into transactions.
+
+        Batches are yielded as soon as they are full, so the input may be a generator of any length. An operation
+        too big for a transaction gets its own batch, which fails on signing.
+
+        :param items: ``(op, account, permission)`` tuples, where ``op`` is an operation from
+            :py:mod:`vizbase.operations`, ``account`` and ``permission`` define the signer
+        """
+        # (account, permission) -> (batch, serialized ops size)
+        open_batches: Dict[Tuple[str, str], Tuple[Batch, int]] = {}
+        for index, (op, account, permission) in enumerate(items):
+            key = (account, permission)
+            try:
+                signatures = len(self._signer_wifs(account, permission))
+            except Exception:
+                # reported when the batch is signed
+                signatures = 1
+            op_size = len(bytes(Operation(op)))
+
+            batch, size = open_batches.get(key, (None, 0))
+            if batch is not None and (
+                self._tx_size(size + op_size, len(batch.ops) + 1, signatures) > self.max_tx_size
+                or (self.max_ops and len(batch.ops) >= self.max_ops)
+            ):
+                yield batch
+                batch = None
+            if batch is None:
+                batch, size = Batch(account, permission, []), 0
+            batch.ops.append((index, op))
+            open_batches[key] = (batch, size + op_size)
+
+        for batch, _ in open_batches.values():
+            yield batch
+
+    def _prepare(self, batch: Batch) -> _Prepared:
+        try:
+            builder = TransactionBuilder(blockchain_instance=self.blockchain_instance)
+            builder.appendOps([op for _, op in batch.ops])
+            for wif in self._signer_wifs(batch.account, batch.permission):
+                builder.appendWif(wif)
+            # fetch reference block in the calling thread, sign() in a worker will reuse it
+            builder.constructTx()
+            return _Prepared(batch, builder, None)
+        except Exception as error:
+            log.warning("Failed to build transaction of %s: %s", batch.account, error)
+            return _Prepared(batch, None, error)
+
+    def _send(self, prepared: _Prepared) -> List[OpResult]:
+        batch, builder, error = prepared
+        tx_id = None
+        if builder is not None:
+            try:
+                tx = self._sign(builder)
+                encoder = self._encoder()
+                tx_id = encoder.transaction_id(tx)
+                size = len(encoder.encode(tx))
+                if size > self.max_tx_size:
+                    raise ValueError("Transaction size {} exceeds {} bytes".format(size, self.max_tx_size))
+                policy = getattr(self.blockchain_instance, "retry_policy", None)
+                if self.blockchain_instance.nobroadcast:
+                    log.warning("Not broadcasting anything!")
+                elif self.blockchain_instance.blocking:
+                    self._connections.get().broadcast_transaction_synchronous(tx, api="network_broadcast")
+                elif policy is not None:
+                    policy.broadcast(self._connections.get(), tx, tx_id)
+                else:
+                    self._connections.get().broadcast_transaction(tx, api="network_broadcast")
+            except Exception as e:
+                log.warning("Failed to send transaction of %s: %s", batch.account, e)
+                error = e
+        return [OpResult(index, op, tx_id, error) for index, op in batch.ops]
+
+    def broadcast(self, items: Iterable[Tuple[GrapheneObject, str, str]]) -> Iterator[OpResult]:
+        """
+        Pack, sign and broadcast operations.
+
+        Transactions are built in the calling thread, signed and broadcasted by workers. Signing in threads is limited
+        by GIL, set :py:class:`~viz.signing.SigningService` as ``signing_service`` attribute of the client to sign in
+        parallel. Results are yielded per operation in transaction order, which may differ from the input order when
+        several signers are mixed.
+
+        :param items: ``(op, account, permission)`` tuples, see :py:meth:`pack`
+        :return: iterator of :py:class:`OpResult`
+        """
+        prepared = (self._prepare(batch) for batch in self.pack(items))
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                for results in bounded_map(executor, self._send, prepared, self.max_pending):
+                    yield from results
+        finally:
+            self._connections.close()
@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+import logging
+import struct
+import threading
+import time
+from binascii import unhexlify
+from typing import TYPE_CHECKING, Optional, Tuple
+
+from .instance import shared_blockchain_instance
+
+if TYPE_CHECKING:
+    from .viz import Client  # noqa: F401
+
+log = logging.getLogger(__name__)
+
+# ref_block_num is 16 bits, so a transaction may reference only one of the last 0x10000 blocks
+TAPOS_WINDOW = 0x10000
+
+
+def block_params(block_num: int, block_id: str) -> Tuple[int, int]:
+    """Calculate ``ref_block_num`` and ``ref_block_prefix`` referencing the block."""
+    return block_num & 0xFFFF, struct.unpack_from("<I", unhexlify(block_id), 4)[0]
+
+
+class RefBlockProvider:
+    """
+    Shared cache of ``ref_block_num`` and ``ref_block_prefix`` transaction params.
+
+    By default, :py:meth:`viz.transactionbuilder.TransactionBuilder.get_block_params` calls
+    ``get_dynamic_global_properties`` for every transaction. When a provider is installed into the client, params are
+    taken from the cache, which is refreshed once the referenced block becomes older than ``max_age`` blocks. The
+    cache can be refreshed in a background thread with :py:meth:`start`, or fed with blocks from
+    :py:meth:`viz.blockchain.Blockchain.stream_from` via :py:meth:`feed_block`.
+
+    .. code-block:: python
+
+        from viz.refblock import RefBlockProvider
+
+        viz.ref_block_provider = RefBlockProvider(blockchain_instance=viz)
+        viz.ref_block_provider.start()
+
+        for _ in range(100):
+            viz.transfer('bob', 1, 'VIZ', account='alice')
+
+    The cache is safe to share between threads.
+
+    :param viz.viz.Client blockchain_instance: Client instance
+    :param int max_age: maximum age of the referenced block in blocks, must be well below TaPoS window of 65536
+        blocks
+    """
+
+    def __init__(self, blockchain_instance: Optional['Client'] = None, max_age: int = 20) -> None:
+        if not 0 < max_age <= TAPOS_WINDOW // 2:
+            raise ValueError("max_age must be between 1 and {} blocks".format(TAPOS_WINDOW // 2))
+
+        self.blockchain_instance = blockchain_instance or shared_blockchain_instance()
+        self.max_age = max_age
+        self.block_interval = self.blockchain_instance.rpc.config["CHAIN_BLOCK_INTERVAL"]
+
+        self._lock = threading.Lock()
+        self._params: Optional[Tuple[int, int]] = None
+        self._block_num = 0
+        self._updated_at = 0.0
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def _set(self, block_num: int, block_id: str, updated_at: float) -> None:
+        with self._lock:
+            if block_num >= self._block_num:
+                self._params = block_params(block_num, block_id)
+                self._block_num = block_num
+                self._updated_at = updated_at
+
+    def age(self) -> Optional[float]:
+        """Estimated age of the cached reference block in blocks, or None if nothing is cached."""
+        if self._params is None:
+            return None
+        return (time.monotonic() - self._updated_at) / self.block_interval
+
+    def refresh(self) -> Tuple[int, int]:
+        """Fetch current head block params from the node."""
+        props = self.blockchain_instance.rpc.get_dynamic_global_properties()
+        self._set(props["head_block_number"], props["head_block_id"], time.monotonic())
+        return self.get()
+
+    def feed_block(self, block: dict) -> None:
+        """
+        Use a new block as reference.
+
+        :param dict block: block as returned by ``get_block`` (``block_id`` field is required), e.g. from
+            ``Blockchain.stream_from(full_blocks=True)``
+        """
+        block_id = block["block_id"]
+        # block number is stored in the first 4 bytes of the block id
+        self._set(int(block_id[:8], 16), block_id, time.monotonic())
+
+    def get(self) -> Tuple[int, int]:
+        """
+        Get ``(ref_block_num, ref_block_prefix)``, refreshing them if the cache is empty or too old.
+
+        The age is estimated from the time passed since the block was seen, so a stale cache is noticed even if the
+        background refresh or the block feed stopped.
+        """
+        with self._lock:
+            params = self._params
+            if params is not None and (time.monotonic() - self._updated_at) / self.block_interval < self.max_age:
+                return params
+        return self.refresh()
+
+    def invalidate(self) -> None:
+        """Drop cached params, e.g. after reconnecting to another node."""
+        with self._lock:
+            self._params = None
+            self._block_num = 0
+
+    def _run(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            try:
+                self.refresh()
+            except Exception:
+                log.exception("Failed to refresh reference block")
+
+    def start(self, interval: Optional[float] = None) -> None:
+        """
+        Refresh params in a background daemon thread.
+
+        :param float interval: refresh interval in seconds, defaults to a half of ``max_age`` blocks
+        """
+        if self._thread is not None:
+            return
+        self.refresh()
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(interval or self.max_age * self.block_interval / 2,), daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop background refresh."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+import logging
+import threading
+import time
+from itertools import islice
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple, Union
+
+from vizbase import operations
+from vizbase.chains import PRECISIONS
+
+from .amount import Amount
+from .converter import Converter
+from .exceptions import AccountExistsException
+from .instance import shared_blockchain_instance
+from .keygen import derive_password_keys
+from .packer import OpPacker
+
+if TYPE_CHECKING:
+    from .viz import Client  # noqa: F401
+
+log = logging.getLogger(__name__)
+
+KEY_ROLES = ("master", "active", "regular", "memo")
+
+
+class NewAccount(NamedTuple):
+    """Account to register with :py:class:`AccountRegistrar`."""
+
+    name: str
+    #: password to derive the keys from
+    password: Optional[str] = None
+    #: role -> public key, used if there is no password
+    pubkeys: Optional[Dict[str, str]] = None
+    json_meta: Optional[Dict[str, Any]] = None
+
+
+class RegistrationResult(NamedTuple):
+    """Result of an account registration."""
+
+    name: str
+    #: id of the transaction which carried ``account_create``
+    tx_id: Optional[str]
+    #: exception raised on registration, e.g. :py:class:`~viz.exceptions.AccountExistsException`, None on success
+    error: Optional[Exception]
+
+
+class AccountRegistrar:
+    """
+    Register many accounts, like :py:meth:`viz.viz.Client.create_account` does for one.
+
+    Accounts are processed in batches. For every batch, existing accounts are found with one ``lookup_account_names``
+    call, keys are derived from passwords in worker processes (see :py:func:`viz.keygen.derive_password_keys`) and
+    ``account_create`` operations are packed into transactions and broadcasted concurrently by
+    :py:class:`~viz.packer.OpPacker`. Chain properties and share price, which define the creation fee and delegation,
+    are fetched once per block interval instead of once per account. A transaction rejected by the node fails all
+    accounts it carries, set ``max_ops`` to limit that.
+
+    .. code-block:: python
+
+        from viz.registration import AccountRegistrar
+
+        registrar = AccountRegistrar('alice', blockchain_instance=viz)
+        for result in registrar.register((name, password) for name, password in signups):
+            if result.error:
+                print('failed', result.name, result.error)
+
+    :param str creator: account paying for the new accounts
+    :param viz.viz.Client blockchain_instance: Client instance
+    :param float fee: creation fee, defaults to ``account_creation_fee`` chain property
+    :param float delegation: delegation to new accounts in SHARES, defaults to the minimum required by
+        ``create_account_delegation_ratio``
+    :param str referrer: referrer of the new accounts
+    :param bool store_keys: store private keys derived from passwords in the wallet
+    :param int batch_size: number of accounts processed at once
+    :param int max_workers: number of concurrent broadcasts
+    :param int key_workers: number of processes deriving keys, defaults to number of CPUs
+    :param packer_kwargs: other :py:class:`~viz.packer.OpPacker` params, e.g. ``max_ops``
+    """
+
+    def __init__(
+        self,
+        creator: str,
+        blockchain_instance: Optional['Client'] = None,
+        fee: Optional[float] = None,
+        delegation: Optional[float] = None,
+        referrer: str = "",
+        store_keys: bool = True,
+        batch_size: int = 1000,
+        max_workers: int = 4,
+        key_workers: Optional[int] = None,
+        **packer_kwargs: Any,
+    ) -> None:
+        self.blockchain_instance = blockchain_instance or shared_blockchain_instance()
+        self.creator = creator
+        self.fee = fee
+        self.delegation = delegation
+        self.referrer = referrer
+        self.store_keys = store_keys
+        self.batch_size = batch_size
+        self.key_workers = key_workers
+        self.block_interval = self.blockchain_instance.rpc.config["CHAIN_BLOCK_INTERVAL"]
+        self.packer = OpPacker(blockchain_instance=self.blockchain_instance, max_workers=max_workers, **packer_kwargs)
+
+        self._lock = threading.Lock()
+        self._amounts: Optional[Tuple[str, str]] = None
+        self._updated_at = 0.0
+        # names seen by the current register() run
+        self._seen: Set[str] = set()
+
+    def amounts(self) -> Tuple[str, str]:
+        """Return ``(fee, delegation)`` amount strings, refreshed from the node once per block interval."""
+        with self._lock:
+            if self._amounts is not None and time.monotonic() - self._updated_at < self.block_interval:
+                return self._amounts
+
+        rpc = self.blockchain_instance.rpc
+        fee = self.fee
+        delegation = self.delegation
+        if not fee or delegation is None:
+            props = rpc.get_chain_properties()
+            if not fee:
+                fee = Amount(props["account_creation_fee"]).amount
+            if delegation is None:
+                shares_price = Converter(blockchain_instance=self.blockchain_instance).core_per_share()
+                delegation = fee * props["create_account_delegation_ratio"] * shares_price
+
+        amounts = (
+            "{:.{prec}f} {asset}".format(
+                float(fee), prec=PRECISIONS.get(rpc.chain_params["core_symbol"]), asset=rpc.chain_params["core_symbol"]
+            ),
+            "{:.{prec}f} {asset}".format(
+                float(delegation),
+                prec=PRECISIONS.get(rpc.chain_params["shares_symbol"]),
+                asset=rpc.chain_params["shares_symbol"],
+            ),
+        )
+        with self._lock:
+            self._amounts = amounts
+            self._updated_at = time.monotonic()
+        return amounts
+
+    def existing(self, names: List[str]) -> Set[str]:
+        """Return names of existing accounts, looked up with one call."""
+        if not names:
+            return set()
+        found = self.blockchain_instance.rpc.lookup_account_names(names)
+        return {name for name, account in zip(names, found) if account}
+
+    def _op(self, account: NewAccount, pubkeys: Dict[str, str], fee: str, delegation: str) -> Any:
+        prefix = self.blockchain_instance.prefix
+        authorities = {
+            role: {"account_auths": [], "key_auths": [[pubkeys[role], 1]], "weight_threshold": 1}
+            for role in KEY_ROLES
+            if role != "memo"
+        }
+        return operations.Account_create(
+            fee=fee,
+            delegation=delegation,
+            creator=self.creator,
+            new_account_name=account.name,
+            memo_key=pubkeys["memo"],
+            json_metadata=account.json_meta or {},
+            referrer=self.referrer,
+            prefix=prefix,
+            **authorities,
+        )
+
+    def _register_batch(self, batch: List[NewAccount]) -> List[RegistrationResult]:
+        results: List[Optional[RegistrationResult]] = [None] * len(batch)
+        existing = self.existing(list(dict.fromkeys(account.name for account in batch)))
+        # role -> public key, per position of accounts to register
+        pubkeys: Dict[int, Dict[str, str]] = {}
+        # (position, password) of accounts with keys to derive
+        derive: List[Tuple[int, str]] = []
+        for index, account in enumerate(batch):
+            if account.name in existing or account.name in self._seen:
+                results[index] = RegistrationResult(account.name, None, AccountExistsException(account.name))
+                continue
+            self._seen.add(account.name)
+            if account.password:
+                derive.append((index, account.password))
+            elif account.pubkeys and all(role in account.pubkeys for role in KEY_ROLES):
+                pubkeys[index] = account.pubkeys
+            else:
+                error = ValueError("Provide either a password or public keys of all roles")
+                results[index] = RegistrationResult(account.name, None, error)
+
+        if derive:
+            items = [(batch[index].name, password, role) for index, password in derive for role in KEY_ROLES]
+            keys = derive_password_keys(items, prefix=self.blockchain_instance.prefix, max_workers=self.key_workers)
+            for position, (index, _) in enumerate(derive):
+                start = position * len(KEY_ROLES)
+                end = start + len(KEY_ROLES)
+                pubkeys[index] = {key.role: key.pubkey for key in keys[start:end]}
+            if self.store_keys:
+                self.blockchain_instance.wallet.add_private_keys(
+                    {key.pubkey: key.wif for key in keys}, max_workers=self.key_workers
+                )
+
+        fee, delegation = self.amounts()
+        ops = []
+        for index in sorted(pubkeys):
+            account = batch[index]
+            try:
+                ops.append((index, self._op(account, pubkeys[index], fee, delegation)))
+            except Exception as error:
+                results[index] = RegistrationResult(account.name, None, error)
+
+        for result in self.packer.broadcast((op, self.creator, "active") for _, op in ops):
+            index = ops[result.index][0]
+            results[index] = RegistrationResult(batch[index].name, result.tx_id, result.error)
+        return results  # type: ignore[return-value]
+
+    def register(self, accounts: Iterable[Union[NewAccount, Tuple[str, str]]]) -> Iterator[RegistrationResult]:
+        """
+        Register accounts.
+
+        A name repeated in ``accounts`` is registered once, its repeats fail with
+        :py:class:`~viz.exceptions.AccountExistsException`.
+
+        :param accounts: :py:class:`NewAccount` items or ``(name, password)`` pairs
+        :return: iterator of :py:class:`RegistrationResult` in the order of ``accounts``
+        """
+        items = (account if isinstance(account, NewAccount) else NewAccount(*account) for account in accounts)
+        self._seen = set()
+        while True:
+            batch = list(islice(items, self.batch_size))
+            if not batch:
+                return
+            log.debug("Registering %s accounts", len(batch))
+            yield from self._register_batch(batch)
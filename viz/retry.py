@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+import logging
+import time
+from datetime import datetime
+
+from grapheneapi.exceptions import RPCError
+
+from .exceptions import TransactionExpired
+from .utils import parse_time
+
+log = logging.getLogger(__name__)
+
+# node rejects a transaction with id it has already seen, see database::_push_transaction()
+DUPLICATE_TRANSACTION = "Duplicate transaction check failed"
+
+
+class RetryPolicy:
+    """
+    Idempotent broadcast retries.
+
+    A broadcast failing with a timeout or a connection error is ambiguous: the node may have accepted the transaction.
+    The policy checks whether the transaction is already known (``get_transaction``, requires ``operation_history``
+    plugin on the node) and rebroadcasts the identical signed transaction otherwise. Chain deduplicates transactions
+    by id until they expire, so the retry can't apply the operations twice and a ``Duplicate transaction`` rejection
+    means success. Errors returned by the node for the transaction itself (e.g. missing authority) are not retried.
+
+    When set as ``retry_policy`` attribute of the client, it is used by
+    :py:meth:`viz.transactionbuilder.TransactionBuilder.broadcast` for non-blocking broadcasts and by
+    :py:class:`~viz.packer.OpPacker`.
+
+    .. code-block:: python
+
+        from viz.retry import RetryPolicy
+
+        viz.retry_policy = RetryPolicy(attempts=5)
+        tx = viz.new_tx()
+        tx.appendOps(op)
+        tx.appendSigner('alice', 'active')
+        print(tx.id)  # known before broadcast
+        tx.broadcast()
+
+    :param int attempts: maximum number of broadcast attempts
+    :param float backoff: delay before the second attempt in seconds, doubled for every next one
+    :param float max_backoff: maximum delay between attempts
+    """
+
+    def __init__(self, attempts: int = 5, backoff: float = 0.5, max_backoff: float = 10) -> None:
+        if attempts < 1:
+            raise ValueError("attempts must be positive")
+        self.attempts = attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+    def is_included(self, rpc, tx_id: str) -> bool:
+        """Check whether the node knows the transaction, unavailable check counts as not included."""
+        try:
+            return bool(rpc.get_transaction(tx_id))
+        except Exception as error:
+            log.debug("Failed to look up transaction %s: %s", tx_id, error)
+            return False
+
+    def broadcast(self, rpc, tx: dict, tx_id: str) -> None:
+        """
+        Broadcast a signed transaction, retrying on ambiguous failures.
+
+        :param rpc: node connection
+        :param dict tx: signed transaction
+        :param str tx_id: transaction id
+        :raises TransactionExpired: if the transaction expired before a broadcast succeeded
+        """
+        expiration = parse_time(tx["expiration"])
+        for attempt in range(self.attempts):
+            try:
+                rpc.broadcast_transaction(tx, api="network_broadcast")
+                return
+            except RPCError as error:
+                if DUPLICATE_TRANSACTION in str(error):
+                    log.info("Transaction %s is already known to the node", tx_id)
+                    return
+                raise
+            except Exception as error:
+                log.warning("Broadcast of transaction %s failed (attempt %s): %s", tx_id, attempt + 1, error)
+                last_error = error
+
+            if self.is_included(rpc, tx_id):
+                return
+            if datetime.utcnow() > expiration:
+                raise TransactionExpired("Transaction {} expired at {}".format(tx_id, tx["expiration"]))
+            if attempt + 1 < self.attempts:
+                time.sleep(min(self.backoff * 2 ** attempt, self.max_backoff))
+        raise last_error
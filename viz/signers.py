@@ -0,0 +1,118 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+from graphenebase.objects import GrapheneObject
+
+from vizbase.objects import Operation
+from vizbase.operationids import OPS
+
+#: operations changing account authorities -> field holding the account name
+AUTHORITY_OPS = {
+    "account_update": "account",
+    "recover_account": "account_to_recover",
+}
+
+
+class _Entry(NamedTuple):
+    wifs: List[str]
+    #: accounts whose authorities the keys were resolved from
+    accounts: Set[str]
+    expires: float
+
+
+class SignerCache:
+    """
+    Cache of private keys resolved for signing ``(account, permission)``.
+
+    :py:meth:`viz.transactionbuilder.TransactionBuilder.appendSigner` loads the account from the node and looks up
+    its authority keys in the wallet (decrypting them in case of encrypted storage) for every transaction. When the
+    cache is set as ``signer_cache`` attribute of the client, resolved keys are reused until ``ttl`` expires or an
+    operation changing the account authorities is seen.
+
+    Transactions with ``account_update`` and ``recover_account`` broadcasted through the client invalidate the cache
+    automatically. Authority changes made elsewhere may be followed with :py:meth:`observe`:
+
+    .. code-block:: python
+
+        from viz.signers import AUTHORITY_OPS, SignerCache
+
+        viz.signer_cache = SignerCache(ttl=600)
+
+        # optionally, in a background thread
+        for op in Blockchain(blockchain_instance=viz).stream(list(AUTHORITY_OPS)):
+            viz.signer_cache.observe(op)
+
+    Cached keys are kept decrypted in memory even when the wallet gets locked, lock state is still checked before
+    using them.
+
+    :param float ttl: seconds to keep resolved keys
+    """
+
+    def __init__(self, ttl: float = 300) -> None:
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[str, str], _Entry] = {}
+
+    def get(self, account: str, permission: str) -> Optional[List[str]]:
+        """Return cached private keys, or None if not cached or expired."""
+        key = (account, permission)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires <= time.monotonic():
+                del self._entries[key]
+                return None
+            return entry.wifs
+
+    def set(self, account: str, permission: str, wifs: Iterable[str], accounts: Iterable[str] = ()) -> None:
+        """
+        Cache resolved private keys.
+
+        :param str account: signing account
+        :param str permission: signing permission
+        :param list wifs: private keys
+        :param list accounts: other accounts whose authorities were used (``account_auths``), their changes invalidate
+            the entry too
+        """
+        related = set(accounts)
+        related.add(account)
+        with self._lock:
+            self._entries[(account, permission)] = _Entry(list(wifs), related, time.monotonic() + self.ttl)
+
+    def invalidate(self, account: Optional[str] = None) -> None:
+        """
+        Drop cached keys.
+
+        :param str account: drop only entries depending on the account authorities, all entries by default
+        """
+        with self._lock:
+            if account is None:
+                self._entries.clear()
+                return
+            for key in [key for key, entry in self._entries.items() if account in entry.accounts]:
+                del self._entries[key]
+
+    def observe(self, op: Any) -> None:
+        """
+        Invalidate entries affected by an operation.
+
+        :param op: operation as yielded by :py:meth:`viz.blockchain.Blockchain.stream`, ``[name, data]`` pair from a
+            block, or operation object from :py:mod:`vizbase.operations`
+        """
+        if isinstance(op, dict) and "type" in op:
+            name, data = op["type"], op
+        elif isinstance(op, Operation):
+            name, data = op.name, op.op.json()
+        elif isinstance(op, GrapheneObject):
+            name, data = type(op).__name__.lower(), op.json()
+        else:
+            name, data = op
+            if isinstance(name, int):
+                name = OPS[name]
+
+        field = AUTHORITY_OPS.get(name)
+        if field is not None:
+            self.invalidate(data[field])
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from graphenebase.ecdsa import sign_message
+from graphenebase.types import Array, Signature
+
+from vizbase.account import PrivateKey
+from vizbase.signedtransactions import Signed_Transaction
+
+# public key -> private key, loaded once per worker process
+_worker_keys: Dict[str, str] = {}
+
+
+def _init_worker(wifs: List[str]) -> None:
+    _worker_keys.clear()
+    for wif in wifs:
+        _worker_keys[str(PrivateKey(wif).pubkey)] = wif
+
+
+def _sign_message(message: bytes, keys: List[str]) -> List[bytes]:
+    # keys are public keys of preloaded private keys, or private keys not known to the worker
+    return [sign_message(message, _worker_keys.get(key, key)) for key in keys]
+
+
+class SigningService:
+    """
+    Sign transactions in a pool of worker processes.
+
+    ECDSA signing is CPU-bound pure Python code in most setups, so signing many transactions in threads doesn't scale.
+    The service sends only transaction digests to the worker processes, which keep private keys loaded since start,
+    and puts returned signatures into the transactions.
+
+    When set as ``signing_service`` attribute of the client, it is used by
+    :py:meth:`viz.transactionbuilder.TransactionBuilder.sign`, so concurrent senders (e.g.
+    :py:class:`~viz.packer.OpPacker` workers) sign in parallel.
+
+    .. code-block:: python
+
+        from viz.signing import SigningService
+
+        with SigningService(wifs=[wif]) as service:
+            viz.signing_service = service
+            ...
+
+    :param list wifs: private keys to load into workers; other keys may be used too, but they are sent with every
+        request
+    :param int max_workers: number of worker processes, defaults to number of CPUs
+    """
+
+    def __init__(self, wifs: Iterable[str] = (), max_workers: Optional[int] = None) -> None:
+        wifs = list(wifs)
+        self._pubkeys = {wif: str(PrivateKey(wif).pubkey) for wif in wifs}
+        self._executor = ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(wifs,))
+
+    def submit(
+        self, tx: Signed_Transaction, wifs: Iterable[str], chain: Union[str, dict, None] = None
+    ) -> 'Future[Signed_Transaction]':
+        """
+        Start signing a transaction.
+
+        :param Signed_Transaction tx: transaction to sign, existing signatures are replaced
+        :param list wifs: private keys to sign with
+        :param chain: chain identifier or chain params dict, as for :py:meth:`Signed_Transaction.sign`
+        :return: future resolving to the same transaction object when it's signed
+        """
+        tx.deriveDigest(chain or tx.get_default_prefix())
+        keys: List[str] = []
+        for wif in wifs:
+            key = self._pubkeys.get(wif, wif)
+            if key not in keys:
+                keys.append(key)
+
+        result: 'Future[Signed_Transaction]' = Future()
+
+        def done(future: 'Future[List[bytes]]') -> None:
+            try:
+                tx.data["signatures"] = Array([Signature(signature) for signature in future.result()])
+            except Exception as error:
+                result.set_exception(error)
+            else:
+                result.set_result(tx)
+
+        self._executor.submit(_sign_message, tx.message, keys).add_done_callback(done)
+        return result
+
+    def sign(
+        self, tx: Signed_Transaction, wifs: Iterable[str], chain: Union[str, dict, None] = None
+    ) -> Signed_Transaction:
+        """Sign a transaction and wait for the result, see :py:meth:`submit`."""
+        return self.submit(tx, wifs, chain).result()
+
+    def sign_many(
+        self, items: Iterable[Tuple[Signed_Transaction, Iterable[str]]], chain: Union[str, dict, None] = None
+    ) -> List[Signed_Transaction]:
+        """
+        Sign many transactions in parallel.
+
+        :param items: ``(transaction, wifs)`` pairs
+        :param chain: chain identifier or chain params dict
+        """
+        futures = [self.submit(tx, wifs, chain) for tx, wifs in items]
+        return [future.result() for future in futures]
+
+    def close(self) -> None:
+        """Stop worker processes."""
+        self._executor.shutdown()
+
+    def __enter__(self) -> 'SigningService':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+import threading
+from typing import TYPE_CHECKING, Any, Iterable, List, Optional, Sequence
+
+from graphenebase.utils import formatTimeFromNow
+from graphenecommon.exceptions import MissingKeyError, WalletLocked
+
+from vizbase.serializers import OperationTemplate, TransactionEncoder
+
+from .instance import shared_blockchain_instance
+from .transactionbuilder import TransactionBuilder
+
+if TYPE_CHECKING:
+    from .viz import Client  # noqa: F401
+
+
+class TxTemplate:
+    """
+    Build many transactions with the same operation shape.
+
+    Bots sending the same operation over and over (awards, payouts) vary only a few fields of it. The template
+    serializes the constant fields once (see :py:class:`vizbase.serializers.OperationTemplate`), resolves signing keys
+    once, and for every transaction encodes only the variable fields before signing. Transactions are returned as
+    signed :py:class:`~viz.transactionbuilder.TransactionBuilder` instances, ready for ``broadcast()``.
+
+    .. code-block:: python
+
+        from viz.templates import TxTemplate
+
+        template = TxTemplate(
+            ['award', {'initiator': 'alice', 'energy': 100, 'memo': 'thanks', 'beneficiaries': []}],
+            variable=['receiver'],
+            account='alice',
+            permission='regular',
+            blockchain_instance=viz,
+        )
+        for receiver in receivers:
+            template.broadcast(receiver=receiver)
+
+    Variable fields are given in JSON form, e.g. amounts as ``'1.000 VIZ'`` strings; memos are not encrypted.
+    Transactions are signed in the calling thread, ``signing_service`` of the client is not used.
+
+    :param op: ``[name, data]`` pair, ``data`` holds the constant fields
+    :param list variable: names of fields set per transaction
+    :param str account: signing account
+    :param str permission: signing permission
+    :param viz.viz.Client blockchain_instance: Client instance
+    """
+
+    def __init__(
+        self,
+        op: Sequence,
+        variable: Iterable[str],
+        account: str,
+        permission: str = "active",
+        blockchain_instance: Optional['Client'] = None,
+    ) -> None:
+        self.blockchain_instance = blockchain_instance or shared_blockchain_instance()
+        self.chain_params = self.blockchain_instance.rpc.chain_params
+        self.template = OperationTemplate(op, variable, prefix=self.chain_params["prefix"])
+        self.account = account
+        self.permission = permission
+        self._wifs: Optional[List[str]] = None
+        # per-thread TransactionEncoder
+        self._local = threading.local()
+
+    def _encoder(self) -> TransactionEncoder:
+        encoder = getattr(self._local, "encoder", None)
+        if encoder is None:
+            encoder = self._local.encoder = TransactionEncoder(
+                self.chain_params["chain_id"], self.chain_params["prefix"]
+            )
+        return encoder
+
+    def _signer_wifs(self) -> List[str]:
+        if self._wifs is None:
+            builder = TransactionBuilder(blockchain_instance=self.blockchain_instance)
+            builder.appendSigner(self.account, self.permission)
+            if not any(builder.wifs):
+                raise MissingKeyError
+            self._wifs = list(builder.wifs)
+        elif self.blockchain_instance.wallet.locked():
+            raise WalletLocked()
+        return self._wifs
+
+    def new_tx(self, **values: Any) -> TransactionBuilder:
+        """
+        Build and sign a transaction with one operation.
+
+        :param values: variable fields of the operation
+        :rtype: viz.transactionbuilder.TransactionBuilder
+        """
+        wifs = self._signer_wifs()
+        builder = TransactionBuilder(blockchain_instance=self.blockchain_instance)
+        ref_block_num, ref_block_prefix = builder.get_block_params()
+        op = self.template.op(values)
+        tx = {
+            "ref_block_num": ref_block_num,
+            "ref_block_prefix": ref_block_prefix,
+            "expiration": formatTimeFromNow(self.blockchain_instance.expiration or 30),
+            "operations": [self.template.serialize(values)],
+            "extensions": [],
+        }
+        signatures = self._encoder().sign(tx, wifs)
+        tx.update(operations=[op], signatures=signatures)
+
+        # load the transaction as constructed, graphenecommon rebuilds it only after ops are changed
+        dict.update(builder, tx)
+        builder.ops = [op]
+        builder.wifs = set(wifs)
+        builder._unset_require_reconstruction()
+        return builder
+
+    def broadcast(self, **values: Any) -> dict:
+        """Build, sign and broadcast a transaction, see :py:meth:`new_tx`."""
+        return self.new_tx(**values).broadcast()
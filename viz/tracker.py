@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+import logging
+import threading
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional
+
+from vizbase.signedtransactions import Signed_Transaction
+
+from .connections import ThreadConnections
+from .exceptions import TransactionExpired
+from .instance import shared_blockchain_instance
+
+if TYPE_CHECKING:
+    from .transactionbuilder import TransactionBuilder  # noqa: F401
+    from .viz import Client  # noqa: F401
+
+log = logging.getLogger(__name__)
+
+
+class Confirmation(NamedTuple):
+    """Inclusion of a transaction into a block."""
+
+    tx_id: str
+    block_num: int
+
+
+class Tracked:
+    """
+    Transaction followed by :py:class:`TxTracker`.
+
+    ``included`` future resolves to :py:class:`Confirmation` once the transaction is seen in a block, ``irreversible``
+    one when that block becomes irreversible. Both fail with :py:exc:`~viz.exceptions.TransactionExpired` if the
+    chain passes transaction expiration time without including it.
+    """
+
+    def __init__(self, tx_id: str, expiration: str) -> None:
+        self.tx_id = tx_id
+        self.expiration = expiration
+        self.block_num: Optional[int] = None
+        self.included: 'Future[Confirmation]' = Future()
+        self.irreversible: 'Future[Confirmation]' = Future()
+
+    def __repr__(self) -> str:
+        return "<Tracked {} block_num={}>".format(self.tx_id, self.block_num)
+
+
+class TxTracker:
+    """
+    Follow inclusion of many broadcasted transactions with a single block stream.
+
+    Waiting for every transaction with ``blocking=True`` holds a node connection per transaction until it's included.
+    The tracker instead reads each new block once and matches its transaction ids against all pending transactions, so
+    thousands of transactions in flight cost one stream.
+
+    .. code-block:: python
+
+        from viz.tracker import TxTracker
+
+        tracker = TxTracker(blockchain_instance=viz)
+        tracker.start()
+
+        tx = viz.new_tx()
+        tx.appendOps(op)
+        tx.appendSigner('alice', 'active')
+        tracked = tracker.broadcast(tx)
+        print(tracked.tx_id)
+        tracked.included.add_done_callback(lambda future: print('included', future.result().block_num))
+        tracked.irreversible.result(timeout=120)
+
+    ``included`` resolves when a transaction is seen in a head block, which still may be dropped by a fork; rely on
+    ``irreversible`` when it matters.
+
+    :param viz.viz.Client blockchain_instance: Client instance
+    :param bool own_connection: read blocks with a separate node connection (default), so the tracker thread doesn't
+        interfere with the client. If disabled, the client connection is used and the tracker must be driven with
+        :py:meth:`poll` from the thread using the client.
+    """
+
+    def __init__(self, blockchain_instance: Optional['Client'] = None, own_connection: bool = True) -> None:
+        self.blockchain_instance = blockchain_instance or shared_blockchain_instance()
+        self.block_interval = self.blockchain_instance.rpc.config["CHAIN_BLOCK_INTERVAL"]
+        self._connections = ThreadConnections(self.blockchain_instance, enabled=own_connection)
+
+        self._lock = threading.Lock()
+        # tx id -> transaction waiting for inclusion
+        self._pending: Dict[str, Tracked] = {}
+        # included transactions waiting for irreversibility
+        self._included: List[Tracked] = []
+        # next block to read
+        self._block_num: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._pending) + len(self._included)
+
+    def track(self, tx_id: str, expiration: str) -> Tracked:
+        """
+        Start following a transaction.
+
+        Transactions must be tracked before their blocks are read, so track them before broadcasting or right after
+        it. Reading starts from the head block at :py:meth:`start` or the first :py:meth:`poll`.
+
+        :param str tx_id: transaction id
+        :param str expiration: transaction expiration time, ``%Y-%m-%dT%H:%M:%S``
+        """
+        tracked = Tracked(tx_id, expiration)
+        with self._lock:
+            self._pending[tx_id] = tracked
+        return tracked
+
+    def broadcast(self, tx: 'TransactionBuilder') -> Tracked:
+        """
+        Sign if needed and broadcast a transaction without waiting for inclusion.
+
+        :param viz.transactionbuilder.TransactionBuilder tx: transaction to send
+        :return: :py:class:`Tracked` with transaction id known immediately
+        """
+        if not tx._is_signed():
+            tx.sign()
+        data = tx.json()
+        tracked = self.track(tx.id, data["expiration"])
+        try:
+            self.blockchain_instance.rpc.broadcast_transaction(data, api="network_broadcast")
+        except Exception:
+            with self._lock:
+                self._pending.pop(tracked.tx_id, None)
+            raise
+        tx.clear()
+        return tracked
+
+    def _block_tx_ids(self, block: dict) -> List[str]:
+        if "transaction_ids" in block:
+            return block["transaction_ids"]
+        return [Signed_Transaction(**tx).id for tx in block["transactions"]]
+
+    def feed_block(self, block_num: int, block: dict) -> None:
+        """
+        Match transactions of a block.
+
+        :param int block_num: block number
+        :param dict block: block as returned by ``get_block``
+        """
+        resolved = []
+        with self._lock:
+            for tx_id in self._block_tx_ids(block):
+                tracked = self._pending.pop(tx_id, None)
+                if tracked is not None:
+                    tracked.block_num = block_num
+                    self._included.append(tracked)
+                    resolved.append(tracked)
+            # chain never includes a transaction after its expiration, ISO timestamps compare as strings
+            expired = [tracked for tracked in self._pending.values() if tracked.expiration < block["timestamp"]]
+            for tracked in expired:
+                del self._pending[tracked.tx_id]
+
+        # run callbacks outside of the lock
+        for tracked in resolved:
+            # already resolved if the transaction was re-included after a fork
+            if not tracked.included.done():
+                tracked.included.set_result(Confirmation(tracked.tx_id, block_num))
+        for tracked in expired:
+            error = TransactionExpired("Transaction {} expired at {}".format(tracked.tx_id, tracked.expiration))
+            if not tracked.included.done():
+                tracked.included.set_exception(error)
+            tracked.irreversible.set_exception(error)
+
+    def feed_irreversible(self, block_num: int, block: dict) -> None:
+        """
+        Resolve transactions included into a block which became irreversible.
+
+        Transactions missing from the irreversible block were seen in a block dropped by a fork, they are tracked for
+        inclusion again.
+
+        :param int block_num: block number
+        :param dict block: irreversible block as returned by ``get_block``
+        """
+        tx_ids = set(self._block_tx_ids(block))
+        done = []
+        with self._lock:
+            included = []
+            for tracked in self._included:
+                if tracked.block_num != block_num:
+                    included.append(tracked)
+                elif tracked.tx_id in tx_ids:
+                    done.append(tracked)
+                else:
+                    log.warning("Transaction %s was dropped from block %s by a fork", tracked.tx_id, block_num)
+                    tracked.block_num = None
+                    self._pending[tracked.tx_id] = tracked
+                    # blocks read after this one may be from the dropped fork too
+                    if self._block_num is not None:
+                        self._block_num = min(self._block_num, block_num + 1)
+            self._included = included
+        for tracked in done:
+            tracked.irreversible.set_result(Confirmation(tracked.tx_id, block_num))
+
+    def poll(self) -> None:
+        """Read blocks produced since the previous call and resolve tracked transactions."""
+        rpc = self._connections.get()
+        props = rpc.get_dynamic_global_properties()
+        head = props["head_block_number"]
+        if self._block_num is None:
+            self._block_num = head
+
+        # check irreversible blocks first, transactions dropped by a fork are looked up again in newer blocks
+        last_irreversible = props["last_irreversible_block_num"]
+        with self._lock:
+            block_nums = sorted(
+                {tracked.block_num for tracked in self._included if tracked.block_num <= last_irreversible}
+            )
+        for block_num in block_nums:
+            self.feed_irreversible(block_num, rpc.get_block(block_num))
+
+        while self._block_num <= head:
+            block = rpc.get_block(self._block_num)
+            if block is None:
+                # head block may be not available yet
+                break
+            self.feed_block(self._block_num, block)
+            self._block_num += 1
+
+    def _run(self, interval: float) -> None:
+        while not self._stop.wait(interval):
+            try:
+                self.poll()
+            except Exception:
+                log.exception("Failed to read blocks")
+
+    def start(self, interval: Optional[float] = None) -> None:
+        """
+        Read blocks in a background daemon thread.
+
+        :param float interval: poll interval in seconds, defaults to block interval
+        """
+        if self._thread is not None:
+            return
+        if self._block_num is None:
+            # transactions tracked from now on can't be in earlier blocks
+            self._block_num = self.blockchain_instance.rpc.get_dynamic_global_properties()["head_block_number"]
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(interval or self.block_interval,), daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop background reading and close the node connection."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self._connections.close()
@@ -5,13 +5,14 @@ from binascii import unhexlify
 
 from graphenebase.utils import formatTimeFromNow
 from graphenecommon.asset import Asset
-from graphenecommon.exceptions import WalletLocked
+from graphenecommon.exceptions import MissingKeyError, WalletLocked
 from graphenecommon.transactionbuilder import ProposalBuilder as GrapheneProposalBuilder
 from graphenecommon.transactionbuilder import TransactionBuilder as GrapheneTransactionBuilder
 
 from vizbase import operations
 from vizbase.account import PrivateKey, PublicKey
 from vizbase.objects import Operation
+from vizbase.serializers import transaction_id
 from vizbase.signedtransactions import Signed_Transaction
 
 from .account import Account
@@ -105,7 +106,10 @@ class TransactionBuilder(GrapheneTransactionBuilder):
 
     def appendSigner(self, accounts, permission):  # noqa: N802
         """Try to obtain the wif key from the wallet by telling which account and permission is supposed to sign the
-        transaction."""
+        transaction.
+
+        Resolved keys are reused if :py:class:`~viz.signers.SignerCache` is set as ``signer_cache`` attribute of the
+        client."""
         assert permission in self.permission_types, "Invalid permission"
 
         if self.blockchain.wallet.locked():
@@ -113,6 +117,8 @@ class TransactionBuilder(GrapheneTransactionBuilder):
         if not isinstance(accounts, (list, tuple, set)):
             accounts = [accounts]
 
+        cache = getattr(self.blockchain, "signer_cache", None)
+
         for account in accounts:
             # Now let's actually deal with the accounts
             if account not in self.signing_accounts:
@@ -121,28 +127,115 @@ class TransactionBuilder(GrapheneTransactionBuilder):
                     self.appendWif(self.blockchain.wallet.getPrivateKeyForPublicKey(str(account)))
                 # ... or should we rather obtain the keys from an account name
                 else:
-                    accountObj = self.account_class(account, blockchain_instance=self.blockchain)  # noqa: N806
-                    # TODO: method overriden because of _authority
-                    field = "{}_authority".format(permission)
-                    required_treshold = accountObj[field]["weight_threshold"]
-                    keys = self._fetchkeys(accountObj, field, required_treshold=required_treshold)
-                    # If we couldn't find an active key, let's try overwrite it
-                    # with an owner key
-                    if not keys and permission != "active":
-                        keys.extend(
-                            self._fetchkeys(accountObj, "master_authority", required_treshold=required_treshold)
-                        )
-                    for x in keys:  # noqa: VNE001
-                        self.appendWif(x[0])
+                    wifs = cache.get(account, permission) if cache is not None else None
+                    if wifs is None:
+                        resolved_from = len(self.signing_accounts)
+                        accountObj = self.account_class(account, blockchain_instance=self.blockchain)  # noqa: N806
+                        # TODO: method overriden because of _authority
+                        field = "{}_authority".format(permission)
+                        required_treshold = accountObj[field]["weight_threshold"]
+                        keys = self._fetchkeys(accountObj, field, required_treshold=required_treshold)
+                        # If we couldn't find an active key, let's try overwrite it
+                        # with an owner key
+                        if not keys and permission != "active":
+                            keys.extend(
+                                self._fetchkeys(accountObj, "master_authority", required_treshold=required_treshold)
+                            )
+                        wifs = [x[0] for x in keys]
+                        if cache is not None and wifs:
+                            # _fetchkeys() records accounts which provided the keys
+                            accounts_used = [
+                                item["name"] for item in self.signing_accounts[resolved_from:] if isinstance(item, dict)
+                            ]
+                            cache.set(account, permission, wifs, accounts_used)
+                    for wif in wifs:
+                        self.appendWif(wif)
 
                 self.signing_accounts.append(account)
 
+    def sign(self):
+        """
+        Sign the transaction with the appended keys.
+
+        If :py:class:`~viz.signing.SigningService` is set as ``signing_service`` attribute of the client, signing is
+        done by its worker processes.
+        """
+        service = getattr(self.blockchain, "signing_service", None)
+        if service is None or self.blockchain.proposer:
+            return super().sign()
+
+        self.constructTx()
+        if "operations" not in self or not self["operations"]:
+            return
+
+        self.operations.default_prefix = self.blockchain.rpc.chain_params["prefix"]
+        if not any(self.wifs):
+            raise MissingKeyError
+
+        service.sign(self.tx, self.wifs, chain=self.blockchain.rpc.chain_params)
+        self["signatures"].extend(self.tx.json().get("signatures"))
+        return self.tx
+
+    @property
+    def id(self):  # noqa: A003
+        """Transaction id, computed locally before broadcast. Signing doesn't change it."""
+        if self._is_require_reconstruction() or not self._is_constructed():
+            self.constructTx()
+        elif getattr(self, "tx", None) is None:
+            # loaded from a transaction dict
+            try:
+                return transaction_id(self.json(), self.blockchain.rpc.chain_params["prefix"])
+            except ValueError:
+                # operation not supported by the compiled serializers
+                return self.signed_transaction_class(**self.json()).id
+        return self.tx.id
+
+    def broadcast(self):
+        """
+        Broadcast the transaction.
+
+        If :py:class:`~viz.retry.RetryPolicy` is set as ``retry_policy`` attribute of the client, non-blocking
+        broadcasts failed with connection errors are retried. If :py:class:`~viz.signers.SignerCache` is set as
+        ``signer_cache`` attribute of the client, keys of accounts changing their authorities are dropped from it.
+        """
+        ops = list(self.ops)
+        policy = getattr(self.blockchain, "retry_policy", None)
+        if policy is None or self.blockchain.nobroadcast or self.blockchain.blocking:
+            result = super().broadcast()
+        else:
+            result = self._broadcast_with_retry(policy)
+        cache = getattr(self.blockchain, "signer_cache", None)
+        if cache is not None:
+            for op in ops:
+                cache.observe(op)
+        return result
+
+    def _broadcast_with_retry(self, policy):
+        if not self._is_signed():
+            self.sign()
+
+        # Cannot broadcast an empty transaction
+        if "operations" not in self or not self["operations"]:
+            return
+
+        ret = self.json()
+        try:
+            policy.broadcast(self.blockchain.rpc, ret, self.id)
+        finally:
+            self.clear()
+        return ret
+
     def get_block_params(self):
         """
         Auxiliary method to obtain ``ref_block_num`` and ``ref_block_prefix``.
 
-        Requires a websocket connection to a witness node!
+        Requires a websocket connection to a witness node! If :py:class:`~viz.refblock.RefBlockProvider` is set as
+        ``ref_block_provider`` attribute of the client, cached params are used instead of an RPC call.
         """
+        provider = getattr(self.blockchain, "ref_block_provider", None)
+        if provider is not None:
+            return provider.get()
+
         ws = self.blockchain.rpc
         props = ws.get_dynamic_global_properties()
         ref_block_num = props["head_block_number"] & 0xFFFF
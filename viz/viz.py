@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 import logging
 from collections import defaultdict
-from typing import Any, DefaultDict, Dict, List, Optional, Union
+from typing import TYPE_CHECKING, Any, DefaultDict, Dict, Iterable, List, Optional, Sequence, Tuple, Union
 
 from graphenecommon.chain import AbstractGrapheneChain
 from graphenecommon.exceptions import KeyAlreadyInStoreException, AccountDoesNotExistsException
@@ -9,15 +9,25 @@ from graphenecommon.exceptions import KeyAlreadyInStoreException, AccountDoesNot
 from vizapi.noderpc import NodeRPC
 from vizbase import operations
 from vizbase.account import PublicKey
+from vizbase.backends import select_backend
 from vizbase.chains import PRECISIONS
 
 from .account import Account
 from .amount import Amount
 from .converter import Converter
 from .exceptions import AccountExistsException
+from .keygen import DerivedKey, derive_password_keys
 from .transactionbuilder import ProposalBuilder, TransactionBuilder
 from .wallet import Wallet
 
+if TYPE_CHECKING:
+    from vizbase.memo import SharedSecretCache  # noqa: F401
+
+    from .refblock import RefBlockProvider  # noqa: F401
+    from .retry import RetryPolicy  # noqa: F401
+    from .signers import SignerCache  # noqa: F401
+    from .signing import SigningService  # noqa: F401
+
 # from .utils import formatTime
 
 log = logging.getLogger(__name__)
@@ -73,8 +83,27 @@ class Client(AbstractGrapheneChain):
         from viz import Client
         viz = Client()
         print(viz.info())
+
+    To avoid fetching reference block for every transaction, set ``ref_block_provider`` attribute to
+    :py:class:`~viz.refblock.RefBlockProvider` instance. To sign transactions in worker processes, set
+    ``signing_service`` attribute to :py:class:`~viz.signing.SigningService` instance. To reuse signing keys resolved
+    for accounts, set ``signer_cache`` attribute to :py:class:`~viz.signers.SignerCache` instance. To retry broadcasts
+    failed with connection errors safely, set ``retry_policy`` attribute to :py:class:`~viz.retry.RetryPolicy`
+    instance. To reuse memo shared secrets, set ``memo_cache`` attribute to
+    :py:class:`~vizbase.memo.SharedSecretCache` instance.
     """
 
+    ref_block_provider: Optional['RefBlockProvider'] = None
+    signing_service: Optional['SigningService'] = None
+    signer_cache: Optional['SignerCache'] = None
+    retry_policy: Optional['RetryPolicy'] = None
+    memo_cache: Optional['SharedSecretCache'] = None
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        # choose working ECDSA backend once per process, see vizbase.backends
+        select_backend()
+        super().__init__(*args, **kwargs)
+
     def define_classes(self):
         from .blockchainobject import BlockchainObject
 
@@ -579,9 +608,11 @@ class Client(AbstractGrapheneChain):
                 passkey = PasswordKey(account_name, password, role=role)
                 keys['pubkeys'][role] = passkey.get_public_key()
                 keys['privkeys'][role] = passkey.get_private_key()
-                # store private keys
-                if store_keys:
-                    self._store_keys(keys['privkeys'][role])
+            # store private keys
+            if store_keys:
+                self.wallet.add_private_keys(
+                    {format(keys['pubkeys'][role], self.prefix): str(keys['privkeys'][role]) for role in key_roles}
+                )
         elif master_key and regular_key and active_key and memo_key:
             keys['pubkeys']['regular'] = PublicKey(regular_key, prefix=self.prefix)
             keys['pubkeys']['active'] = PublicKey(active_key, prefix=self.prefix)
@@ -736,6 +767,29 @@ class Client(AbstractGrapheneChain):
 
         return self.finalizeOp(op, delegator, "active")
 
+    def import_password_keys(
+        self,
+        accounts: Iterable[Tuple[str, str]],
+        roles: Sequence[str] = ('master', 'active', 'regular', 'memo'),
+        max_workers: Optional[int] = None,
+    ) -> List[DerivedKey]:
+        """
+        Derive keys of many accounts from their passwords and store them in the wallet.
+
+        Keys are derived and encrypted in worker processes and written to the key store at once, keys already in the
+        store are skipped. See :py:func:`viz.keygen.derive_password_keys` and
+        :py:meth:`viz.wallet.Wallet.add_private_keys`.
+
+        :param accounts: ``(account, password)`` pairs
+        :param list roles: roles to derive keys for
+        :param int max_workers: number of worker processes, defaults to number of CPUs
+        :return: derived keys
+        """
+        items = [(account, password, role) for account, password in accounts for role in roles]
+        keys = derive_password_keys(items, prefix=self.prefix, max_workers=max_workers)
+        self.wallet.add_private_keys({key.pubkey: key.wif for key in keys}, max_workers=max_workers)
+        return keys
+
     def _store_keys(self, *args):
         """Store private keys to local storage."""
         for key in args:
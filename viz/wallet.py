@@ -1,4 +1,10 @@
 # -*- coding: utf-8 -*-
+import logging
+import sqlite3
+import threading
+import time
+from typing import List, Mapping, Optional
+
 from graphenecommon.exceptions import (
     InvalidWifError,
     KeyAlreadyInStoreException,
@@ -9,15 +15,217 @@ from graphenecommon.exceptions import (
     WalletLocked,
 )
 from graphenecommon.wallet import Wallet as GrapheneWallet
+from graphenestorage.sqlite import SQLiteStore
 
 from vizbase.account import PrivateKey
 
 from .instance import BlockchainInstance
+from .keygen import encrypt_keys
+from .keyring import Keyring
+
+log = logging.getLogger(__name__)
 
 
 @BlockchainInstance.inject
 class Wallet(GrapheneWallet):
+    """
+    Wallet keeping private keys decrypted in a :py:class:`~viz.keyring.Keyring` while unlocked.
+
+    With an encrypted key store every lookup queries the database and decrypts the key. The wallet decrypts all keys
+    once when unlocked (or on the first lookup), and serves lookups of :py:meth:`getPrivateKeyForPublicKey`,
+    :py:meth:`find_private_key` and :py:meth:`find_account_keys` from memory. Keys added or removed through the wallet
+    update the keyring, it's wiped on :py:meth:`lock`. Keys added to the key store by other processes become visible
+    after the wallet is unlocked again.
+
+    If ``auto_lock`` is set, the wallet is locked after that many seconds without key lookups.
+    """
+
+    #: seconds without key lookups to lock the wallet after, None to keep it unlocked
+    auto_lock: Optional[float] = None
+
     def define_classes(self):
         # identical to those in viz.py!
         self.default_key_store_app_name = "viz"
         self.privatekey_class = PrivateKey
+
+    def __init__(self, *args, **kwargs):
+        self._keyring: Optional[Keyring] = None
+        self._deadline: Optional[float] = None
+        self._timer: Optional[threading.Timer] = None
+        super().__init__(*args, **kwargs)
+
+    @property
+    def keyring(self) -> Optional[Keyring]:
+        """Keys of the unlocked wallet, None if the wallet is locked."""
+        keyring = self._keyring
+        if keyring is None:
+            return None if self.locked() else self._load_keyring()
+        if self._deadline is not None:
+            if time.monotonic() >= self._deadline:
+                self.lock()
+                return None
+            self._deadline = time.monotonic() + self.auto_lock if self.auto_lock else None
+        return keyring
+
+    def _load_keyring(self) -> Keyring:
+        keyring = Keyring({pub: self.store.getPrivateKeyForPublicKey(pub) for pub in self.store.getPublicKeys()})
+        self._keyring = keyring
+        self._start_timer()
+        return keyring
+
+    def _start_timer(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self.auto_lock or not self.is_encrypted():
+            self._deadline = None
+            return
+        self._deadline = time.monotonic() + self.auto_lock
+        self._timer = threading.Timer(self.auto_lock, self._check_timeout)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _check_timeout(self) -> None:
+        deadline = self._deadline
+        if deadline is None:
+            return
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            log.debug("Locking the wallet after %s seconds of inactivity", self.auto_lock)
+            self.lock()
+        else:
+            self._timer = threading.Timer(remaining, self._check_timeout)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def unlock(self, pwd):
+        """Unlock the wallet database and decrypt all keys into the keyring."""
+        result = super().unlock(pwd)
+        self._drop_keyring()
+        if not self.locked():
+            self._load_keyring()
+        return result
+
+    def lock(self):
+        """Lock the wallet database and wipe the keyring."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._deadline = None
+        self._drop_keyring()
+        return super().lock()
+
+    def _drop_keyring(self) -> None:
+        keyring, self._keyring = self._keyring, None
+        if keyring is not None:
+            keyring.wipe()
+
+    def setKeys(self, loadkeys):  # noqa: N802
+        self._drop_keyring()
+        super().setKeys(loadkeys)
+
+    def addPrivateKey(self, wif):  # noqa: N802
+        """Add a private key to the wallet database."""
+        super().addPrivateKey(wif)
+        if self._keyring is not None:
+            self._keyring.add(self.publickey_from_wif(wif), wif)
+
+    def add_private_keys(self, keys: Mapping[str, str], max_workers: Optional[int] = None) -> List[str]:
+        """
+        Add many private keys to the wallet database at once.
+
+        Keys already in the store are skipped. For an encrypted store, keys are encrypted in worker processes (see
+        :py:func:`viz.keygen.encrypt_keys`), and an SQLite store gets all keys in a single transaction.
+
+        :param dict keys: public key -> private key, e.g. from :py:func:`viz.keygen.derive_password_keys`
+        :param int max_workers: number of worker processes to encrypt keys in, ``1`` encrypts in the calling process
+        :return: public keys added
+        :raises WalletLocked: if the encrypted wallet is locked
+        """
+        existing = set(self.store.getPublicKeys())
+        new = {str(pub): str(wif) for pub, wif in keys.items() if str(pub) not in existing}
+        if not new:
+            return []
+
+        values = list(new.values())
+        if self.is_encrypted():
+            if self.locked():
+                raise WalletLocked()
+            values = encrypt_keys(values, self.store.masterkey, max_workers=max_workers)
+
+        rows = list(zip(new, values))
+        if isinstance(self.store, SQLiteStore):
+            query = "INSERT INTO {} ({}, {}) VALUES (?, ?)".format(
+                self.store.__tablename__, self.store.__key__, self.store.__value__
+            )
+            connection = sqlite3.connect(self.store.sqlite_file)
+            try:
+                with connection:
+                    connection.executemany(query, rows)
+            finally:
+                connection.close()
+        else:
+            for pub, value in rows:
+                self.store[pub] = value
+
+        if self._keyring is not None:
+            for pub, wif in new.items():
+                self._keyring.add(pub, wif)
+        return list(new)
+
+    def find_private_key(self, pub) -> Optional[str]:
+        """
+        Return private key for the public key, or None if the wallet doesn't have it.
+
+        Unlike :py:meth:`getPrivateKeyForPublicKey`, doesn't raise on missing keys.
+
+        :param str pub: public key
+        :raises WalletLocked: if the wallet is locked
+        """
+        keyring = self.keyring
+        if keyring is None:
+            raise WalletLocked()
+        return keyring.get(pub)
+
+    def find_account_keys(self, account: str) -> List[str]:
+        """
+        Return private keys the wallet has for the account's authorities.
+
+        Accounts of all keys are looked up with one ``get_key_references`` call on first use.
+
+        :param str account: account name
+        :raises WalletLocked: if the wallet is locked
+        """
+        keyring = self.keyring
+        if keyring is None:
+            raise WalletLocked()
+        if not keyring.has_accounts:
+            pubkeys = keyring.pubkeys()
+            references = self.rpc.get_key_references(pubkeys) if pubkeys else []
+            keyring.set_accounts(dict(zip(pubkeys, references)))
+        return keyring.account_keys(account)
+
+    def getPrivateKeyForPublicKey(self, pub):  # noqa: N802
+        """
+        Obtain the private key for a given public key.
+
+        :param str pub: Public Key
+        """
+        keyring = self.keyring
+        if keyring is None:
+            return super().getPrivateKeyForPublicKey(pub)
+        wif = keyring.get(pub)
+        if not wif:
+            raise KeyNotFound
+        return wif
+
+    def removePrivateKeyFromPublicKey(self, pub):  # noqa: N802
+        """Remove a key from the wallet database."""
+        super().removePrivateKeyFromPublicKey(pub)
+        if self._keyring is not None:
+            self._keyring.remove(pub)
+
+    def removeAccount(self, account):  # noqa: N802
+        """Remove all keys associated with a given account."""
+        super().removeAccount(account)
+        self._drop_keyring()
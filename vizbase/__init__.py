@@ -1,5 +1,7 @@
 __all__ = [
     "account",
+    "amount",
+    "backends",
     "bip38",
     "chains",
     "memo",
@@ -7,6 +9,7 @@ __all__ = [
     "objecttypes",
     "operationids",
     "operations",
+    "serializers",
     "signedtransactions",
     "transactions",
 ]
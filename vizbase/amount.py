@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""
+Parsing and formatting of amount strings like ``1.000 VIZ``.
+
+Shared by :py:class:`viz.amount.Amount`, :py:class:`vizbase.objects.Amount` and :py:mod:`vizbase.serializers`, so an
+amount given to a client method is parsed once into integer units of the asset. Results are cached, since fees and
+award amounts recur constantly.
+"""
+import sys
+from decimal import ROUND_HALF_EVEN, Decimal, InvalidOperation
+from functools import lru_cache
+from typing import NamedTuple
+
+from .chains import PRECISIONS
+
+#: precision of assets missing in :py:data:`vizbase.chains.PRECISIONS`
+DEFAULT_PRECISION = 6
+
+
+class ParsedAmount(NamedTuple):
+    """Amount string parsed by :py:func:`parse_amount`."""
+
+    units: int
+    asset: str
+    precision: int
+    #: non-negative amount string in chain format, same as :py:func:`format_units` would return
+    canonical: bool
+
+
+_new_parsed = tuple.__new__
+
+
+def _parse_units(integer: str, fraction: str, precision: int) -> int:
+    try:
+        units = int(integer.lstrip("+-") or "0") * 10 ** precision + int(fraction.ljust(precision, "0") or "0")
+    except ValueError:
+        # exponent notation
+        return _round_decimal(integer + "." + fraction if fraction else integer, precision)
+    return -units if integer.startswith("-") else units
+
+
+def _round_decimal(value: str, precision: int) -> int:
+    try:
+        return int(Decimal(value).scaleb(precision).to_integral_value(ROUND_HALF_EVEN))
+    except InvalidOperation:
+        raise ValueError("Invalid amount: {!r}".format(value))
+
+
+@lru_cache(maxsize=4096)
+def parse_amount(amount_string: str) -> ParsedAmount:
+    """
+    Parse amount string into integer units of the asset, e.g. ``1.000 VIZ`` into ``1000``.
+
+    The decimal string is parsed without float arithmetic. Strings with more decimal places than the asset has (e.g.
+    formatted from float) are rounded half to even.
+
+    :param str amount_string: amount and asset separated by a space
+    :raises ValueError: if the amount is not a number
+    """
+    value, asset = amount_string.split(" ")
+    asset = sys.intern(asset)
+    precision = PRECISIONS.get(asset, DEFAULT_PRECISION)
+    integer, _, fraction = value.partition(".")
+    if len(fraction) == precision and integer.isdigit() and (integer[0] != "0" or integer == "0"):
+        # the common case, skip NamedTuple.__new__ written in Python
+        return _new_parsed(ParsedAmount, (int(integer + fraction), asset, precision, True))
+    if len(fraction) > precision:
+        return ParsedAmount(_round_decimal(value, precision), asset, precision, False)
+    return ParsedAmount(_parse_units(integer, fraction, precision), asset, precision, False)
+
+
+def format_units(units: int, asset: str, precision: int) -> str:
+    """Format integer units of the asset as amount string like ``1.000 VIZ``."""
+    integer, fraction = divmod(abs(units), 10 ** precision)
+    return "%s%d.%0*d %s" % ("-" if units < 0 else "", integer, precision, fraction, asset)
@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+"""
+Selection of the secp256k1 implementation used for signing.
+
+Signing and verification are done by :py:mod:`graphenebase.ecdsa`, which picks a backend at import time: the
+``secp256k1`` binding to libsecp256k1 when installed, otherwise ``cryptography``, otherwise the pure Python ``ecdsa``
+package. The fastest backend is not always a working one (e.g. the ``cryptography`` path breaks with some ``ecdsa``
+versions), so this module allows to inspect, check and switch the backend at runtime.
+
+.. code-block:: python
+
+    from vizbase import backends
+
+    backends.available_backends()  # ['cryptography', 'ecdsa']
+    backends.select_backend()  # fastest backend producing valid signatures
+    backends.set_backend('ecdsa')
+"""
+import importlib
+import logging
+from binascii import hexlify
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import graphenebase.ecdsa as gphecdsa
+from graphenebase.memo import get_shared_secret as _get_shared_secret_pure
+
+from .account import PrivateKey, PublicKey
+from .exceptions import BackendError
+
+log = logging.getLogger(__name__)
+
+#: supported backends, fastest first
+BACKENDS = ("secp256k1", "cryptography", "ecdsa")
+
+# backend -> module which must be importable
+_MODULES = {
+    "secp256k1": "secp256k1",
+    "cryptography": "cryptography.hazmat.primitives.asymmetric.ec",
+    "ecdsa": "ecdsa",
+}
+
+# fixed key and message for self-test
+_TEST_WIF = "5JabcrvaLnBTCkCVFX5r4rmeGGfuJuVp4NAKRNLTey6pxhRQmf4"
+_TEST_PEER = "5Hw9YPABaFxa2LooiANLrhUK5TPryy8f7v9Y1rk923PuYqbYdfC"
+_TEST_MESSAGE = b"viz backend self-test"
+# signature attempts, each one uses a different nonce
+_TEST_ROUNDS = 4
+
+# backend -> self-test error, None if passed
+_checked: Dict[str, Optional[Exception]] = {}
+# backend chosen by select_backend() or set_backend()
+_selected: Optional[str] = None
+
+
+def _import(name: str):
+    if name not in _MODULES:
+        raise BackendError("Unknown ECDSA backend {}, expected one of {}".format(name, ", ".join(BACKENDS)))
+    try:
+        module = importlib.import_module(_MODULES[name])
+    except ImportError as error:
+        raise BackendError("ECDSA backend {} is not installed: {}".format(name, error))
+    # graphenebase imports cryptography primitives only once, at its own import
+    if name == "cryptography" and not gphecdsa.CRYPTOGRAPHY_AVAILABLE:
+        raise BackendError("ECDSA backend cryptography was installed after graphenebase import")
+    return module
+
+
+def available_backends() -> List[str]:
+    """Return installed backends, fastest first."""
+    result = []
+    for name in BACKENDS:
+        try:
+            _import(name)
+        except BackendError:
+            continue
+        result.append(name)
+    return result
+
+
+def get_backend() -> str:
+    """Return name of the backend currently used by :py:mod:`graphenebase.ecdsa`."""
+    return gphecdsa.SECP256K1_MODULE
+
+
+def _activate(name: str) -> None:
+    module = _import(name)
+    if name == "secp256k1":
+        # graphenebase keeps the module in its namespace only if it was installed before graphenebase import
+        gphecdsa.secp256k1 = module
+    gphecdsa.SECP256K1_MODULE = name
+
+
+@contextmanager
+def use_backend(name: str) -> Iterator[None]:
+    """
+    Temporarily switch the backend, without self-test.
+
+    :param str name: backend name, see :py:data:`BACKENDS`
+    """
+    previous = get_backend()
+    _activate(name)
+    try:
+        yield
+    finally:
+        gphecdsa.SECP256K1_MODULE = previous
+
+
+def self_test(name: Optional[str] = None) -> None:
+    """
+    Check that a backend produces signatures accepted by the chain.
+
+    Signatures are checked to be canonical, compact with compressed key recovery flag, and recoverable to the signing
+    key by both the backend itself and the pure Python implementation. Shared secret derivation is compared to the
+    pure Python one as well.
+
+    :param str name: backend to check, defaults to the current one
+    :raises BackendError: if the backend is broken
+    """
+    name = name or get_backend()
+    key = PrivateKey(_TEST_WIF)
+    pubkey = bytes(key.pubkey)
+    peer = PrivateKey(_TEST_PEER)
+    try:
+        with use_backend(name):
+            signatures = [gphecdsa.sign_message(_TEST_MESSAGE + bytes([i]), _TEST_WIF) for i in range(_TEST_ROUNDS)]
+            recovered = [
+                gphecdsa.verify_message(_TEST_MESSAGE + bytes([i]), signatures[i]) for i in range(_TEST_ROUNDS)
+            ]
+            shared_secret = get_shared_secret(key, peer.pubkey)
+        with use_backend("ecdsa"):
+            recovered += [
+                gphecdsa.verify_message(_TEST_MESSAGE + bytes([i]), signatures[i]) for i in range(_TEST_ROUNDS)
+            ]
+    except BackendError:
+        raise
+    except Exception as error:
+        raise BackendError("ECDSA backend {} failed: {!r}".format(name, error))
+
+    for signature in signatures:
+        if len(signature) != 65 or not 31 <= signature[0] <= 34:
+            raise BackendError("ECDSA backend {} produced malformed signature".format(name))
+        if not gphecdsa._is_canonical(signature[1:]):
+            raise BackendError("ECDSA backend {} produced non-canonical signature".format(name))
+    if any(bytes(item) != pubkey for item in recovered):
+        raise BackendError("ECDSA backend {} produced signature of a wrong key".format(name))
+    if shared_secret != _get_shared_secret_pure(key, peer.pubkey):
+        raise BackendError("ECDSA backend {} derived wrong shared secret".format(name))
+
+
+def _check(name: str) -> Optional[Exception]:
+    if name not in _checked:
+        try:
+            self_test(name)
+            _checked[name] = None
+        except BackendError as error:
+            _checked[name] = error
+    return _checked[name]
+
+
+def set_backend(name: str, check: bool = True) -> None:
+    """
+    Switch the backend used for signing.
+
+    :param str name: backend name, see :py:data:`BACKENDS`
+    :param bool check: run :py:func:`self_test` first, results are cached per process
+    :raises BackendError: if the backend is not installed or fails the self-test
+    """
+    global _selected
+    _import(name)
+    error = _check(name) if check else None
+    if error is not None:
+        raise error
+    _activate(name)
+    _selected = name
+
+
+def select_backend(candidates: Iterable[str] = BACKENDS) -> str:
+    """
+    Switch to the fastest installed backend which passes the self-test.
+
+    The choice is made once per process, subsequent calls (and calls after :py:func:`set_backend`) return the backend
+    already selected. It is called by :py:class:`viz.viz.Client` on creation.
+
+    :param candidates: backends to consider, in order of preference
+    :return: name of the selected backend
+    :raises BackendError: if no backend works
+    """
+    if _selected is not None:
+        return _selected
+    installed = available_backends()
+    for name in candidates:
+        if name not in installed:
+            continue
+        error = _check(name)
+        if error is None:
+            set_backend(name, check=False)
+            log.debug("Using ECDSA backend %s", name)
+            return name
+        log.warning("Skipping ECDSA backend: %s", error)
+    raise BackendError("No working ECDSA backend found")
+
+
+def get_shared_secret(priv: PrivateKey, pub: PublicKey) -> str:
+    """
+    Derive the shared secret between ``priv`` and ``pub`` using the current backend.
+
+    Same result as :py:func:`graphenebase.memo.get_shared_secret`: x coordinate of ``pub * priv``, hex-encoded.
+
+    :param PrivateKey priv: private key
+    :param PublicKey pub: public key
+    :rtype: str
+    """
+    backend = get_backend()
+    if backend == "cryptography":
+        private_key = gphecdsa.ec.derive_private_key(int(repr(priv), 16), gphecdsa.ec.SECP256K1())
+        public_key = gphecdsa.ec.EllipticCurvePublicKey.from_encoded_point(gphecdsa.ec.SECP256K1(), bytes(pub))
+        return hexlify(private_key.exchange(gphecdsa.ec.ECDH(), public_key)).decode("ascii")
+    if backend == "secp256k1":
+        point = gphecdsa.secp256k1.PublicKey(bytes(pub), raw=True).tweak_mul(bytes(priv))
+        return hexlify(point.serialize(compressed=True)[1:]).decode("ascii")
+    return _get_shared_secret_pure(priv, pub)
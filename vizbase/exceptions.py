@@ -4,3 +4,7 @@ class BaseException(Exception):
 
 class AssetUnknown(BaseException):
     pass
+
+
+class BackendError(BaseException):
+    pass
@@ -1,36 +1,193 @@
 # -*- coding: utf-8 -*-
 import hashlib
 import struct
-from binascii import hexlify, unhexlify
+import threading
+from binascii import unhexlify
+from collections import OrderedDict
+from typing import NamedTuple, Optional, Tuple
 
 from Crypto.Cipher import AES  # noqa: DUO133  # we're using pycryptodome
-from graphenebase.base58 import base58decode, base58encode
-from graphenebase.memo import get_shared_secret
+from graphenebase.base58 import BASE58_ALPHABET
 
-from .account import PublicKey
-from .objects import Memo
+from .account import PrivateKey, PublicKey
+from .backends import get_shared_secret
+
+
+class SharedSecretCache:
+    """
+    Bounded LRU cache of memo shared secrets.
+
+    Deriving a shared secret is an EC point multiplication, the most expensive part of memo encryption and decryption.
+    The secret is the same for both directions between two keys, so it is cached by the unordered pair of public keys
+    and reused for every memo between them. A cached secret decrypts memos of the pair without checking the private
+    key, so share a cache only between code trusted with the keys.
+
+    .. code-block:: python
+
+        from vizbase.memo import SharedSecretCache
+
+        viz.memo_cache = SharedSecretCache(maxsize=1024, wipe=True)
+
+    :param int maxsize: maximum number of cached secrets
+    :param bool wipe: overwrite secrets with zeros when they are evicted or cleared (best effort: copies made while
+        deriving a secret are left to the garbage collector)
+    """
+
+    def __init__(self, maxsize: int = 256, wipe: bool = False) -> None:
+        self.maxsize = maxsize
+        self.wipe = wipe
+        self._lock = threading.Lock()
+        self._secrets: 'OrderedDict[Tuple[str, str], bytearray]' = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._secrets)
+
+    @staticmethod
+    def _key(pub1: PublicKey, pub2: PublicKey) -> Tuple[str, str]:
+        first, second = repr(pub1), repr(pub2)
+        return (first, second) if first <= second else (second, first)
+
+    def get(self, pub1: PublicKey, pub2: PublicKey) -> Optional[bytearray]:
+        """Return cached secret between two public keys, or None."""
+        key = self._key(pub1, pub2)
+        with self._lock:
+            secret = self._secrets.get(key)
+            if secret is not None:
+                self._secrets.move_to_end(key)
+            return secret
+
+    def derive(self, priv: PrivateKey, pub: PublicKey, priv_pubkey: Optional[PublicKey] = None) -> bytearray:
+        """
+        Return shared secret between a private key and a public key, deriving it on cache miss.
+
+        :param PrivateKey priv: private key
+        :param PublicKey pub: public key of the other party
+        :param PublicKey priv_pubkey: public key of ``priv``, if known, to skip deriving it
+        """
+        key = self._key(priv_pubkey or priv.pubkey, pub)
+        with self._lock:
+            secret = self._secrets.get(key)
+            if secret is not None:
+                self._secrets.move_to_end(key)
+                return secret
+        secret = bytearray(unhexlify(get_shared_secret(priv, pub)))
+        with self._lock:
+            self._secrets[key] = secret
+            while len(self._secrets) > self.maxsize:
+                self._discard(self._secrets.popitem(last=False)[1])
+        return secret
+
+    def _discard(self, secret: bytearray) -> None:
+        if self.wipe:
+            secret[:] = bytes(len(secret))
+
+    def clear(self) -> None:
+        """Drop all secrets."""
+        with self._lock:
+            for secret in self._secrets.values():
+                self._discard(secret)
+            self._secrets.clear()
 
 
 def init_aes(shared_secret, nonce):
     """
     Initialize AES instance.
 
-    :param hex shared_secret: Shared Secret to use as encryption key
+    :param hex shared_secret: Shared Secret to use as encryption key, hex string or bytes
     :param int nonce: Random nonce
     :return: AES instance and checksum of the encryption key
     :rtype: length 2 tuple
     """
-    " Seed "
-    ss = unhexlify(shared_secret)
-    non = struct.pack("<Q", int(nonce))
-    encryption_key = hashlib.sha512(non + ss).hexdigest()
-    " Check'sum' "
-    check = hashlib.sha256(unhexlify(encryption_key)).digest()
-    check = struct.unpack_from("<I", check[:4])[0]
-    " AES "
-    key = unhexlify(encryption_key[0:64])
-    iv = unhexlify(encryption_key[64:96])
-    return AES.new(key, AES.MODE_CBC, iv), check
+    ss = bytes(shared_secret) if isinstance(shared_secret, (bytes, bytearray)) else unhexlify(shared_secret)
+    encryption_key = hashlib.sha512(_NONCE.pack(int(nonce)) + ss).digest()
+    check = _CHECK.unpack_from(hashlib.sha256(encryption_key).digest())[0]
+    return AES.new(encryption_key[:32], AES.MODE_CBC, encryption_key[32:48]), check
+
+
+class RawMemo(NamedTuple):
+    """Fields of an encrypted memo, see :py:func:`pack_memo`."""
+
+    #: compressed public key of the sender, 33 bytes
+    from_key: bytes
+    #: compressed public key of the receiver, 33 bytes
+    to_key: bytes
+    nonce: int
+    check: int
+    encrypted: bytes
+
+
+_NONCE = struct.Struct("<Q")
+_CHECK = struct.Struct("<I")
+# from_key, to_key, nonce, check
+_HEADER = struct.Struct("<33s33sQI")
+_BASE58_INDEX = {char: index for index, char in enumerate(BASE58_ALPHABET.decode("ascii"))}
+
+
+def _base58decode(text: str) -> bytes:
+    number = 0
+    try:
+        for char in text:
+            number = number * 58 + _BASE58_INDEX[char]
+    except KeyError:
+        raise ValueError("Invalid base58 character: {!r}".format(char))
+    zeros = len(text) - len(text.lstrip("1"))
+    return bytes(zeros) + number.to_bytes((number.bit_length() + 7) // 8, "big")
+
+
+def _base58encode(data: bytes) -> str:
+    number = int.from_bytes(data, "big")
+    chars = []
+    while number:
+        number, index = divmod(number, 58)
+        chars.append(BASE58_ALPHABET[index])
+    zeros = len(data) - len(data.lstrip(b"\0"))
+    return "1" * zeros + bytes(reversed(chars)).decode("ascii")
+
+
+def _varint(value: int) -> bytes:
+    result = bytearray()
+    while value >= 0x80:
+        result.append((value & 0x7F) | 0x80)
+        value >>= 7
+    result.append(value)
+    return bytes(result)
+
+
+def pack_memo(memo: RawMemo) -> str:
+    """
+    Serialize memo fields into ``#``-prefixed base58 string, same as ``bytes()`` of :py:class:`vizbase.objects.Memo`.
+    """
+    data = _HEADER.pack(memo.from_key, memo.to_key, memo.nonce, memo.check)
+    return "#" + _base58encode(data + _varint(len(memo.encrypted)) + memo.encrypted)
+
+
+def unpack_memo(message: str) -> RawMemo:
+    """
+    Parse ``#``-prefixed base58 memo string.
+
+    :param str message: encrypted memo
+    :raises ValueError: if the memo is malformed
+    """
+    data = memoryview(_base58decode(message[1:]))
+    if len(data) < _HEADER.size + 1:
+        raise ValueError("Memo is too short")
+    from_key, to_key, nonce, check = _HEADER.unpack_from(data)
+
+    # varint length of the ciphertext
+    pos = _HEADER.size
+    length = shift = 0
+    while True:
+        if pos >= len(data):
+            raise ValueError("Memo is truncated")
+        byte = data[pos]
+        length |= (byte & 0x7F) << shift
+        shift += 7
+        pos += 1
+        if not byte & 0x80:
+            break
+    if len(data) - pos != length:
+        raise ValueError("Memo length mismatch")
+    return RawMemo(from_key, to_key, nonce, check, bytes(data[pos:]))
 
 
 def encode_memo(priv, pub, nonce, message, **kwargs):
@@ -41,10 +198,17 @@ def encode_memo(priv, pub, nonce, message, **kwargs):
     :param PublicKey pub: Public Key (of Bob)
     :param int nonce: Random nonce
     :param str message: Memo message
+    :param SharedSecretCache cache: (optional) cache of shared secrets
+    :param PublicKey from_pubkey: (optional) public key of ``priv``, to skip deriving it
     :return: Encrypted message
-    :rtype: hex
+    :rtype: str
     """
-    shared_secret = get_shared_secret(priv, pub)
+    cache = kwargs.pop("cache", None)
+    from_pubkey = kwargs.pop("from_pubkey", None) or priv.pubkey
+    if cache is not None:
+        shared_secret = cache.derive(priv, pub, from_pubkey)
+    else:
+        shared_secret = get_shared_secret(priv, pub)
     aes, check = init_aes(shared_secret, nonce)
     raw = bytes(message, "utf8")
 
@@ -53,75 +217,56 @@ def encode_memo(priv, pub, nonce, message, **kwargs):
     if len(raw) % bs:
         raw = _pad(raw, bs)
     " Encryption "
-    cipher = hexlify(aes.encrypt(raw)).decode("ascii")
-    prefix = kwargs.pop("prefix")
-    op = {
-        "from": format(priv.pubkey, prefix),
-        "to": format(pub, prefix),
-        "nonce": nonce,
-        "check": check,
-        "encrypted": cipher,
-    }
+    return pack_memo(RawMemo(bytes(from_pubkey), bytes(pub), int(nonce), check, aes.encrypt(raw)))
 
-    tx = Memo(**op)
 
-    return "#" + base58encode(hexlify(bytes(tx)).decode("ascii"))
-
-
-def decode_memo(priv, message):
+def decode_memo(priv, message, cache=None, priv_pubkey=None):
     """
     Decode a message with a shared secret between Alice and Bob.
 
     :param PrivateKey priv: Private Key (of Bob)
     :param base58encoded message: Encrypted Memo message
+    :param SharedSecretCache cache: (optional) cache of shared secrets
+    :param PublicKey priv_pubkey: (optional) public key of ``priv``, to skip deriving it; must come from a trusted
+        source, e.g. the wallet the private key was taken from
     :return: Decrypted message
     :rtype: str
-    :raise ValueError: if message cannot be decoded as valid UTF-8
+    :raise ValueError: if the private key belongs to neither memo key, or message cannot be decoded as valid UTF-8
            string
     """
-    " decode structure "
-    raw = base58decode(message[1:])
-    from_key = PublicKey(raw[:66])
-    raw = raw[66:]
-    to_key = PublicKey(raw[:66])
-    raw = raw[66:]
-    nonce = str(struct.unpack_from("<Q", unhexlify(raw[:16]))[0])
-    raw = raw[16:]
-    check = struct.unpack_from("<I", unhexlify(raw[:8]))[0]
-    raw = raw[8:]
-    cipher = raw
-
-    if repr(to_key) == repr(priv.pubkey):
-        shared_secret = get_shared_secret(priv, from_key)
-    elif repr(from_key) == repr(priv.pubkey):
-        shared_secret = get_shared_secret(priv, to_key)
+    memo = unpack_memo(message)
+    pubkey = priv_pubkey or priv.pubkey
+    # the private key is checked before the cache is used, a cached secret must not decrypt for a wrong key
+    if memo.to_key == bytes(pubkey):
+        other = PublicKey(memo.from_key.hex())
+    elif memo.from_key == bytes(pubkey):
+        other = PublicKey(memo.to_key.hex())
     else:
         raise ValueError("Incorrect PrivateKey")
 
+    if cache is not None:
+        shared_secret = cache.derive(priv, other, pubkey)
+    else:
+        shared_secret = get_shared_secret(priv, other)
+
     " Init encryption "
-    aes, checksum = init_aes(shared_secret, nonce)
+    aes, checksum = init_aes(shared_secret, memo.nonce)
 
     " Check "
-    assert check == checksum, "Checksum failure"
+    assert memo.check == checksum, "Checksum failure"
 
     " Encryption "
-    # remove the varint prefix (FIXME, long messages!)
-    message = cipher[2:]
-    message = aes.decrypt(unhexlify(bytes(message, "ascii")))
+    message = _unpad(aes.decrypt(memo.encrypted), 16)
     try:
-        return _unpad(message.decode("utf8"), 16)
+        return message.decode("utf8")
     except Exception:
         raise ValueError(message)
 
 
 def involved_keys(message):
     """decode structure."""
-    raw = base58decode(message[1:])
-    from_key = PublicKey(raw[:66])
-    raw = raw[66:]
-    to_key = PublicKey(raw[:66])
-
-    return [from_key, to_key]
+    memo = unpack_memo(message)
+    return [PublicKey(memo.from_key.hex()), PublicKey(memo.to_key.hex())]
 
 
 def _pad(raw_message, bs):
@@ -130,7 +275,7 @@ def _pad(raw_message, bs):
 
 
 def _unpad(raw_message, bs):
-    count = int(struct.unpack("B", bytes(raw_message[-1], "ascii"))[0])
-    if bytes(raw_message[-count::], "ascii") == count * struct.pack("B", count):
+    count = raw_message[-1] if raw_message else 0
+    if 0 < count <= bs and raw_message[-count:] == bytes([count]) * count:
         return raw_message[:-count]
     return raw_message
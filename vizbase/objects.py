@@ -25,6 +25,7 @@ from graphenebase.types import (
 )
 
 from .account import PublicKey
+from .amount import format_units, parse_amount
 from .chains import DEFAULT_PREFIX, PRECISIONS
 from .exceptions import AssetUnknown
 from .operationids import operations
@@ -39,22 +40,18 @@ class Operation(GrapheneOperation):
 
 class Amount:
     def __init__(self, d):
-        self.amount, self.asset = d.strip().split(" ")
-        self.amount = float(self.amount)
-
-        if self.asset in PRECISIONS:
-            self.precision = PRECISIONS[self.asset]
-        else:
+        self.units, self.asset, self.precision, _ = parse_amount(d.strip())
+        if self.asset not in PRECISIONS:
             raise AssetUnknown
+        self.amount = self.units / 10 ** self.precision
 
     def __bytes__(self):
         # padding
         asset = self.asset + "\x00" * (7 - len(self.asset))
-        amount = round(float(self.amount) * 10 ** self.precision)
-        return struct.pack("<q", amount) + struct.pack("<b", self.precision) + bytes(asset, "ascii")
+        return struct.pack("<q", self.units) + struct.pack("<b", self.precision) + bytes(asset, "ascii")
 
     def __str__(self):
-        return "{:.{}f} {}".format(self.amount, self.precision, self.asset)
+        return format_units(self.units, self.asset, self.precision)
 
 
 class Beneficiary(GrapheneObject):
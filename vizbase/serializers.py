@@ -0,0 +1,655 @@
+# -*- coding: utf-8 -*-
+"""
+Schema-driven serialization of operations and transactions.
+
+Classes from :py:mod:`vizbase.operations` build a tree of :py:mod:`graphenebase.types` wrapper objects per operation
+and serialize it recursively, which dominates the cost of building many transactions. Here every operation is
+described by a field table, compiled once into an encoder which writes the operation into a ``bytearray`` in one
+pass. The output is byte-identical to ``bytes()`` of the classes.
+
+Operations are given in their JSON form, ``[name, data]`` (``name`` may be the numeric id), same as accepted by
+:py:class:`vizbase.objects.Operation`:
+
+.. code-block:: python
+
+    from vizbase.serializers import serialize_op, serialize_transaction, transaction_id
+
+    op = ['transfer', {'from': 'alice', 'to': 'bob', 'amount': '1.000 VIZ', 'memo': ''}]
+    serialize_op(op)
+    tx = {'ref_block_num': 1, 'ref_block_prefix': 2, 'expiration': '2020-01-01T00:00:00', 'operations': [op]}
+    transaction_id(tx)
+"""
+import hashlib
+import json
+import re
+import struct
+from binascii import hexlify, unhexlify
+from calendar import timegm
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple
+
+from graphenebase.ecdsa import sign_message
+from graphenebase.utils import unicodify
+
+from .account import PublicKey
+from .amount import parse_amount
+from .chains import DEFAULT_PREFIX, PRECISIONS
+from .exceptions import AssetUnknown
+from .operationids import OPS, operations
+
+# encoder writes a value into the buffer at the position and returns the position after it
+Encoder = Callable[[bytearray, int, Any, str], int]
+
+_UINT8 = struct.Struct("<B")
+_INT16 = struct.Struct("<h")
+_UINT16 = struct.Struct("<H")
+_UINT32 = struct.Struct("<I")
+_UINT64 = struct.Struct("<Q")
+# amount, precision, asset symbol padded to 7 bytes
+_AMOUNT = struct.Struct("<qb7s")
+
+# characters replaced by graphenebase.utils.unicodify()
+_UNICODIFY = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+# marks fields without default value
+_REQUIRED = object()
+
+
+def _reserve(buf: bytearray, end: int) -> None:
+    if len(buf) < end:
+        # grow at least twice to keep appends amortized
+        buf.extend(bytes(max(end - len(buf), len(buf))))
+
+
+def _put_varint(buf: bytearray, pos: int, value: int) -> int:
+    _reserve(buf, pos + 10)
+    while value >= 0x80:
+        buf[pos] = (value & 0x7F) | 0x80
+        value >>= 7
+        pos += 1
+    buf[pos] = value
+    return pos + 1
+
+
+def _put_raw(buf: bytearray, pos: int, data: bytes) -> int:
+    end = pos + len(data)
+    _reserve(buf, end)
+    buf[pos:end] = data
+    return end
+
+
+def _put_bytes(buf: bytearray, pos: int, data: bytes) -> int:
+    return _put_raw(buf, _put_varint(buf, pos, len(data)), data)
+
+
+def _struct(packer: struct.Struct) -> Encoder:
+    size = packer.size
+
+    def put(buf: bytearray, pos: int, value: Any, prefix: str) -> int:
+        _reserve(buf, pos + size)
+        packer.pack_into(buf, pos, int(value))
+        return pos + size
+
+    return put
+
+
+_put_uint8 = _struct(_UINT8)
+_put_int16 = _struct(_INT16)
+_put_uint16 = _struct(_UINT16)
+_put_uint32 = _struct(_UINT32)
+_put_uint64 = _struct(_UINT64)
+
+
+def _put_bool(buf: bytearray, pos: int, value: Any, prefix: str) -> int:
+    return _put_uint8(buf, pos, bool(value), prefix)
+
+
+def encode_string(value: str) -> bytes:
+    """Encode string contents like :py:class:`graphenebase.types.String`, without length prefix."""
+    if not value:
+        return b""
+    if _UNICODIFY.search(value):
+        return unicodify(value)
+    return value.encode("utf-8")
+
+
+def _put_string(buf: bytearray, pos: int, value: Any, prefix: str) -> int:
+    return _put_bytes(buf, pos, encode_string(value))
+
+
+def _put_json_string(buf: bytearray, pos: int, value: Any, prefix: str) -> int:
+    # json_metadata and custom json are accepted as objects too
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value)
+    return _put_string(buf, pos, value, prefix)
+
+
+def encode_amount(value: str) -> bytes:
+    """Encode amount string like :py:class:`vizbase.objects.Amount`."""
+    units, asset, precision, _ = parse_amount(value.strip())
+    if asset not in PRECISIONS:
+        raise AssetUnknown
+    return _AMOUNT.pack(units, precision, asset.encode("ascii"))
+
+
+def _put_amount(buf: bytearray, pos: int, value: Any, prefix: str) -> int:
+    return _put_raw(buf, pos, encode_amount(str(value)))
+
+
+@lru_cache(maxsize=4096)
+def encode_public_key(value: str, prefix: str = DEFAULT_PREFIX) -> bytes:
+    """Encode public key, results are cached."""
+    return bytes(PublicKey(value, prefix=prefix))
+
+
+def _put_public_key(buf: bytearray, pos: int, value: Any, prefix: str) -> int:
+    return _put_raw(buf, pos, encode_public_key(value, prefix))
+
+
+@lru_cache(maxsize=1024)
+def encode_time(value: str) -> bytes:
+    """Encode ``%Y-%m-%dT%H:%M:%S`` UTC time like :py:class:`graphenebase.types.PointInTime`."""
+    return _UINT32.pack(timegm(datetime.strptime(value, "%Y-%m-%dT%H:%M:%S").utctimetuple()))
+
+
+def _put_time(buf: bytearray, pos: int, value: Any, prefix: str) -> int:
+    return _put_raw(buf, pos, encode_time(value))
+
+
+def _array(item: Encoder) -> Encoder:
+    def put(buf: bytearray, pos: int, value: Any, prefix: str) -> int:
+        value = value or []
+        pos = _put_varint(buf, pos, len(value))
+        for element in value:
+            pos = item(buf, pos, element, prefix)
+        return pos
+
+    return put
+
+
+def _optional(item: Encoder) -> Encoder:
+    def put(buf: bytearray, pos: int, value: Any, prefix: str) -> int:
+        if not value:
+            return _put_uint8(buf, pos, 0, prefix)
+        return item(buf, _put_uint8(buf, pos, 1, prefix), value, prefix)
+
+    return put
+
+
+def _put_empty_array(buf: bytearray, pos: int, value: Any, prefix: str) -> int:
+    # extensions, no extension types are defined for the operations
+    if value:
+        raise ValueError("Extensions are not supported")
+    return _put_varint(buf, pos, 0)
+
+
+def _object(fields: Sequence[Tuple[str, Encoder, Any]]) -> Encoder:
+    """Compile a field table into an encoder of a dict."""
+    fields = tuple(fields)
+
+    def put(buf: bytearray, pos: int, value: Any, prefix: str) -> int:
+        for name, encoder, default in fields:
+            field = value.get(name, default)
+            if field is _REQUIRED:
+                raise KeyError(name)
+            pos = encoder(buf, pos, field, prefix)
+        return pos
+
+    return put
+
+
+def _put_permission(buf: bytearray, pos: int, value: Any, prefix: str) -> int:
+    pos = _put_uint32(buf, pos, value["weight_threshold"], prefix)
+    pos = _put_varint(buf, pos, len(value["account_auths"]))
+    for account, weight in value["account_auths"]:
+        pos = _put_uint16(buf, _put_string(buf, pos, account, prefix), weight, prefix)
+    # node expects key_auths sorted, same order as vizbase.objects.Permission
+    key_auths = sorted(value["key_auths"], key=lambda x: x[0])
+    pos = _put_varint(buf, pos, len(key_auths))
+    for key, weight in key_auths:
+        pos = _put_uint16(buf, _put_public_key(buf, pos, key, prefix), weight, prefix)
+    return pos
+
+
+def _put_block_signing_key(buf: bytearray, pos: int, value: Any, prefix: str) -> int:
+    # empty key disables the witness
+    return _put_public_key(buf, pos, value or "{}1111111111111111111111111111111114T1Anm".format(prefix), prefix)
+
+
+_put_beneficiary = _object((("account", _put_string, _REQUIRED), ("weight", _put_int16, _REQUIRED)))
+
+_put_chain_properties = _object(
+    (
+        # initial, version 0
+        ("account_creation_fee", _put_amount, _REQUIRED),
+        ("maximum_block_size", _put_uint32, _REQUIRED),
+        ("create_account_delegation_ratio", _put_uint32, _REQUIRED),
+        ("create_account_delegation_time", _put_uint32, _REQUIRED),
+        ("min_delegation", _put_amount, _REQUIRED),
+        ("min_curation_percent", _put_uint16, _REQUIRED),
+        ("max_curation_percent", _put_uint16, _REQUIRED),
+        ("bandwidth_reserve_percent", _put_uint16, _REQUIRED),
+        ("bandwidth_reserve_below", _put_amount, _REQUIRED),
+        ("flag_energy_additional_cost", _put_uint16, _REQUIRED),
+        ("vote_accounting_min_rshares", _put_uint32, _REQUIRED),
+        ("committee_request_approve_min_percent", _put_uint16, _REQUIRED),
+        # chain_properties_hf4, version 1
+        ("inflation_witness_percent", _put_uint16, _REQUIRED),
+        ("inflation_ratio_committee_vs_reward_fund", _put_uint16, _REQUIRED),
+        ("inflation_recalc_period", _put_uint32, _REQUIRED),
+        # chain_properties_hf6: version 2
+        ("data_operations_cost_additional_bandwidth", _put_uint32, _REQUIRED),
+        ("witness_miss_penalty_percent", _put_uint16, _REQUIRED),
+        ("witness_miss_penalty_duration", _put_uint32, _REQUIRED),
+        # chain_properties_hf9: version 3
+        ("create_invite_min_balance", _put_amount, _REQUIRED),
+        ("committee_create_request_fee", _put_amount, _REQUIRED),
+        ("create_paid_subscription_fee", _put_amount, _REQUIRED),
+        ("account_on_sale_fee", _put_amount, _REQUIRED),
+        ("subaccount_on_sale_fee", _put_amount, _REQUIRED),
+        ("witness_declaration_fee", _put_amount, _REQUIRED),
+        ("withdraw_intervals", _put_uint16, _REQUIRED),
+    )
+)
+
+
+def _put_chain_properties_variant(buf: bytearray, pos: int, value: Any, prefix: str) -> int:
+    # [version, props] as returned by the node, or just props
+    if isinstance(value, list):
+        value = value[1]
+    return _put_chain_properties(buf, _put_varint(buf, pos, 3), value, prefix)
+
+
+def _put_op_wrapper(buf: bytearray, pos: int, value: Any, prefix: str) -> int:
+    return _put_operation(buf, pos, value["op"], prefix)
+
+
+_put_strings = _array(_put_string)
+_put_public_keys = _array(_put_public_key)
+
+#: field tables of operations, see vizbase.operations
+SCHEMAS: Dict[str, Tuple[Tuple[str, Encoder, Any], ...]] = {
+    "account_create": (
+        ("fee", _put_amount, _REQUIRED),
+        ("delegation", _put_amount, _REQUIRED),
+        ("creator", _put_string, _REQUIRED),
+        ("new_account_name", _put_string, _REQUIRED),
+        ("master", _put_permission, _REQUIRED),
+        ("active", _put_permission, _REQUIRED),
+        ("regular", _put_permission, _REQUIRED),
+        ("memo_key", _put_public_key, _REQUIRED),
+        ("json_metadata", _put_json_string, ""),
+        ("referrer", _put_string, _REQUIRED),
+        ("extensions", _put_empty_array, None),
+    ),
+    "account_update": (
+        ("account", _put_string, _REQUIRED),
+        ("master", _optional(_put_permission), None),
+        ("active", _optional(_put_permission), None),
+        ("regular", _optional(_put_permission), None),
+        ("memo_key", _put_public_key, _REQUIRED),
+        ("json_metadata", _put_json_string, ""),
+    ),
+    "account_metadata": (("account", _put_string, _REQUIRED), ("json_metadata", _put_json_string, "")),
+    "award": (
+        ("initiator", _put_string, _REQUIRED),
+        ("receiver", _put_string, _REQUIRED),
+        ("energy", _put_uint16, _REQUIRED),
+        ("custom_sequence", _put_uint64, 0),
+        ("memo", _put_string, _REQUIRED),
+        ("beneficiaries", _array(_put_beneficiary), _REQUIRED),
+    ),
+    "fixed_award": (
+        ("initiator", _put_string, _REQUIRED),
+        ("receiver", _put_string, _REQUIRED),
+        ("reward_amount", _put_amount, _REQUIRED),
+        ("max_energy", _put_uint16, _REQUIRED),
+        ("custom_sequence", _put_uint64, 0),
+        ("memo", _put_string, _REQUIRED),
+        ("beneficiaries", _array(_put_beneficiary), _REQUIRED),
+    ),
+    "transfer": (
+        ("from", _put_string, _REQUIRED),
+        ("to", _put_string, _REQUIRED),
+        ("amount", _put_amount, _REQUIRED),
+        ("memo", _put_string, ""),
+    ),
+    "transfer_to_vesting": (
+        ("from", _put_string, _REQUIRED),
+        ("to", _put_string, _REQUIRED),
+        ("amount", _put_amount, _REQUIRED),
+    ),
+    "withdraw_vesting": (("account", _put_string, _REQUIRED), ("vesting_shares", _put_amount, _REQUIRED)),
+    "delegate_vesting_shares": (
+        ("delegator", _put_string, _REQUIRED),
+        ("delegatee", _put_string, _REQUIRED),
+        ("vesting_shares", _put_amount, _REQUIRED),
+    ),
+    "set_withdraw_vesting_route": (
+        ("from_account", _put_string, _REQUIRED),
+        ("to_account", _put_string, _REQUIRED),
+        ("percent", _put_uint16, _REQUIRED),
+        ("auto_vest", _put_uint8, _REQUIRED),
+    ),
+    "witness_update": (
+        ("owner", _put_string, _REQUIRED),
+        ("url", _put_string, _REQUIRED),
+        ("block_signing_key", _put_block_signing_key, _REQUIRED),
+    ),
+    "versioned_chain_properties_update": (
+        ("owner", _put_string, _REQUIRED),
+        ("props", _put_chain_properties_variant, _REQUIRED),
+    ),
+    "account_witness_vote": (
+        ("account", _put_string, _REQUIRED),
+        ("witness", _put_string, _REQUIRED),
+        ("approve", _put_bool, _REQUIRED),
+    ),
+    "proposal_create": (
+        ("author", _put_string, _REQUIRED),
+        ("title", _put_string, _REQUIRED),
+        ("memo", _put_string, ""),
+        ("expiration_time", _put_time, _REQUIRED),
+        ("proposed_operations", _array(_put_op_wrapper), _REQUIRED),
+        ("review_period_time", _optional(_put_time), None),
+        ("extensions", _put_empty_array, None),
+    ),
+    "proposal_update": (
+        ("author", _put_string, _REQUIRED),
+        ("title", _put_string, _REQUIRED),
+        ("active_approvals_to_add", _put_strings, None),
+        ("active_approvals_to_remove", _put_strings, None),
+        ("master_approvals_to_add", _put_strings, None),
+        ("master_approvals_to_remove", _put_strings, None),
+        ("regular_approvals_to_add", _put_strings, None),
+        ("regular_approvals_to_remove", _put_strings, None),
+        ("key_approvals_to_add", _put_public_keys, None),
+        ("key_approvals_to_remove", _put_public_keys, None),
+        ("extensions", _put_empty_array, None),
+    ),
+    "proposal_delete": (
+        ("author", _put_string, _REQUIRED),
+        ("title", _put_string, _REQUIRED),
+        ("requester", _put_string, _REQUIRED),
+        ("extensions", _put_empty_array, None),
+    ),
+    "custom": (
+        ("required_active_auths", _put_strings, _REQUIRED),
+        ("required_regular_auths", _put_strings, _REQUIRED),
+        ("id", _put_string, _REQUIRED),
+        ("json", _put_json_string, _REQUIRED),
+    ),
+}
+
+# operation name -> encoder of operation data
+_ENCODERS: Dict[str, Encoder] = {name: _object(fields) for name, fields in SCHEMAS.items()}
+
+
+def _put_operation(buf: bytearray, pos: int, value: Any, prefix: str) -> int:
+    name, data = value
+    if isinstance(name, int):
+        name = OPS[name]
+    encoder = _ENCODERS.get(name)
+    if encoder is None:
+        raise ValueError("Serialization of {} operation is not supported".format(name))
+    if name == "custom" and len(data["id"]) > 32:
+        raise ValueError("'id' is too long")
+    return encoder(buf, _put_varint(buf, pos, operations[name]), data, prefix)
+
+
+def put_operation(buf: bytearray, pos: int, op: Sequence, prefix: str = DEFAULT_PREFIX) -> int:
+    """
+    Write an operation into a buffer.
+
+    :param bytearray buf: buffer, extended if too short
+    :param int pos: write position
+    :param op: ``[name, data]`` pair
+    :param str prefix: public keys prefix
+    :return: position after the operation
+    """
+    return _put_operation(buf, pos, op, prefix)
+
+
+def put_transaction(buf: bytearray, pos: int, tx: dict, prefix: str = DEFAULT_PREFIX, signatures: bool = True) -> int:
+    """
+    Write a transaction into a buffer.
+
+    :param bytearray buf: buffer, extended if too short
+    :param int pos: write position
+    :param dict tx: transaction in JSON form, as :py:meth:`vizbase.signedtransactions.Signed_Transaction.json`
+        returns; items of ``operations`` may be serialized operations (``bytes``)
+    :param str prefix: public keys prefix
+    :param bool signatures: write signatures (hex strings in ``signatures`` field); transaction id and digest are
+        calculated without them
+    :return: position after the transaction
+    """
+    pos = _put_uint16(buf, pos, tx["ref_block_num"], prefix)
+    pos = _put_uint32(buf, pos, tx["ref_block_prefix"], prefix)
+    pos = _put_time(buf, pos, tx["expiration"], prefix)
+    ops = tx["operations"]
+    pos = _put_varint(buf, pos, len(ops))
+    for op in ops:
+        if isinstance(op, (bytes, bytearray, memoryview)):
+            # already serialized, e.g. by OperationTemplate
+            pos = _put_raw(buf, pos, op)
+        else:
+            pos = _put_operation(buf, pos, op, prefix)
+    pos = _put_empty_array(buf, pos, tx.get("extensions"), prefix)
+    if signatures:
+        sigs = tx.get("signatures") or []
+        pos = _put_varint(buf, pos, len(sigs))
+        for signature in sigs:
+            pos = _put_raw(buf, pos, unhexlify(signature))
+    return pos
+
+
+def serialize_op(op: Sequence, prefix: str = DEFAULT_PREFIX) -> bytes:
+    """
+    Serialize an operation, same as ``bytes(Operation(op))``.
+
+    :param op: ``[name, data]`` pair
+    :param str prefix: public keys prefix
+    """
+    buf = bytearray(256)
+    end = _put_operation(buf, 0, op, prefix)
+    return bytes(buf[:end])
+
+
+def serialize_ops(ops: Iterable[Sequence], prefix: str = DEFAULT_PREFIX) -> List[bytes]:
+    """Serialize many operations, reusing one buffer."""
+    buf = bytearray(256)
+    return [bytes(buf[: _put_operation(buf, 0, op, prefix)]) for op in ops]
+
+
+def serialize_transaction(tx: dict, prefix: str = DEFAULT_PREFIX, signatures: bool = True) -> bytes:
+    """
+    Serialize a transaction, same as ``bytes(Signed_Transaction(**tx))``.
+
+    :param dict tx: transaction in JSON form
+    :param str prefix: public keys prefix
+    :param bool signatures: include signatures
+    """
+    buf = bytearray(512)
+    end = put_transaction(buf, 0, tx, prefix, signatures)
+    return bytes(buf[:end])
+
+
+def transaction_id(tx: dict, prefix: str = DEFAULT_PREFIX) -> str:
+    """Calculate id of a transaction in JSON form, same as :py:attr:`Signed_Transaction.id`."""
+    buf = bytearray(512)
+    end = put_transaction(buf, 0, tx, prefix, signatures=False)
+    return hexlify(hashlib.sha256(memoryview(buf)[:end]).digest()[:20]).decode("ascii")
+
+
+class OperationTemplate:
+    """
+    Operation with constant fields serialized once.
+
+    Fields listed in ``variable`` are encoded on every :py:meth:`serialize` call, the bytes between them are
+    precomputed, so serializing another instance of the same operation shape costs only its varying fields.
+
+    .. code-block:: python
+
+        from vizbase.serializers import OperationTemplate
+
+        template = OperationTemplate(['transfer', {'from': 'alice', 'memo': 'payout'}], variable=['to', 'amount'])
+        template.serialize({'to': 'bob', 'amount': '1.000 VIZ'})
+        template.op({'to': 'bob', 'amount': '1.000 VIZ'})  # ['transfer', {...}]
+
+    :param op: ``[name, data]`` pair, ``data`` holds the constant fields
+    :param list variable: names of fields set per instance
+    :param str prefix: public keys prefix
+    """
+
+    def __init__(self, op: Sequence, variable: Iterable[str], prefix: str = DEFAULT_PREFIX) -> None:
+        name, data = op
+        if isinstance(name, int):
+            name = OPS[name]
+        if name not in SCHEMAS:
+            raise ValueError("Serialization of {} operation is not supported".format(name))
+        self.name = name
+        self.data = dict(data)
+        self.variable = tuple(variable)
+        self.prefix = prefix
+        unknown = set(self.variable) - {field for field, _, _ in SCHEMAS[name]}
+        if unknown:
+            raise ValueError("Unknown fields of {} operation: {}".format(name, ", ".join(sorted(unknown))))
+
+        # constant bytes and (field, encoder, default) of variable fields, in serialization order
+        self._segments: List[Any] = []
+        buf = bytearray(256)
+        pos = _put_varint(buf, 0, operations[name])
+        for field, encoder, default in SCHEMAS[name]:
+            if field in self.variable:
+                if pos:
+                    self._segments.append(bytes(buf[:pos]))
+                    pos = 0
+                self._segments.append((field, encoder, default))
+                continue
+            value = self.data.get(field, default)
+            if value is _REQUIRED:
+                raise KeyError(field)
+            pos = encoder(buf, pos, value, prefix)
+        if pos:
+            self._segments.append(bytes(buf[:pos]))
+        self._check({field: self.data[field] for field in self.data if field not in self.variable})
+
+    def _check(self, values: Dict[str, Any]) -> None:
+        if self.name == "custom" and len(values.get("id", "")) > 32:
+            raise ValueError("'id' is too long")
+
+    def put(self, buf: bytearray, pos: int, values: Dict[str, Any]) -> int:
+        """
+        Write an instance of the operation into a buffer.
+
+        :param bytearray buf: buffer, extended if too short
+        :param int pos: write position
+        :param dict values: variable fields
+        :return: position after the operation
+        """
+        self._check(values)
+        for segment in self._segments:
+            if isinstance(segment, bytes):
+                pos = _put_raw(buf, pos, segment)
+                continue
+            field, encoder, default = segment
+            value = values.get(field, default)
+            if value is _REQUIRED:
+                raise KeyError(field)
+            pos = encoder(buf, pos, value, self.prefix)
+        return pos
+
+    def serialize(self, values: Dict[str, Any]) -> bytes:
+        """Serialize an instance of the operation, same as :py:func:`serialize_op` of :py:meth:`op` result."""
+        buf = bytearray(256)
+        return bytes(buf[: self.put(buf, 0, values)])
+
+    def op(self, values: Dict[str, Any]) -> list:
+        """Return an instance of the operation in JSON form, ``[name, data]``."""
+        data = dict(self.data)
+        data.update(values)
+        return [self.name, data]
+
+
+class TransactionEncoder:
+    """
+    Encoder of transactions into a reusable buffer.
+
+    The chain id is written at the start of the buffer once, and every transaction is written right after it, so the
+    signing message (chain id followed by the transaction without signatures) is a slice of the buffer. Methods return
+    :py:class:`memoryview` slices instead of ``bytes`` copies, which may be passed to :py:mod:`hashlib` directly.
+
+    Buffer contents are overwritten by the next call, unless a view returned earlier is still referenced: then a new
+    buffer is allocated and the view keeps its data. Release views (``with view:``) to reuse the buffer. The encoder
+    is not thread-safe, use one per thread.
+
+    .. code-block:: python
+
+        from vizbase.serializers import TransactionEncoder
+
+        encoder = TransactionEncoder(viz.rpc.chain_params['chain_id'], viz.rpc.chain_params['prefix'])
+        tx['signatures'] = encoder.sign(tx, [wif])
+        print(encoder.transaction_id(tx), len(encoder.encode(tx)))
+
+    :param str chain_id: chain id, hex-encoded
+    :param str prefix: public keys prefix
+    :param int size: initial buffer size, the buffer grows when needed
+    """
+
+    def __init__(self, chain_id: str, prefix: str = DEFAULT_PREFIX, size: int = 4096) -> None:
+        self.prefix = prefix
+        self._chain_id = unhexlify(chain_id)
+        self._offset = len(self._chain_id)
+        self._buf = self._allocate(size)
+
+    def _allocate(self, size: int) -> bytearray:
+        buf = bytearray(max(size, self._offset))
+        buf[: self._offset] = self._chain_id
+        return buf
+
+    def _put(self, tx: dict, signatures: bool) -> int:
+        try:
+            # fails if a view returned earlier is still alive, the buffer is left to the view then
+            self._buf.append(0)
+            del self._buf[-1]
+        except BufferError:
+            self._buf = self._allocate(len(self._buf))
+        return put_transaction(self._buf, self._offset, tx, self.prefix, signatures)
+
+    def encode(self, tx: dict, signatures: bool = True) -> memoryview:
+        """
+        Encode a transaction, same bytes as ``bytes(Signed_Transaction(**tx))``.
+
+        :param dict tx: transaction in JSON form
+        :param bool signatures: include signatures
+        """
+        start, end = self._offset, self._put(tx, signatures)
+        return memoryview(self._buf)[start:end]
+
+    def message(self, tx: dict) -> memoryview:
+        """Return the signing message: chain id followed by the transaction without signatures."""
+        end = self._put(tx, signatures=False)
+        return memoryview(self._buf)[:end]
+
+    def digest(self, tx: dict) -> bytes:
+        """Return SHA256 digest of the signing message."""
+        return hashlib.sha256(self.message(tx)).digest()
+
+    def transaction_id(self, tx: dict) -> str:
+        """Calculate transaction id, same as :py:attr:`Signed_Transaction.id`."""
+        with self.encode(tx, signatures=False) as view:
+            return hexlify(hashlib.sha256(view).digest()[:20]).decode("ascii")
+
+    def sign(self, tx: dict, wifs: Iterable[str]) -> List[str]:
+        """
+        Sign a transaction, same as :py:meth:`Signed_Transaction.sign`.
+
+        :param dict tx: transaction in JSON form, its signatures are ignored
+        :param list wifs: private keys, duplicates are skipped
+        :return: hex-encoded signatures
+        """
+        with self.message(tx) as view:
+            # graphenebase.ecdsa accepts only bytes
+            message = bytes(view)
+        return [hexlify(sign_message(message, wif)).decode("ascii") for wif in dict.fromkeys(wifs)]